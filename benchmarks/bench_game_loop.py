@@ -0,0 +1,42 @@
+"""
+게임 엔진 오버헤드 벤치마크
+
+StubBackend로 네트워크 없이 게임 전체를 반복 실행하여,
+LLM 응답 시간을 제외한 엔진 자체의 호출당 처리 시간을 측정합니다.
+--latency를 주면 가짜 지연 시간을 넣어 동시 호출의 효과를 확인할 수 있습니다.
+
+실행: python benchmarks/bench_game_loop.py --games 20 --latency 0.05
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from mafia.ai.backends import StubBackend
+from mafia.game.game_manager import GameManager
+
+
+def run(games: int, latency: float):
+    backend = StubBackend(latency=latency)
+    start = time.perf_counter()
+    days = 0
+    for seed in range(games):
+        backend.seed = seed
+        game = GameManager(backend=backend)
+        game.initialize_game()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.spin()
+        days += game.day_count
+    elapsed = time.perf_counter() - start
+    return elapsed, backend.calls, days
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="호출당 가짜 지연 시간 (초)")
+    args = parser.parse_args()
+
+    elapsed, calls, days = run(args.games, args.latency)
+    print(f"게임 {args.games}개, 총 {days}일, LLM 호출 {calls}회: {elapsed:.3f}s")
+    print(f"게임당 {elapsed / args.games * 1e3:.1f}ms, 호출당 {elapsed / calls * 1e3:.3f}ms")
@@ -0,0 +1,62 @@
+"""
+프롬프트 조립 마이크로벤치마크
+
+한 번의 LLM 호출에 필요한 프롬프트 조립 비용(개발자 프롬프트 + 페이즈 프롬프트 + 응답 스키마의
+JSON 스키마 변환)을 측정합니다. '이전'은 호출마다 스키마 클래스와 규칙 문자열을 새로 만들던
+방식을 재현한 것이고, '이후'는 현재 prompt_builder를 그대로 사용합니다.
+
+실행: python benchmarks/bench_prompt_builder.py
+"""
+import timeit
+from types import SimpleNamespace
+
+from openai.lib._parsing._completions import type_to_response_format_param
+from pydantic import BaseModel
+
+from mafia.ai import prompt_builder
+from mafia.ai.backends import response_format_param
+from mafia.utils.enum import GamePhase, Role
+
+NUMBER = 2000
+
+context = {
+    "phase": GamePhase.DAY_VOTE,
+    "day_count": 3,
+    "alive_players": [SimpleNamespace(name=name) for name in ["Alice", "Bob", "Charlie", "David"]],
+}
+game_knowledge = {"known_roles": {}, "suspicious_players": ["Bob"], "trusted_players": []}
+
+
+def before():
+    """호출마다 규칙 문자열과 응답 스키마 클래스를 새로 생성하던 방식"""
+    developer_prompt = (
+        prompt_builder._rule_prompt.__wrapped__()
+        + "\n\n"
+        + prompt_builder._role_prompt.__wrapped__("Alice", Role.POLICE)
+    )
+
+    class VoteResponse(BaseModel):
+        target: str
+        reason: str
+
+    user_prompt = (
+        prompt_builder._context_prompt(context, game_knowledge) + "\n\n" + prompt_builder._VOTE_PROMPT
+    )
+    type_to_response_format_param(VoteResponse)
+    return developer_prompt, user_prompt
+
+
+def after():
+    """캐시된 규칙 문자열과 모듈 수준 스키마, 미리 변환한 응답 스키마를 사용하는 현재 방식"""
+    developer_prompt = prompt_builder.developer_prompt("Alice", Role.POLICE)
+    user_prompt, Schema = prompt_builder.day_vote_prompt(context, game_knowledge)
+    response_format_param(Schema)
+    return developer_prompt, user_prompt
+
+
+if __name__ == "__main__":
+    assert before() == after(), "두 방식의 프롬프트가 다릅니다"
+
+    for label, func in [("이전", before), ("이후", after)]:
+        elapsed = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{label}: 호출당 {elapsed / NUMBER * 1e6:.1f}us")
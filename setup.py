@@ -12,6 +12,7 @@ setup(
     entry_points={
         "console_scripts": [
             "mafia-game=mafia.main:main",
+            "mafia-batch=mafia.batch:main",
         ],
     },
 )
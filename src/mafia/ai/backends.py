@@ -0,0 +1,346 @@
+"""
+LLM 백엔드 인터페이스와 구현체
+
+LLMAgent는 특정 SDK 대신 LLMBackend.parse()(스트리밍 출력에는 stream())만 호출합니다.
+- OpenAIBackend: OpenAI API (공유 클라이언트 사용)
+- LocalHTTPBackend: OpenAI 호환 로컬 HTTP 엔드포인트 (vLLM, llama.cpp server, Ollama 등)
+- StubBackend: 네트워크 없이 유효한 응답을 결정적으로 돌려주는 대역 (지연 시간 설정 가능)
+
+사용할 백엔드는 ai_settings.backend로 선택하고, 백엔드별 설정은 ai_settings.backends에 둡니다.
+
+LLMAgent는 페이즈 마감 시각이 있는 호출마다 call_deadline을 설정합니다. 게임은 마감이 지나면
+응답을 기다리지 않으므로, 백엔드는 이를 보고 HTTP 시간 제한을 줄이거나 재시도를 멈춥니다.
+"""
+import functools
+import hashlib
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from openai.lib._parsing import type_to_response_format_param
+from pydantic import BaseModel
+
+from mafia.ai import llm_client
+from mafia.ai.context_assembler import count_message_tokens, count_tokens
+from mafia.utils.config import game_config
+
+
+# 진행 중인 호출의 마감 시각 (time.monotonic 기준, 없으면 None)
+call_deadline: ContextVar[Optional[float]] = ContextVar("call_deadline", default=None)
+
+
+def time_left() -> Optional[float]:
+    """진행 중인 호출의 마감까지 남은 시간 (초, 마감이 없으면 None)"""
+    deadline = call_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@dataclass
+class BackendResponse:
+    """백엔드 응답
+
+    Attributes:
+        parsed: 응답 스키마로 파싱된 객체
+        content: 응답 원문 (메시지 기록에 그대로 덧붙임)
+        refusal: 모델이 응답을 거부한 경우 그 사유
+        usage: 토큰 사용량 (prompt_tokens, completion_tokens, prompt_tokens_details)
+        headers: 응답 HTTP 헤더 (속도 제한 정보 등)
+        ttfb: 요청부터 첫 응답 바이트까지 걸린 시간 (초, 알 수 없으면 None)
+        retries: 백엔드 내부에서 재시도한 횟수
+    """
+
+    parsed: Optional[BaseModel]
+    content: str
+    refusal: Optional[str] = None
+    usage: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    ttfb: Optional[float] = None
+    retries: int = 0
+
+
+class LLMBackend(ABC):
+    """구조화된 응답을 생성하는 LLM 백엔드"""
+
+    name = "base"
+
+    @abstractmethod
+    def parse(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        """messages에 대한 응답을 response_format 스키마로 생성"""
+        raise NotImplementedError
+
+    def stream(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        on_delta: Callable[[str], None],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        """parse()와 같지만 응답 원문을 받는 대로 조각(delta)씩 on_delta에 전달
+
+        스트리밍을 지원하지 않는 백엔드는 parse()가 끝난 뒤 원문 전체를 한 번에 전달합니다.
+        """
+        response = self.parse(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        if response.content:
+            on_delta(response.content)
+        return response
+
+
+@functools.lru_cache(maxsize=None)
+def response_format_param(response_format: Type[BaseModel]) -> Dict[str, Any]:
+    """응답 스키마의 response_format 요청 인자 (스키마마다 한 번만 JSON 스키마로 변환)"""
+    return type_to_response_format_param(response_format)
+
+
+def _parse_message(response_format: Type[BaseModel], message: Any) -> Optional[BaseModel]:
+    """미리 변환한 요청 인자로 요청하면 SDK가 응답을 파싱하지 않으므로 직접 검증"""
+    if message.refusal or not message.content:
+        return None
+    return response_format.model_validate_json(message.content)
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI Chat Completions 백엔드
+
+    클라이언트와 연결 풀은 llm_client 레지스트리에서 빌려 씁니다.
+    응답 스키마는 response_format_param()으로 한 번만 변환해서 매 호출에 그대로 보냅니다.
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        self.client = llm_client.get_client(api_key=api_key, base_url=base_url)
+
+    def parse(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        kwargs = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        remaining = time_left()
+        if remaining is not None:
+            # 마감 이후의 응답은 버려지므로 그 전에 요청을 끊음
+            kwargs["timeout"] = max(remaining, 0.001)
+
+        raw = self.client.beta.chat.completions.with_raw_response.parse(
+            model=model,
+            messages=messages,
+            response_format=response_format_param(response_format),
+            **kwargs,
+        )
+        completion = raw.parse()
+        message = completion.choices[0].message
+        return BackendResponse(
+            parsed=_parse_message(response_format, message),
+            content=message.content or "",
+            refusal=message.refusal,
+            usage=completion.usage,
+            headers=dict(raw.headers),
+            # 스트리밍하지 않는 응답은 생성이 끝난 뒤에 첫 바이트가 오므로 응답 시간과 같음
+            ttfb=raw.http_response.elapsed.total_seconds(),
+            retries=getattr(raw, "retries_taken", 0),
+        )
+
+    def stream(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        on_delta: Callable[[str], None],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        kwargs = {}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        remaining = time_left()
+        if remaining is not None:
+            # 마감 이후의 응답은 버려지므로 그 전에 요청을 끊음
+            kwargs["timeout"] = max(remaining, 0.001)
+
+        start = time.perf_counter()
+        ttfb = None
+        with self.client.beta.chat.completions.stream(
+            model=model,
+            messages=messages,
+            response_format=response_format_param(response_format),
+            stream_options={"include_usage": True},
+            **kwargs,
+        ) as stream:
+            for event in stream:
+                if event.type == "content.delta":
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - start
+                    on_delta(event.delta)
+            completion = stream.get_final_completion()
+
+        message = completion.choices[0].message
+        return BackendResponse(
+            parsed=_parse_message(response_format, message),
+            content=message.content or "",
+            refusal=message.refusal,
+            usage=completion.usage,
+            ttfb=ttfb,
+        )
+
+
+class LocalHTTPBackend(OpenAIBackend):
+    """OpenAI 호환 로컬 HTTP 엔드포인트 백엔드"""
+
+    name = "local"
+
+    def __init__(self, base_url: str = "http://localhost:8000/v1", api_key: str = "local"):
+        super().__init__(api_key=api_key, base_url=base_url)
+
+
+class StubBackend(LLMBackend):
+    """네트워크 없이 결정적인 응답을 돌려주는 백엔드
+
+    같은 seed와 같은 메시지에는 항상 같은 응답을 돌려줍니다.
+    대상(target, vote_target) 필드는 프롬프트의 생존자 목록에서 자신을 제외하고 고르므로
+    게임 규칙상 유효한 응답이 나옵니다. 게임 엔진 자체의 오버헤드 측정과 부하 테스트에 사용합니다.
+
+    Args:
+        latency: 호출마다 기다릴 가짜 지연 시간 (초)
+        jitter: 지연 시간에 더할 무작위 편차의 최대값 (초)
+        seed: 응답 선택에 사용할 시드
+    """
+
+    name = "stub"
+
+    _alive_pattern = re.compile(r"생존자: \d+명 \(([^)]*)\)")
+    _name_pattern = re.compile(r"- 이름: (\S+)")
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def parse(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        digest = hashlib.sha256(repr((self.seed, model, messages)).encode("utf-8")).digest()
+        rng = random.Random(digest)
+        with self._lock:
+            self.calls += 1
+
+        delay = self.latency + rng.uniform(0, self.jitter) if self.latency or self.jitter else 0.0
+        if delay:
+            time.sleep(delay)
+
+        parsed = response_format(**self._fields(response_format, messages, rng))
+        content = parsed.model_dump_json()
+        prompt_tokens = count_message_tokens(messages, model)
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=count_tokens(content, model),
+            total_tokens=prompt_tokens + count_tokens(content, model),
+            prompt_tokens_details=SimpleNamespace(cached_tokens=0),
+        )
+        return BackendResponse(parsed=parsed, content=content, usage=usage, ttfb=delay)
+
+    def _fields(self, response_format: Type[BaseModel], messages: List[Dict], rng: random.Random):
+        prompt = messages[-1]["content"]
+        developer = messages[0]["content"]
+
+        alive = self._alive_pattern.findall(prompt)
+        candidates = [name for name in alive[-1].split(", ") if name] if alive else []
+        own_name = self._name_pattern.search(developer)
+        others = [name for name in candidates if not own_name or name != own_name.group(1)]
+
+        fields = {}
+        for field_name in response_format.model_fields:
+            if field_name in ("target", "vote_target"):
+                fields[field_name] = rng.choice(others or candidates or ["없음"])
+            elif field_name == "conversation":
+                suspect = rng.choice(others) if others else "아무도"
+                fields[field_name] = f"저는 {suspect}이(가) 의심스럽습니다."
+            elif field_name == "summary":
+                fields[field_name] = prompt[:200]
+            else:
+                fields[field_name] = f"{field_name} ({rng.randrange(1000)})"
+        return fields
+
+
+BACKENDS = {
+    OpenAIBackend.name: OpenAIBackend,
+    LocalHTTPBackend.name: LocalHTTPBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def build_backend(name: Optional[str] = None, **kwargs) -> LLMBackend:
+    """래퍼 없이 백엔드 하나 생성
+
+    Args:
+        name: 백엔드 이름 (없으면 ai_settings.backend, 기본값 "openai")
+        kwargs: 백엔드 생성 인자 (ai_settings.backends[name] 설정보다 우선)
+    """
+    ai_config = game_config.get_config("ai_settings") or {}
+    name = name or ai_config.get("backend", OpenAIBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 LLM 백엔드입니다: {name}")
+
+    options = {**ai_config.get("backends", {}).get(name, {}), **kwargs}
+    return BACKENDS[name](**options)
+
+
+def create_backend(name: Optional[str] = None, **kwargs) -> LLMBackend:
+    """백엔드 생성
+
+    Args:
+        name: 백엔드 이름 (없으면 ai_settings.backend, 기본값 "openai")
+        kwargs: 백엔드 생성 인자 (ai_settings.backends[name] 설정보다 우선)
+
+    네트워크 백엔드는 ai_settings.rate_limit 설정에 따라 속도 제한 스케줄러로 감싸고,
+    ai_settings.hedging / circuit_breaker 설정에 따라 중복 요청과 차단기를 적용합니다.
+    """
+    backend = build_backend(name, **kwargs)
+    if isinstance(backend, OpenAIBackend):
+        # 두 모듈 모두 이 모듈을 import하므로 여기서 import
+        from mafia.ai.rate_limiter import rate_limited
+        from mafia.ai.resilience import resilient
+
+        backend = resilient(rate_limited(backend), name=backend.name)
+    return backend
@@ -0,0 +1,176 @@
+"""
+LLM 호출 기록/재생 (cassette)
+
+RecordingBackend는 실제 백엔드를 감싸 모든 요청과 파싱된 응답을 Cassette에 기록하고,
+ReplayBackend는 기록된 응답을 네트워크 호출 없이 그대로 돌려줍니다.
+GameManager의 시드를 같게 두면, 기록한 게임을 실제 시간보다 훨씬 빠르게 같은 진행으로
+다시 실행할 수 있어 실제 게임 기록으로 프로파일링과 회귀 테스트를 할 수 있습니다.
+기록과 재생 중에는 GameManager가 페이즈 시간 제한을 적용하지 않습니다.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Deque, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from mafia.ai.backends import BackendResponse, LLMBackend
+
+
+def request_key(
+    model: str,
+    messages: List[Dict],
+    response_format: Type[BaseModel],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """요청을 식별하는 해시 (모델, 메시지, 응답 스키마, 생성 설정)"""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "schema": response_format.model_json_schema(),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CassetteMiss(KeyError):
+    """재생할 기록이 없는 요청"""
+
+
+class Cassette:
+    """LLM 요청과 응답의 기록
+
+    같은 요청이 여러 번 기록되면 기록된 순서대로 재생합니다.
+    파일 경로가 .gz로 끝나면 gzip으로 압축하여 저장합니다.
+    """
+
+    def __init__(self, entries: Optional[List[Dict]] = None):
+        self.entries: List[Dict] = []
+        self._queues: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for entry in entries or []:
+            self.add(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entry: Dict):
+        with self._lock:
+            self.entries.append(entry)
+            self._queues[entry["key"]].append(entry)
+
+    def pop(self, key: str) -> Dict:
+        """key에 해당하는 다음 기록 반환"""
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteMiss(key)
+            return queue.popleft()
+
+    def save(self, path):
+        path = Path(path)
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    @classmethod
+    def load(cls, path) -> "Cassette":
+        path = Path(path)
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+
+
+class RecordingBackend(LLMBackend):
+    """실제 백엔드의 요청과 응답을 Cassette에 기록하는 백엔드"""
+
+    name = "recording"
+
+    def __init__(self, backend: LLMBackend, cassette: Optional[Cassette] = None):
+        self.backend = backend
+        self.cassette = cassette if cassette is not None else Cassette()
+
+    def parse(self, *, model, messages, response_format, temperature=None, max_tokens=None):
+        response = self.backend.parse(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        self._record(model, messages, response_format, temperature, max_tokens, response)
+        return response
+
+    def stream(
+        self, *, model, messages, response_format, on_delta, temperature=None, max_tokens=None
+    ):
+        """스트리밍은 그대로 전달하고, 끝난 응답 전체를 기록 (재생은 parse()와 같음)"""
+        response = self.backend.stream(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            on_delta=on_delta,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        self._record(model, messages, response_format, temperature, max_tokens, response)
+        return response
+
+    def _record(self, model, messages, response_format, temperature, max_tokens, response):
+        usage = response.usage
+        self.cassette.add(
+            {
+                "key": request_key(model, messages, response_format, temperature, max_tokens),
+                "model": model,
+                "schema": response_format.__name__,
+                "messages": messages,
+                "content": response.content,
+                "refusal": response.refusal,
+                "usage": {
+                    "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                    "completion_tokens": getattr(usage, "completion_tokens", 0),
+                    "cached_tokens": getattr(
+                        getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0
+                    ) or 0,
+                },
+            }
+        )
+
+
+class ReplayBackend(LLMBackend):
+    """Cassette에 기록된 응답을 네트워크 호출 없이 돌려주는 백엔드
+
+    기록에 없는 요청이 오면 CassetteMiss를 발생시킵니다.
+    """
+
+    name = "replay"
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def parse(self, *, model, messages, response_format, temperature=None, max_tokens=None):
+        entry = self.cassette.pop(
+            request_key(model, messages, response_format, temperature, max_tokens)
+        )
+        usage = entry["usage"]
+        return BackendResponse(
+            parsed=response_format.model_validate_json(entry["content"]) if entry["content"] else None,
+            content=entry["content"],
+            refusal=entry["refusal"],
+            usage=SimpleNamespace(
+                prompt_tokens=usage["prompt_tokens"],
+                completion_tokens=usage["completion_tokens"],
+                prompt_tokens_details=SimpleNamespace(cached_tokens=usage["cached_tokens"]),
+            ),
+        )
@@ -0,0 +1,143 @@
+"""
+토큰 예산에 맞춰 LLM 입력을 조립하는 도구
+
+프롬프트 구성 요소(규칙, 역할, 페이즈, 기억)의 토큰 수를 로컬에서 세고,
+입력 예산을 넘으면 우선순위가 낮은 기억부터 줄이거나 제외합니다.
+tiktoken이 설치되어 있으면 모델의 토크나이저를 사용하고, 없으면 UTF-8 바이트 수로 근사합니다.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from mafia.utils.config import game_config
+from mafia.utils.enum import GamePhase, MemoryType
+
+try:
+    import tiktoken
+except ImportError:  # 선택 의존성
+    tiktoken = None
+
+# 메시지 하나마다 붙는 역할/구분자 토큰 수 (OpenAI chat 형식 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+DEFAULT_BUDGET = {"input": 6000, "output": 150}
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """텍스트의 토큰 수 계산
+
+    tiktoken이 없으면 UTF-8 4바이트당 1토큰으로 근사합니다.
+    (영문은 약 4글자, 한글은 약 1.3글자당 1토큰)
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text.encode("utf-8")) + 3) // 4
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: Sequence[Dict], model: str = "gpt-4o-mini") -> int:
+    """메시지 목록의 입력 토큰 수 계산"""
+    return sum(count_tokens(m["content"], model) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def token_budget(phase_key: str) -> Dict[str, int]:
+    """페이즈별 입력/출력 토큰 예산 조회
+
+    ai_settings.token_budgets[phase_key]가 없으면 default 값을 사용하고,
+    출력 예산의 기본값은 ai_settings.max_tokens입니다.
+    """
+    ai_config = game_config.get_config("ai_settings") or {}
+    budgets = ai_config.get("token_budgets", {})
+    budget = {**DEFAULT_BUDGET, "output": ai_config.get("max_tokens", DEFAULT_BUDGET["output"])}
+    budget.update(budgets.get("default", {}))
+    budget.update(budgets.get(phase_key, {}))
+    return budget
+
+
+def memory_priority(memory: MemoryType) -> int:
+    """기억의 우선순위 (높을수록 나중에 제외)
+
+    - 2: 요약, 사회자가 본인에게만 알려준 사실 등 사회자 발언
+    - 1: 자신의 행동 기록
+    - 0: 다른 플레이어의 발언
+    """
+    speaker = memory.get("speaker")
+    speaker_name = getattr(speaker, "name", speaker)
+    if speaker_name in ("사회자", "요약"):
+        return 2
+    if "type" in memory:
+        return 1
+    return 0
+
+
+class ContextAssembler:
+    """토큰 예산 안에서 기억을 선택하는 조립기
+
+    Args:
+        model: 토큰 수를 셀 모델 이름
+        max_memory_tokens: 기억 하나의 최대 토큰 수 (넘으면 내용을 줄임)
+    """
+
+    def __init__(self, model: str, max_memory_tokens: int = 200):
+        self.model = model
+        self.max_memory_tokens = max_memory_tokens
+
+    def count(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    def fit_memories(
+        self,
+        memories: Sequence[MemoryType],
+        budget: int,
+        format_memory: Callable[[MemoryType], str],
+    ) -> Tuple[List[MemoryType], int]:
+        """기억 목록을 budget 토큰 안으로 줄임
+
+        1. max_memory_tokens를 넘는 기억은 내용을 잘라 줄입니다.
+        2. 그래도 넘으면 우선순위가 낮은 기억부터, 같은 우선순위에서는 오래된 기억부터 제외합니다.
+        남은 기억은 원래 순서를 유지합니다.
+
+        Returns:
+            Tuple[List[MemoryType], int]: 선택된 기억, 그 토큰 수
+        """
+        fitted = [self._shorten(memory, format_memory) for memory in memories]
+        costs = [self.count(format_memory(memory)) + 1 for memory in fitted]  # +1: 줄바꿈
+        total = sum(costs)
+        if total <= budget:
+            return fitted, total
+
+        dropped = set()
+        for i in sorted(range(len(fitted)), key=lambda i: (memory_priority(fitted[i]), i)):
+            if total <= budget:
+                break
+            dropped.add(i)
+            total -= costs[i]
+
+        return [memory for i, memory in enumerate(fitted) if i not in dropped], total
+
+    def _shorten(self, memory: MemoryType, format_memory: Callable[[MemoryType], str]) -> MemoryType:
+        if self.count(format_memory(memory)) <= self.max_memory_tokens:
+            return memory
+
+        content = memory.get("content") or ""
+        # 토큰 수에 비례하여 내용을 자른 뒤 한도 안에 들어올 때까지 줄임
+        while content and self.count(format_memory({**memory, "content": content + "…"})) > (
+            self.max_memory_tokens
+        ):
+            content = content[: int(len(content) * 0.8)]
+        return {**memory, "content": content + "…"}
+
+
+def phase_key(phase) -> str:
+    """설정에서 사용하는 페이즈 키 (예: GamePhase.DAY_VOTE -> "day_vote")"""
+    return phase.name.lower() if isinstance(phase, GamePhase) else str(phase)
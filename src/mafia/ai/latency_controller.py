@@ -0,0 +1,225 @@
+"""
+지연 시간 목표(SLO)에 맞춰 출력 길이와 모델을 고르는 제어기
+
+고정된 max_tokens는 제공자의 현재 출력 토큰당 시간에 따라 너무 빡빡하거나 너무 느슨합니다.
+LatencyController는 모델별로 최근 호출의 첫 바이트까지 시간(TTFB)과 출력 토큰당 시간을
+지수 이동 평균으로 추적하고, 호출마다
+
+    예상 지연 시간 = TTFB + 출력 토큰당 시간 × 출력 토큰 수
+
+가 목표 안에 들어오도록 출력 토큰 상한을 정합니다. 최소 출력 토큰 수로도 목표를 넘기면
+다음 모델 단계(model_tiers, 느린 모델에서 빠른 모델 순서)로 내려갑니다.
+최소 출력 토큰 수는 응답 스키마별로 최근에 실제로 받은 응답 길이 중 가장 긴 값이며
+(기록이 없으면 min_tokens), 구조화된 응답이 상한에 걸려 잘리지 않도록 합니다.
+
+목표 시간은 설정값(target)과 턴 마감 시각까지 남은 시간 중 작은 값이며,
+결정 내용은 LLM 호출 텔레메트리의 slo 필드에 기록됩니다.
+설정은 ai_settings.latency_slo에 둡니다.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, List, Optional
+
+from mafia.utils.config import game_config
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "target": 8.0,  # 호출 하나의 목표 지연 시간 (초)
+    "phases": ["day_conversation"],  # 제어기를 적용할 페이즈
+    "min_tokens": 60,  # 출력 토큰 상한의 최소값 (스키마별 최근 응답이 더 길면 그 길이)
+    "size_window": 50,  # 스키마별로 기억할 최근 응답 길이 수
+    "model_tiers": [],  # 느린 모델에서 빠른 모델 순서 (예: ["gpt-4o", "gpt-4o-mini"])
+    "alpha": 0.2,  # 지수 이동 평균의 가중치
+    "min_samples": 3,  # 추정값을 사용하기 위한 최소 관측 수
+    "use_deadline": True,  # 턴 마감 시각까지 남은 시간도 목표로 사용
+}
+
+# TTFB가 전체 지연 시간의 이 비율 이상이면 스트리밍이 아닌 응답으로 보고
+# 전체 시간을 출력 토큰에 나눠 계산 (보수적으로 출력 길이를 줄이는 쪽)
+WHOLE_RESPONSE_RATIO = 0.9
+
+
+@dataclass
+class LatencyEstimate:
+    """모델 하나의 지연 시간 추정값"""
+
+    ttfb: float = 0.0  # 첫 바이트까지 시간 (초)
+    time_per_token: float = 0.0  # 출력 토큰당 시간 (초)
+    samples: int = 0
+
+    def predict(self, tokens: int) -> float:
+        return self.ttfb + self.time_per_token * tokens
+
+
+@dataclass
+class SLODecision:
+    """호출 하나에 대한 제어기의 결정
+
+    reason:
+        - no_data: 관측이 부족하여 기존 설정 사용
+        - within_target: 기존 출력 상한으로도 목표 안에 들어옴
+        - capped: 출력 상한을 줄여 목표에 맞춤
+        - over_target: 모든 모델 단계에서 최소 출력으로도 목표를 넘음
+    floor: 이번 결정에 사용한 출력 토큰 상한의 최소값
+    """
+
+    model: str
+    max_tokens: int
+    target: float
+    predicted: Optional[float]
+    reason: str
+    floor: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class LatencyController:
+    """모델별 TTFB와 출력 토큰당 시간으로 출력 상한과 모델 단계를 고르는 제어기
+
+    Args:
+        target: 호출 하나의 목표 지연 시간 (초)
+        phases: 제어기를 적용할 페이즈 키 목록
+        min_tokens: 출력 토큰 상한의 최소값 (스키마별 최근 응답 길이가 더 길면 그 값)
+        model_tiers: 느린 모델에서 빠른 모델 순서의 모델 목록
+        alpha: 지수 이동 평균의 가중치
+        min_samples: 추정값을 사용하기 위한 최소 관측 수
+        use_deadline: 턴 마감 시각까지 남은 시간도 목표로 사용
+        size_window: 스키마별로 기억할 최근 응답 길이 수
+    """
+
+    def __init__(
+        self,
+        target: float = 8.0,
+        phases: Optional[List[str]] = None,
+        min_tokens: int = 60,
+        model_tiers: Optional[List[str]] = None,
+        alpha: float = 0.2,
+        min_samples: int = 3,
+        use_deadline: bool = True,
+        size_window: int = 50,
+    ):
+        self.target = target
+        self.phases = set(phases if phases is not None else DEFAULT_SETTINGS["phases"])
+        self.min_tokens = min_tokens
+        self.model_tiers = list(model_tiers or [])
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.use_deadline = use_deadline
+        self.size_window = size_window
+        self.estimates: Dict[str, LatencyEstimate] = {}
+        self.output_sizes: Dict[str, Deque[int]] = {}  # 스키마 이름 -> 최근 응답의 출력 토큰 수
+        self._lock = threading.Lock()
+
+    def enabled_for(self, phase_key: str) -> bool:
+        return phase_key in self.phases
+
+    def observe(
+        self,
+        model: str,
+        ttfb: Optional[float],
+        latency: float,
+        completion_tokens: Optional[int],
+        schema: Optional[str] = None,
+    ):
+        """호출 결과로 모델의 추정값과 (schema가 있으면) 스키마의 응답 길이 기록 갱신"""
+        if not completion_tokens or latency <= 0:
+            return
+        if schema is not None:
+            with self._lock:
+                sizes = self.output_sizes.setdefault(schema, deque(maxlen=self.size_window))
+                sizes.append(completion_tokens)
+        if ttfb is None or ttfb >= latency * WHOLE_RESPONSE_RATIO:
+            ttfb, time_per_token = 0.0, latency / completion_tokens
+        else:
+            time_per_token = (latency - ttfb) / completion_tokens
+
+        with self._lock:
+            estimate = self.estimates.setdefault(model, LatencyEstimate())
+            if estimate.samples == 0:
+                estimate.ttfb, estimate.time_per_token = ttfb, time_per_token
+            else:
+                estimate.ttfb += self.alpha * (ttfb - estimate.ttfb)
+                estimate.time_per_token += self.alpha * (time_per_token - estimate.time_per_token)
+            estimate.samples += 1
+
+    def output_floor(self, schema: Optional[str]) -> int:
+        """출력 토큰 상한의 최소값 (스키마의 최근 응답 중 가장 긴 길이, 기록이 없으면 min_tokens)"""
+        with self._lock:
+            sizes = self.output_sizes.get(schema)
+            return max([self.min_tokens, *sizes]) if sizes else self.min_tokens
+
+    def decide(
+        self,
+        model: str,
+        max_tokens: int,
+        deadline: Optional[float] = None,
+        schema: Optional[str] = None,
+    ) -> SLODecision:
+        """목표 지연 시간 안에 들어오는 모델과 출력 토큰 상한 선택
+
+        Args:
+            model: 페이즈/역할 설정에 따른 모델
+            max_tokens: 출력 예산 (이보다 늘리지는 않음)
+            deadline: 턴 마감 시각 (time.monotonic 기준)
+            schema: 응답 스키마 이름 (출력 토큰 상한의 최소값을 정하는 데 사용)
+        """
+        target = self.target
+        if self.use_deadline and deadline is not None:
+            target = max(0.0, min(target, deadline - time.monotonic()))
+
+        if model in self.model_tiers:
+            candidates = self.model_tiers[self.model_tiers.index(model):]
+        else:
+            candidates = [model] + self.model_tiers
+
+        with self._lock:
+            estimates = {
+                name: LatencyEstimate(**asdict(self.estimates[name]))
+                for name in candidates
+                if name in self.estimates
+            }
+
+        floor = min(self.output_floor(schema), max_tokens)
+        for candidate in candidates:
+            estimate = estimates.get(candidate)
+            if estimate is None or estimate.samples < self.min_samples:
+                return SLODecision(candidate, max_tokens, target, None, "no_data", floor)
+            if estimate.predict(max_tokens) <= target:
+                return SLODecision(
+                    candidate,
+                    max_tokens,
+                    target,
+                    estimate.predict(max_tokens),
+                    "within_target",
+                    floor,
+                )
+            if estimate.time_per_token > 0:
+                cap = int((target - estimate.ttfb) / estimate.time_per_token)
+                if cap >= floor:
+                    return SLODecision(
+                        candidate, cap, target, estimate.predict(cap), "capped", floor
+                    )
+
+        last = candidates[-1]
+        predicted = estimates[last].predict(floor) if last in estimates else None
+        return SLODecision(last, floor, target, predicted, "over_target", floor)
+
+
+_controller: Optional[LatencyController] = None
+_controller_lock = threading.Lock()
+
+
+def get_latency_controller() -> Optional[LatencyController]:
+    """ai_settings.latency_slo 설정으로 만든 프로세스 공용 제어기 (꺼져 있으면 None)"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            ai_config = game_config.get_config("ai_settings") or {}
+            settings = {**DEFAULT_SETTINGS, **ai_config.get("latency_slo", {})}
+            if not settings.pop("enabled"):
+                return None
+            _controller = LatencyController(**settings)
+        return _controller
@@ -1,15 +1,42 @@
 import random
 import logging
-import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 
-from openai import OpenAI
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+
+import openai
+from pydantic import BaseModel
 
 from mafia.ai import prompt_builder
-from mafia.ai.memory_manager import MemoryManager
+from mafia.ai.backends import BackendResponse, LLMBackend, call_deadline, create_backend
+from mafia.ai.context_assembler import (
+    MESSAGE_OVERHEAD_TOKENS,
+    ContextAssembler,
+    count_message_tokens,
+    count_tokens,
+    phase_key,
+    token_budget,
+)
+from mafia.ai.latency_controller import LatencyController, SLODecision, get_latency_controller
+from mafia.ai.memory_manager import MemoryCursor, MemoryManager
+from mafia.ai.response_cache import ResponseCache, cache_key, get_response_cache
+from mafia.ai.streaming import JSONFieldStream
 from mafia.utils.config import game_config
-from mafia.utils.enum import ActionType, GamePhase, Role, ContextType
-from mafia.utils.logger import GameLogger
+from mafia.utils.enum import (
+    ActionMemoryType,
+    ActionType,
+    ContextType,
+    GamePhase,
+    MemoryType,
+    Role,
+)
+from mafia.utils.logger import game_logger
+
+
+STREAM_FIELD = "conversation"  # 스트리밍할 때 받는 대로 전달할 응답 필드
 
 
 class LLMAgent:
@@ -29,7 +56,18 @@ class LLMAgent:
     4. 투표 결정
     """
 
-    def __init__(self, player_id: int, memory_manager: MemoryManager, role: Role, name: str):
+    REBUILD_RATIO = 0.75  # 기록을 다시 구성할 때 사용할 입력 예산 비율
+
+    def __init__(
+        self,
+        player_id: int,
+        memory_manager: MemoryManager,
+        role: Role,
+        name: str,
+        backend: Optional[LLMBackend] = None,
+        response_cache: Optional[ResponseCache] = None,
+        latency_controller: Optional[LatencyController] = None,
+    ):
         assert isinstance(role, Role), "role must be an instance of Role"
 
         self.player_id = player_id
@@ -43,21 +81,59 @@ class LLMAgent:
         }
         # 전역 설정에서 AI 설정 가져오기
         self.ai_config = game_config.get_config("ai_settings")
-        self.logger = logging.getLogger("mafia")
+        # 레코드에 에이전트 이름을 붙여 에이전트별 대화 기록 파일로도 보냄
+        self.logger = logging.LoggerAdapter(logging.getLogger("mafia"), {"agent": name})
+        self.game_logger = game_logger  # LLM 호출 이벤트 기록 (GameManager가 게임별 로거로 교체)
+
+        # LLM 백엔드 (기본값: ai_settings.backend, OpenAI 백엔드는 공유 클라이언트 사용)
+        self.backend = backend if backend is not None else create_backend()
+        # 응답 캐시 (기본값: ai_settings.response_cache 설정의 공용 캐시, 꺼져 있으면 None)
+        self.response_cache = (
+            response_cache if response_cache is not None else get_response_cache()
+        )
+        # 지연 시간 목표 제어기 (기본값: ai_settings.latency_slo 설정의 공용 제어기, 꺼져 있으면 None)
+        self.latency_controller = (
+            latency_controller if latency_controller is not None else get_latency_controller()
+        )
 
-        self.llm_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+        # 호출 간에 덧붙이기만 하는 메시지 기록 (프롬프트 캐시 접두어 유지)
+        self.memory_days = 3  # 프롬프트에 포함할 최근 기억 일 수
+        self.messages: List[Dict] = []
+        self._memory_cursor: Optional[MemoryCursor] = None  # 메시지 기록에 반영된 기억 위치
+        self._history_start_day: Optional[int] = None
+        self._history_tokens = 0  # 메시지 기록의 입력 토큰 수 (로컬 계산)
+        self.usage = {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "completion_tokens": 0,
+            "cache_hits": 0,  # 응답 캐시로 대신한 호출 수
+        }
+
+        # 입력 토큰 예산 관리
+        self.context_assembler = ContextAssembler(model=self.ai_config["model"])
+        self.last_call_tokens: Dict[str, int] = {}  # 직전 호출의 구성 요소별 토큰 수
+        # 마감 시각을 넘겨 끝난 호출도 사용량은 기록하므로, 다음 호출과 겹칠 수 있음
+        self._usage_lock = threading.Lock()
 
-    def generate_response(self, context: ContextType) -> Dict:
+    def generate_response(
+        self, context: ContextType, on_text: Optional[Callable[[str], None]] = None
+    ) -> BaseModel:
         """
         LLM을 사용하여 응답 생성
 
         Args:
             context: 게임 상황 정보
+            on_text: 발언(conversation 필드)을 받는 대로 전달받을 콜백 (주면 스트리밍으로 요청)
         Returns:
-            Dict: 생성된 응답
+            BaseModel: 페이즈별 응답 스키마로 파싱된 응답
         """
         # 컨텍스트 구성
-        if context.get("phase") == GamePhase.DAY_CONVERSATION:
+        if context.get("phase") == GamePhase.DAY_CONVERSATION and context.get("final_turn"):
+            user_prompt, Schema = prompt_builder.day_final_turn_prompt(
+                context, self.game_knowledge
+            )
+        elif context.get("phase") == GamePhase.DAY_CONVERSATION:
             user_prompt, Schema = prompt_builder.day_conversation_prompt(
                 context, self.game_knowledge
             )
@@ -72,40 +148,53 @@ class LLMAgent:
         else:
             raise ValueError(f"유효하지 않은 게임 페이즈입니다: {context.get('phase')}")
 
-        # 시스템 메시지에 게임 규칙과 제약사항 추가
-        developer_prompt = prompt_builder.developer_prompt(self.name, self.role)
-
-        relevant_memories = self.memory_manager.get_recent_memories(
-            current_day=context.get("day_count")
-        )
-        memories_prompt = "이전 기억:\n" + "\n".join(relevant_memories)
-
-        messages = [
-            {"role": "developer", "content": developer_prompt + user_prompt},
-            {"role": "assistant", "content": memories_prompt},
-        ]
-
-        self.logger.info(messages)
-
-        # LLM 호출
-        # response = self.llm_client.chat.completions.create(
-        #     model=self.ai_config["model"],
-        #     messages=messages,
-        #     temperature=self.ai_config["temperature"],
-        #     max_tokens=self.ai_config["max_tokens"],
-        #     presence_penalty=0.6,  # 반복 방지
-        #     frequency_penalty=0.3,  # 다양성 유도
-        # )
-        completion = self.llm_client.beta.chat.completions.parse(
-            model=self.ai_config["model"],
-            messages=messages,
-            response_format=Schema,
-        )
-        response = completion.choices[0].message
-        if response.refusal:
-            raise ValueError("LLM이 응답을 거부했습니다:", response.refusal)
-
-        self.logger.info(repr(response.parsed))
+        key = phase_key(context.get("phase"))
+        deadline = context.get("deadline")
+        budget = self._budget(key)
+        decision = None
+        if self.latency_controller is not None and self.latency_controller.enabled_for(key):
+            # 최근 지연 시간으로 목표 안에 들어오는 출력 상한과 모델 선택
+            decision = self.latency_controller.decide(
+                game_config.model_settings(key, self.role.name)["model"],
+                budget["output"],
+                deadline=deadline,
+                schema=Schema.__name__,
+            )
+            budget["output"] = decision.max_tokens
+        messages = self._build_messages(context, user_prompt, budget)
+
+        # LLM 호출 (마감 시각이 지나면 기다리지 않고 기본 행동 사용)
+        # 밤에는 같은 에이전트의 기억 요약이 동시에 실행되므로 호출별 값은 인자로 넘김
+        call = dict(day=context.get("day_count"), tokens=self.last_call_tokens, deadline=deadline)
+        try:
+            if deadline is None:
+                response = self._parse(
+                    key, messages, Schema, budget["output"], decision, on_text, **call
+                )
+            else:
+                response = _call_before(
+                    deadline,
+                    self._parse,
+                    key,
+                    list(messages),
+                    Schema,
+                    budget["output"],
+                    decision,
+                    on_text,
+                    **call,
+                )
+        except (FutureTimeoutError, openai.LengthFinishReasonError) as e:
+            cause = "응답 시간 초과" if isinstance(e, FutureTimeoutError) else "출력 길이 초과"
+            self.logger.warning("[%s] %s로 기본 행동을 사용합니다.", self.name, cause)
+            parsed = self._get_fallback_action(context)
+            response = BackendResponse(parsed=parsed, content=parsed.model_dump_json())
+
+        # 다음 호출에서도 같은 접두어가 유지되도록 응답을 기록에 덧붙임
+        assistant_message = {"role": "assistant", "content": response.content}
+        self.messages.append(assistant_message)
+        self._history_tokens += count_message_tokens([assistant_message], self.context_assembler.model)
+
+        self.logger.info("%r", response.parsed)
 
         # 메모리 업데이트
         if context.get("phase") == GamePhase.DAY_CONVERSATION:
@@ -118,27 +207,402 @@ class LLMAgent:
             raise ValueError(f"유효하지 않은 게임 페이즈입니다: {context.get('phase')}")
 
         target = getattr(response.parsed, "target", None)
-        content = getattr(response.parsed, "conversation", None)
+        content = getattr(response.parsed, "conversation", None) or getattr(
+            response.parsed, "reason", ""
+        )
 
         action = ActionType(
             type=type_,
             target=target,
             content=content,
         )
-        self._update_memory(context, action)
+        self.record_action(context, action)
+
+        return response.parsed
+
+    def _build_messages(
+        self, context: ContextType, user_prompt: str, budget: Dict[str, int]
+    ) -> List[Dict]:
+        """프롬프트 캐시에 유리하고 입력 토큰 예산을 지키는 메시지 목록 구성
+
+        메시지는 항상 다음 순서로 쌓입니다.
+        1. developer: 게임 규칙 + 역할 설명 (게임 내내 변하지 않음)
+        2. 이전 호출의 기록 (새 기억, 페이즈 프롬프트, 응답) - 덧붙이기만 함
+        3. user: 지난 호출 이후 새로 생긴 기억
+        4. user: 이번 페이즈 프롬프트
+
+        이전 호출의 메시지를 수정하지 않으므로 호출 간에 긴 공통 접두어가 유지됩니다.
+        최근 기억 범위(memory_days)를 벗어난 날이 생기거나 입력 예산(budget["input"])을
+        넘으면 기록을 다시 구성하며, 이때 기억은 예산의 REBUILD_RATIO 안으로 줄입니다.
+        """
+        current_day = context.get("day_count", 0)
+        if self._history_start_day is not None and (
+            self._history_start_day < current_day - self.memory_days
+        ):
+            self.reset_history()
+
+        phase_message = {"role": "user", "content": user_prompt}
+        memory_message = None
+        if self.messages:
+            # 자신의 행동 기록은 이미 assistant 메시지로 남아 있으므로 제외
+            new_memories = [
+                memory
+                for memory in self.memory_manager.get_memories_since(self._memory_cursor)
+                if "type" not in memory
+            ]
+            if new_memories:
+                memory_message = {
+                    "role": "user",
+                    "content": prompt_builder.memory_prompt(new_memories, "새로운 기억"),
+                }
+            new_messages = [m for m in [memory_message, phase_message] if m]
+            new_tokens = count_message_tokens(new_messages, self.context_assembler.model)
+            if self._history_tokens + new_tokens > budget["input"]:
+                self.logger.info(f"[{self.name}] 입력 토큰 예산 초과로 메시지 기록을 다시 구성합니다.")
+                self.reset_history()
+
+        history_tokens = self._history_tokens
+        if not self.messages:
+            # 기록을 새로 구성하는 경우 예산 안에 들어오는 최근 기억을 포함
+            developer_message = {
+                "role": "developer",
+                "content": prompt_builder.developer_prompt(self.name, self.role),
+            }
+            fixed_tokens = count_message_tokens(
+                [developer_message, phase_message], self.context_assembler.model
+            ) + self.context_assembler.count("이전 기억:\n") + MESSAGE_OVERHEAD_TOKENS
+            memories, _ = self.context_assembler.fit_memories(
+                self.memory_manager.get_recent_memories(
+                    current_day=current_day, days=self.memory_days
+                ),
+                budget=int(budget["input"] * self.REBUILD_RATIO) - fixed_tokens,
+                format_memory=prompt_builder.memory_line,
+            )
+            memory_message = (
+                {"role": "user", "content": prompt_builder.memory_prompt(memories)}
+                if memories
+                else None
+            )
+            self.messages = [developer_message]
+            self._history_tokens = history_tokens = count_message_tokens(
+                self.messages, self.context_assembler.model
+            )
+            self._history_start_day = current_day - self.memory_days
+        self._memory_cursor = self.memory_manager.cursor()
+
+        new_messages = [m for m in [memory_message, phase_message] if m]
+        self.messages.extend(new_messages)
+        self._history_tokens += count_message_tokens(new_messages, self.context_assembler.model)
+
+        # 구성 요소별 토큰 수 기록
+        model = self.context_assembler.model
+        rules_tokens = count_tokens(prompt_builder._rule_prompt(), model)
+        self.last_call_tokens = {
+            "rules": rules_tokens,
+            "role": count_tokens(prompt_builder._role_prompt(self.name, self.role), model),
+            "history": history_tokens - count_message_tokens(self.messages[:1], model),
+            "memories": count_message_tokens([memory_message], model) if memory_message else 0,
+            "phase": count_message_tokens([phase_message], model),
+            "input": self._history_tokens,
+            "output_budget": budget["output"],
+        }
+
+        self.logger.info("%s", new_messages)
+
+        return self.messages
+
+    def _budget(self, phase_key: str) -> Dict[str, int]:
+        """페이즈의 토큰 예산 (페이즈/역할별 max_tokens가 있으면 출력 예산으로 사용)"""
+        budget = token_budget(phase_key)
+        max_tokens = game_config.model_settings(phase_key, self.role.name).get("max_tokens")
+        if max_tokens is not None:
+            budget["output"] = max_tokens
+        return budget
+
+    def _parse(
+        self,
+        phase_key: str,
+        messages: List[Dict],
+        Schema,
+        max_tokens: int,
+        decision: Optional[SLODecision] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        *,
+        day: Optional[int] = None,
+        tokens: Optional[Dict] = None,
+        deadline: Optional[float] = None,
+    ) -> BackendResponse:
+        """백엔드 호출 (페이즈에서 응답 캐시를 쓰면 캐시를 먼저 조회)
+
+        모델과 temperature는 페이즈/역할별 설정(ai_settings.phase_settings, role_settings)을 따르고,
+        지연 시간 목표 제어기의 결정(decision)이 있으면 그 모델을 사용합니다.
+        on_text가 있으면 스트리밍으로 요청하여 발언 필드를 받는 대로 넘기고,
+        끝난 응답 전체를 Schema로 다시 검증합니다.
+        캐시 적중 시에는 백엔드를 호출하지 않으므로 토큰 사용량에 더하지 않고
+        cache_hits만 늘립니다. 거부된 응답은 캐시에 저장하지 않습니다.
+        응답이 출력 상한(max_tokens)에 걸려 잘리면 상한 없이 한 번 더 요청합니다. 스트리밍 중이었거나
+        다시 잘리면 LengthFinishReasonError를 그대로 발생시키고, generate_response가 기본 행동으로 대신합니다.
+        마감(deadline)이 지난 뒤에 도착한 응답은 게임이 이미 기본 행동으로 대신했으므로
+        토큰 사용량과 캐시에 반영하지 않고, 텔레메트리에 late로 표시만 합니다.
+
+        Args:
+            day: 텔레메트리에 기록할 일차
+            tokens: 이 호출의 구성 요소별 토큰 수 (캐시 적중 여부와 사용량을 덧붙임)
+            deadline: 호출 마감 시각 (time.monotonic 기준, 백엔드에 call_deadline으로 전달)
+        """
+        tokens = tokens if tokens is not None else {}
+        settings = game_config.model_settings(phase_key, self.role.name)
+        model = decision.model if decision is not None else settings["model"]
+        temperature = settings["temperature"]
+        cache = self.response_cache if (
+            self.response_cache is not None and self.response_cache.enabled_for(phase_key)
+        ) else None
+
+        start = time.perf_counter()
+        if cache is not None:
+            key = cache_key(model, messages, Schema, temperature, max_tokens)
+            cached = cache.get(key)
+            if cached is not None:
+                if on_text is not None:
+                    JSONFieldStream(STREAM_FIELD, on_text).feed(cached["content"])
+                with self._usage_lock:
+                    self.usage["cache_hits"] += 1
+                tokens.update(cache_hit=True)
+                self._log_call(phase_key, day, model, time.perf_counter() - start, cache_hit=True)
+                return BackendResponse(
+                    parsed=Schema.model_validate_json(cached["content"]),
+                    content=cached["content"],
+                )
+
+        request = dict(
+            model=model,
+            messages=messages,
+            response_format=Schema,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        try:
+            response = self._send(request, on_text, deadline)
+        except openai.LengthFinishReasonError as e:
+            truncated = BackendResponse(parsed=None, content="", usage=e.completion.usage)
+            self._record_usage(truncated.usage, tokens)
+            self._log_call(
+                phase_key,
+                day,
+                model,
+                time.perf_counter() - start,
+                response=truncated,
+                decision=decision,
+                truncated=True,
+            )
+            if on_text is not None or max_tokens is None:
+                raise  # 이미 화면에 보낸 조각은 되돌릴 수 없음
+            self.logger.warning(
+                "[%s] 출력 상한(%d 토큰)에 걸려 상한 없이 다시 요청합니다.", self.name, max_tokens
+            )
+            request["max_tokens"] = None
+            start = time.perf_counter()
+            response = self._send(request, None, deadline)
+        latency = time.perf_counter() - start
+        if deadline is not None and time.monotonic() > deadline:
+            self.logger.info("[%s] 마감 이후에 도착한 응답은 사용량에 반영하지 않습니다.", self.name)
+            self._log_call(phase_key, day, model, latency, response=response, late=True)
+            return response
+        tokens.update(cache_hit=False)
+        self._record_usage(response.usage, tokens)
+        if self.latency_controller is not None:
+            self.latency_controller.observe(
+                model,
+                response.ttfb,
+                latency,
+                getattr(response.usage, "completion_tokens", None),
+                schema=Schema.__name__,
+            )
+        self._log_call(phase_key, day, model, latency, response=response, decision=decision)
+        if response.refusal:
+            raise ValueError("LLM이 응답을 거부했습니다:", response.refusal)
+        if on_text is not None:
+            # 화면에는 조각으로 보여 주었으므로, 공개하기 전에 응답 전체를 스키마로 검증
+            response.parsed = Schema.model_validate_json(response.content)
+
+        if cache is not None:
+            cache.put(key, {"content": response.content})
+        return response
+
+    def _send(
+        self,
+        request: Dict,
+        on_text: Optional[Callable[[str], None]],
+        deadline: Optional[float],
+    ) -> BackendResponse:
+        """백엔드에 요청 (on_text가 있으면 스트리밍, 마감은 call_deadline으로 전달)"""
+        deadline_token = call_deadline.set(deadline)
+        try:
+            if on_text is None:
+                return self.backend.parse(**request)
+            return self.backend.stream(
+                on_delta=JSONFieldStream(STREAM_FIELD, on_text).feed, **request
+            )
+        finally:
+            call_deadline.reset(deadline_token)
+
+    def _log_call(
+        self,
+        phase_key: str,
+        day: Optional[int],
+        model: str,
+        latency: float,
+        response: Optional[BackendResponse] = None,
+        cache_hit: bool = False,
+        decision: Optional[SLODecision] = None,
+        late: bool = False,
+        truncated: bool = False,
+    ):
+        """LLM 호출 한 건의 텔레메트리 이벤트 기록
+
+        지연 시간 목표 제어기의 결정은 slo 필드에, 마감 이후에 도착해 버린 응답은 late 필드에,
+        출력 상한에 걸려 잘린 응답은 truncated 필드에 남깁니다.
+        """
+        extra = {"slo": decision.to_dict()} if decision is not None else {}
+        if late:
+            extra["late"] = True
+        if truncated:
+            extra["truncated"] = True
+            if decision is not None:
+                # 제어기가 줄인 상한 때문에 잘렸는지 텔레메트리에서 바로 보이도록 slo에도 표시
+                extra["slo"]["truncated"] = True
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.game_logger.log_llm_call(
+            player=self.name,
+            role=self.role.name,
+            phase=phase_key,
+            day=day,
+            model=model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0),
+            completion_tokens=getattr(usage, "completion_tokens", 0),
+            cached_tokens=getattr(details, "cached_tokens", None) or 0,
+            ttfb=getattr(response, "ttfb", None),
+            latency=latency,
+            retries=getattr(response, "retries", 0),
+            cache_hit=cache_hit,
+            **extra,
+        )
+
+    def to_state(self) -> Dict:
+        """체크포인트용 상태 (게임 지식, 메시지 기록, 토큰 사용량)
 
-        return str(response.parsed)  # FIXME:
+        메시지 기록을 그대로 저장하므로 재개 후에도 프롬프트 캐시 접두어가 유지됩니다.
+        """
+        return {
+            "game_knowledge": {
+                "known_roles": {
+                    player: getattr(role, "name", role)
+                    for player, role in self.game_knowledge["known_roles"].items()
+                },
+                "suspicious_players": list(self.game_knowledge["suspicious_players"]),
+                "trusted_players": list(self.game_knowledge["trusted_players"]),
+            },
+            "messages": self.messages,
+            "memory_cursor": list(self._memory_cursor) if self._memory_cursor else None,
+            "history_start_day": self._history_start_day,
+            "history_tokens": self._history_tokens,
+            "usage": dict(self.usage),
+        }
 
-    def _update_memory(self, context: ContextType, action: ActionType):
-        """메모리 업데이트"""
-        memory = {
-            "phase": context.get("phase"),
-            "day": context.get("day_count"),
-            "action": action,
-            "context": context,
+    def load_state(self, state: Dict):
+        """to_state()로 저장한 상태 복원"""
+        knowledge = state["game_knowledge"]
+        self.game_knowledge = {
+            "known_roles": {
+                player: Role[role] if role in Role.__members__ else role
+                for player, role in knowledge["known_roles"].items()
+            },
+            "suspicious_players": list(knowledge["suspicious_players"]),
+            "trusted_players": list(knowledge["trusted_players"]),
         }
+        self.messages = list(state["messages"])
+        cursor = state["memory_cursor"]
+        self._memory_cursor = tuple(cursor) if cursor else None
+        self._history_start_day = state["history_start_day"]
+        self._history_tokens = state["history_tokens"]
+        self.usage.update(state["usage"])
+
+    def reset_history(self):
+        """누적된 메시지 기록 초기화 (다음 호출에서 다시 구성)"""
+        self.messages = []
+        self._memory_cursor = None
+        self._history_start_day = None
+        self._history_tokens = 0
+
+    def _record_usage(self, usage, tokens: Dict):
+        """제공자가 보고한 토큰 사용량 (캐시 적중 토큰 포함) 기록
+
+        Args:
+            tokens: 이 호출의 구성 요소별 토큰 수 (사용량을 덧붙여 로그에 남김)
+        """
+        if usage is None:
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+
+        with self._usage_lock:
+            self.usage["calls"] += 1
+            self.usage["prompt_tokens"] += usage.prompt_tokens
+            self.usage["cached_tokens"] += cached_tokens
+            self.usage["completion_tokens"] += usage.completion_tokens
+        tokens.update(
+            prompt_tokens=usage.prompt_tokens,
+            cached_tokens=cached_tokens,
+            completion_tokens=usage.completion_tokens,
+        )
+        self.logger.info("[%s] 토큰 사용량: %s", self.name, dict(tokens))
+
+    def record_action(self, context: ContextType, action: ActionType):
+        """자신의 행동을 기억에 기록
+
+        컨텍스트 전체(이전 기억 목록 포함)를 저장하지 않고,
+        행동 한 건에 필요한 값만 담은 ActionMemoryType으로 기록합니다.
+        """
+        target = action.get("target")
+        memory = ActionMemoryType(
+            day=context.get("day_count"),
+            phase=context.get("phase"),
+            type=action.get("type"),
+            target=getattr(target, "name", target),
+            content=action.get("content") or "",
+        )
         self.memory_manager.add_memory(memory)
 
+    def summarize_memories(self, previous_summary: str, memories: List[MemoryType]) -> str:
+        """오래된 기억을 요약 (MemoryManager.compact의 summarizer)
+
+        요약 요청은 메시지 기록에 남기지 않는 별도 호출이지만,
+        같은 developer 메시지로 시작하므로 프롬프트 캐시 접두어를 공유합니다.
+        밤 행동과 동시에 실행되므로 에이전트의 last_call_tokens는 건드리지 않습니다.
+        """
+        user_prompt, Schema = prompt_builder.summary_prompt(previous_summary, memories)
+        budget = self._budget("summary")
+        messages = [
+            {"role": "developer", "content": prompt_builder.developer_prompt(self.name, self.role)},
+            {"role": "user", "content": user_prompt},
+        ]
+        tokens = {
+            "input": count_message_tokens(messages, self.context_assembler.model),
+            "output_budget": budget["output"],
+        }
+
+        response = self._parse(
+            "summary",
+            messages,
+            Schema,
+            budget["output"],
+            day=memories[-1].get("day") if memories else None,
+            tokens=tokens,
+        )
+        return response.parsed.summary
+
     def update_knowledge(self, new_information: Dict):
         # TODO:
         """게임 정보 업데이트"""
@@ -157,9 +621,73 @@ class LLMAgent:
             if player not in self.game_knowledge["trusted_players"]:
                 self.game_knowledge["trusted_players"].append(player)
 
-    def _get_fallback_action(self, context: ContextType) -> Dict:
-        """오류 발생 시 기본 행동 반환"""
-        raise NotImplementedError
+    FALLBACK_CONVERSATION = "잠시 생각을 정리하겠습니다. 다른 분들의 이야기를 더 듣고 싶습니다."
+    FALLBACK_REASON = "시간 제한으로 기본 행동을 선택했습니다."
+
+    def _get_fallback_action(self, context: ContextType) -> BaseModel:
+        """응답 시간 초과 시 LLM 없이 정하는 기본 행동
+
+        - 낮 대화: 발언을 아끼는 짧은 문장
+        - 투표/밤 행동: 의심 목록에 있는 생존자, 없으면 오늘 기억에서 가장 많이 언급된 생존자
+          (의사는 자신을 치료, 경찰은 아직 역할을 모르는 생존자를 조사)
+
+        Returns:
+            BaseModel: generate_response와 같은 페이즈별 응답 스키마
+        """
+        phase = context.get("phase")
+        if phase == GamePhase.DAY_CONVERSATION:
+            return prompt_builder.ConversationResponse(conversation=self.FALLBACK_CONVERSATION)
+
+        alive = [p.name for p in context.get("alive_players", [])]
+        if phase == GamePhase.NIGHT_ACTION and self.role == Role.DOCTOR:
+            target = self.name
+        else:
+            candidates = [name for name in alive if name != self.name]
+            known = self.game_knowledge["known_roles"]
+            if phase == GamePhase.NIGHT_ACTION and self.role == Role.POLICE:
+                candidates = [name for name in candidates if name not in known] or candidates
+            elif phase == GamePhase.NIGHT_ACTION and self.role == Role.MAFIA:
+                candidates = [name for name in candidates if known.get(name) != Role.MAFIA]
+            target = self._most_suspicious(candidates, context.get("day_count")) or self.name
+
+        if phase == GamePhase.DAY_VOTE:
+            return prompt_builder.VoteResponse(target=target, reason=self.FALLBACK_REASON)
+        if phase == GamePhase.NIGHT_ACTION:
+            return prompt_builder.ActionResponse(target=target, reason=self.FALLBACK_REASON)
+        raise ValueError(f"유효하지 않은 게임 페이즈입니다: {phase}")
+
+    def _most_suspicious(self, candidates: List[str], day: Optional[int]) -> Optional[str]:
+        """의심 목록의 첫 후보, 없으면 오늘 기억에서 가장 많이 언급된 후보"""
+        for name in self.game_knowledge["suspicious_players"]:
+            if name in candidates:
+                return name
+
+        mentions = Counter()
+        for memory in self.memory_manager.get_memories(day) if day is not None else []:
+            content = memory.get("content") or ""
+            for name in candidates:
+                mentions[name] += content.count(name)
+        # 언급 수가 같으면 후보 순서가 앞선 플레이어
+        return max(candidates, key=lambda name: mentions[name], default=None)
+
+
+def _call_before(deadline: float, func, /, *args, **kwargs):
+    """func(*args, **kwargs)를 별도 스레드에서 실행하고 deadline(time.monotonic 기준)까지 결과를 기다림
+
+    시간 안에 끝나지 않으면 concurrent.futures.TimeoutError를 발생시킵니다.
+    실행 중인 호출은 취소할 수 없으므로 데몬 스레드에서 끝날 때까지 두고 결과는 버립니다.
+    (LLMAgent._parse는 같은 마감을 백엔드에 넘기므로 마감 이후에는 재시도하지 않습니다.)
+    """
+    future: Future = Future()
+
+    def run():
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-call", daemon=True).start()
+    return future.result(timeout=max(0.0, deadline - time.monotonic()))
 
 
 if __name__ == "__main__":
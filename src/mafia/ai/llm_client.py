@@ -0,0 +1,68 @@
+"""
+프로세스 전역에서 공유하는 LLM 클라이언트 레지스트리
+
+모든 LLMAgent는 클라이언트를 직접 만들지 않고 이 레지스트리에서 빌려 씁니다.
+같은 (api_key, base_url) 조합에는 하나의 클라이언트와 keep-alive 연결 풀만 존재하므로,
+플레이어 수만큼 TLS 핸드셰이크와 연결 설정 비용을 반복하지 않습니다.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+from mafia.utils.config import game_config
+
+ClientKey = Tuple[str, Optional[str]]
+
+_lock = threading.Lock()
+_clients: Dict[ClientKey, OpenAI] = {}
+
+
+def _pool_limits() -> httpx.Limits:
+    """ai_settings.connection_pool 설정으로 연결 풀 한도 생성"""
+    pool_config = (game_config.get_config("ai_settings") or {}).get("connection_pool", {})
+    return httpx.Limits(
+        max_connections=pool_config.get("max_connections", 20),
+        max_keepalive_connections=pool_config.get("max_keepalive_connections", 10),
+        keepalive_expiry=pool_config.get("keepalive_expiry", 30.0),
+    )
+
+
+def _client_key(api_key: Optional[str], base_url: Optional[str]) -> ClientKey:
+    if api_key is None:
+        api_key = os.environ["OPENAI_API_KEY"]
+    return api_key, base_url
+
+
+def get_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> OpenAI:
+    """공유 클라이언트 반환
+
+    OpenAI 클라이언트는 스레드 간에 안전하게 공유할 수 있으므로
+    동시 투표/밤 행동 요청도 같은 연결 풀을 사용합니다.
+
+    Args:
+        api_key: API 키 (없으면 OPENAI_API_KEY 환경 변수 사용)
+        base_url: OpenAI 호환 엔드포인트 주소 (없으면 기본 주소)
+    """
+    key = _client_key(api_key, base_url)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = OpenAI(
+                api_key=key[0],
+                base_url=base_url,
+                http_client=DefaultHttpxClient(limits=_pool_limits()),
+            )
+            _clients[key] = client
+        return client
+
+
+def close_clients():
+    """공유 클라이언트의 연결 풀 정리 (게임을 마치고 프로세스를 끝낼 때 호출)"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -1,6 +1,178 @@
-from typing import List
+import heapq
+import itertools
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from mafia.utils.enum import MemoryType
+from mafia.utils.enum import GamePhase, MemoryType
+
+MemoryCursor = Tuple[int, int]  # (공개 이벤트 수, 개인 기억 수)
+
+
+class MemoryView(Sequence):
+    """기억 목록의 읽기 전용 구간
+
+    원본 리스트를 복사하지 않고 [start, stop) 구간만 참조합니다.
+    구간은 생성 시점에 고정되므로 이후에 추가된 기억은 포함되지 않습니다.
+    """
+
+    __slots__ = ("_memories", "_start", "_stop")
+
+    def __init__(self, memories: List[MemoryType], start: int, stop: int):
+        self._memories = memories
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return MemoryView(self._memories, self._start + start, self._start + max(start, stop))
+            return [self._memories[self._start + i] for i in range(start, stop, step)]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MemoryView index out of range")
+        return self._memories[self._start + index]
+
+    def __iter__(self):
+        memories = self._memories
+        for i in range(self._start, self._stop):
+            yield memories[i]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class MergedMemoryView(MemoryView):
+    """공개 이벤트와 개인 기억을 발생 순서대로 합친 읽기 전용 구간
+
+    길이는 바로 계산하고, 항목 순회는 두 구간을 지연 병합합니다.
+    인덱스로 접근할 때만 병합 결과를 한 번 만들어 둡니다.
+    head가 주어지면 (예: 압축된 기억의 요약) 맨 앞에 놓입니다.
+    """
+
+    __slots__ = ("_public", "_private", "_head", "_merged")
+
+    def __init__(
+        self,
+        public: Iterable[Tuple[int, MemoryType]],
+        private: Iterable[Tuple[int, MemoryType]],
+        length: int,
+        head: Sequence[MemoryType] = (),
+    ):
+        self._public = public
+        self._private = private
+        self._head = head
+        self._merged: Optional[List[MemoryType]] = None
+        super().__init__([], 0, len(head) + length)
+
+    def _materialize(self) -> List[MemoryType]:
+        if self._merged is None:
+            self._merged = list(self._iter_merged())
+            self._memories = self._merged
+        return self._merged
+
+    def _iter_merged(self) -> Iterator[MemoryType]:
+        return itertools.chain(self._head, _merge(self._public, self._private))
+
+    def __getitem__(self, index):
+        self._materialize()
+        return super().__getitem__(index)
+
+    def __iter__(self):
+        if self._merged is not None:
+            return iter(self._merged)
+        return self._iter_merged()
+
+
+def _merge(
+    public: Iterable[Tuple[int, MemoryType]], private: Iterable[Tuple[int, MemoryType]]
+) -> Iterator[MemoryType]:
+    """공개 이벤트 (위치, 기억)와 개인 기억 (기준 위치, 기억)을 발생 순서대로 병합
+
+    개인 기억의 기준 위치는 추가될 당시의 이벤트 로그 길이이므로,
+    같은 위치의 공개 이벤트보다 앞에 놓입니다.
+    """
+    merged = heapq.merge(
+        ((position, 1, memory) for position, memory in public),
+        ((anchor, 0, memory) for anchor, memory in private),
+        key=lambda item: item[:2],
+    )
+    return (memory for _, _, memory in merged)
+
+
+class MemoryStore:
+    """일차와 페이즈로 색인된 덧붙이기 전용 기억 저장소"""
+
+    def __init__(self):
+        self.memories: List[MemoryType] = []
+        self._days: List[int] = []  # 등장한 일차 (오름차순)
+        self._day_offsets: List[int] = []  # 각 일차의 첫 기억 위치
+        self._phase_index: Dict[Tuple[int, GamePhase], List[int]] = defaultdict(list)
+        self._in_order = True
+
+    def __len__(self) -> int:
+        return len(self.memories)
+
+    def add_memory(self, memory: MemoryType) -> int:
+        """기억을 추가하고 그 위치를 반환"""
+        index = len(self.memories)
+        day = memory["day"]
+        self.memories.append(memory)
+
+        # 일차 색인: 일차가 처음 등장한 위치 기록
+        if not self._days or day > self._days[-1]:
+            self._days.append(day)
+            self._day_offsets.append(index)
+        elif day < self._days[-1]:
+            self._in_order = False  # 과거 일차의 기억이 뒤늦게 추가됨
+
+        self._phase_index[(day, memory.get("phase"))].append(index)
+
+        return index
+
+    def positions_since_day(self, day: int, stop: int) -> Iterable[int]:
+        """stop 이전의 기억 중 day일차 이후 기억의 위치"""
+        if not self._in_order:
+            return [i for i in range(stop) if self.memories[i]["day"] >= day]
+
+        i = bisect_left(self._days, day)
+        start = self._day_offsets[i] if i < len(self._days) else len(self.memories)
+        return range(min(start, stop), stop)
+
+    def positions_of(self, day: int, phase: Optional[GamePhase], stop: int) -> List[int]:
+        """stop 이전의 기억 중 특정 일차(와 페이즈)의 기억 위치"""
+        if phase is not None:
+            return [i for i in self._phase_index.get((day, phase), []) if i < stop]
+        return [i for i in self.positions_since_day(day, stop) if self.memories[i]["day"] == day]
+
+
+class EventLog(MemoryStore):
+    """게임 전체가 공유하는 공개 이벤트 로그
+
+    사회자 공지와 낮 대화처럼 모든 생존자가 듣는 사건은 여기에 한 번만 저장되고,
+    각 플레이어의 MemoryManager는 이 로그에 대한 커서만 가집니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def add_memory(self, memory: MemoryType) -> int:
+        with self._lock:
+            return super().add_memory(memory)
 
 
 class MemoryManager:
@@ -15,14 +187,26 @@ class MemoryManager:
     1. 게임 정보 저장
     2. 대화 기록 저장
     3. 관련 기억 검색
+
+    공개 사건은 게임 전체가 공유하는 EventLog에서 읽고, 밤 행동 결과처럼 본인만 아는
+    사실은 개인 저장소에 보관합니다. 두 저장소 모두 일차와 페이즈별로 색인되어 있어,
+    최근 기억 조회가 전체 목록을 훑거나 복사하지 않습니다.
+
+    최근 기억이 예산을 넘으면 compact()가 오래된 기억을 플레이어별 요약 하나로 대체하여,
+    긴 게임에서도 프롬프트에 들어가는 기억의 양이 일정하게 유지됩니다.
     """
 
-    def __init__(self, name: str):
-        self.memories: List[MemoryType] = []
+    def __init__(self, name: str, event_log: Optional[EventLog] = None):
         self.name = name
+        # 공유 로그가 없으면 (단독 실행) 자신만의 로그를 사용
+        self.event_log = event_log if event_log is not None else EventLog()
+        # 밤에는 compact()가 본인의 행동 기록(add_memory)과 동시에 실행되므로
+        # 개인 기억과 그 위치(anchor)의 추가와, 요약 대상 선택을 함께 보호
+        self._lock = threading.Lock()
+        self.clear_memories()
 
     def add_memory(self, memory: MemoryType):
-        """새로운 기억 추가
+        """새로운 기억 추가 (본인만 접근 가능한 개인 기억)
 
         Args:
             memory: Memory 타입의 기억 객체
@@ -31,24 +215,213 @@ class MemoryManager:
                 - speaker: 발언자
                 - content: 내용
         """
-        self.memories.append(memory)
+        with self._lock:
+            self._private.add_memory(memory)
+            self._anchors.append(len(self.event_log))
 
         return True
 
-    def get_recent_memories(self, current_day: int, days: int = 3) -> List[MemoryType]:
+    def detach(self):
+        """이후의 공개 사건을 더 이상 받지 않음 (사망 등)"""
+        if self._log_stop is None:
+            self._log_stop = len(self.event_log)
+
+    def cursor(self) -> MemoryCursor:
+        """현재까지의 기억 위치 (get_memories_since에 사용)"""
+        return self._public_stop(), len(self._private)
+
+    def get_recent_memories(self, current_day: int, days: int = 3) -> Sequence[MemoryType]:
         """
         최근 기억 조회
         Args:
             days: 최근 기억 조회 일 수
             current_day: 현재 게임 턴
         """
-        return [memory for memory in self.memories if memory["day"] >= current_day - days]
+        compaction = self._compaction
+        public, private = self._recent_positions(current_day, days, compaction)
+        if compaction is None:
+            return self._view(public, private)
+        return self._view(public, private, head=[compaction[0]])
+
+    def compact(
+        self,
+        summarizer: Callable[[str, List[MemoryType]], str],
+        current_day: int,
+        max_entries: int,
+        keep_entries: int,
+        days: int = 3,
+    ) -> bool:
+        """최근 기억이 max_entries개를 넘으면 오래된 기억을 요약으로 대체
+
+        가장 최근 keep_entries개만 원문으로 남기고, 그 이전 기억은 기존 요약과 함께
+        summarizer(기존 요약, 기억 목록)로 요약합니다. summarizer는 LLM을 호출할 수 있어
+        오래 걸리므로, 요약이 끝난 뒤 결과만 한 번에 반영합니다.
+        (요약 중에 추가된 기억은 영향을 받지 않습니다.)
+
+        Returns:
+            bool: 압축 수행 여부
+        """
+        with self._lock:
+            compaction = self._compaction
+            public, private = self._recent_positions(current_day, days, compaction)
+            if len(public) + len(private) <= max_entries:
+                return False
+
+            # 발생 순서대로 정렬된 (출처, 위치) 목록에서 앞부분을 요약 대상으로 선택
+            log, store = self.event_log.memories, self._private.memories
+            order = list(
+                _merge(
+                    ((i, (log, i)) for i in public),
+                    ((self._anchors[j], (store, j)) for j in private),
+                )
+            )
+        folded = order[: max(0, len(order) - keep_entries)]
+        if not folded:
+            return False
+
+        public_floor, private_floor = compaction[1] if compaction else (0, 0)
+        for source, position in folded:
+            if source is log:
+                public_floor = position + 1
+            else:
+                private_floor = position + 1
+
+        memories = [source[position] for source, position in folded]
+        previous_summary = compaction[0]["content"] if compaction else ""
+        summary = MemoryType(
+            day=current_day,
+            phase=memories[-1].get("phase"),
+            speaker="요약",
+            content=summarizer(previous_summary, memories),
+        )
+        self._compaction = (summary, (public_floor, private_floor))
+
+        return True
+
+    def get_summary(self) -> Optional[MemoryType]:
+        """압축된 기억의 요약 조회 (압축 전이면 None)"""
+        return self._compaction[0] if self._compaction else None
+
+    def get_memories(self, day: int, phase: Optional[GamePhase] = None) -> Sequence[MemoryType]:
+        """특정 일차(와 페이즈)의 기억 조회"""
+        public = self.event_log.positions_of(day, phase, self._public_stop())
+        private = self._private.positions_of(day, phase, len(self._private))
+        return self._view(public, private)
+
+    def get_memories_since(self, cursor: Optional[MemoryCursor]) -> Sequence[MemoryType]:
+        """cursor 이후에 추가된 기억 조회"""
+        public_start, private_start = cursor or (0, 0)
+        public = range(public_start, self._public_stop())
+        private = range(private_start, len(self._private))
+        return self._view(public, private)
 
     def get_all_memories(self) -> List[MemoryType]:
         """모든 기억 조회"""
-        return self.memories
+        return list(self.get_memories_since(None))
 
     def clear_memories(self):
-        """모든 기억 삭제"""
-        self.memories = []
+        """모든 기억 삭제
+
+        개인 기억을 비우고, 공유 로그에서는 지금 이후의 사건만 보도록 커서를 옮깁니다.
+        """
+        self._private = MemoryStore()
+        self._anchors: List[int] = []  # 각 개인 기억이 추가될 때의 이벤트 로그 길이
+        self._log_start = len(self.event_log)
+        self._log_stop: Optional[int] = None
+        # (요약 기억, 요약에 포함된 마지막 기억 다음 위치)
+        self._compaction: Optional[Tuple[MemoryType, MemoryCursor]] = None
         return True
+
+    def to_state(self, encode: Callable[[MemoryType], Dict]) -> Dict:
+        """체크포인트용 상태 (공유 이벤트 로그는 GameManager가 따로 저장)
+
+        Args:
+            encode: 기억을 직렬화 가능한 값으로 바꾸는 함수
+        """
+        compaction = self._compaction
+        return {
+            "private": [encode(memory) for memory in self._private.memories],
+            "anchors": list(self._anchors),
+            "log_start": self._log_start,
+            "log_stop": self._log_stop,
+            "compaction": (
+                [encode(compaction[0]), list(compaction[1])] if compaction is not None else None
+            ),
+        }
+
+    def load_state(self, state: Dict, decode: Callable[[Dict], MemoryType]):
+        """to_state()로 저장한 상태 복원 (event_log는 이미 복원되어 있어야 함)"""
+        self._private = MemoryStore()
+        for data in state["private"]:
+            self._private.add_memory(decode(data))
+        self._anchors = list(state["anchors"])
+        self._log_start = state["log_start"]
+        self._log_stop = state["log_stop"]
+        compaction = state["compaction"]
+        self._compaction = (
+            (decode(compaction[0]), tuple(compaction[1])) if compaction is not None else None
+        )
+
+    def _public_stop(self) -> int:
+        return len(self.event_log) if self._log_stop is None else self._log_stop
+
+    def _recent_positions(
+        self,
+        current_day: int,
+        days: int,
+        compaction: Optional[Tuple[MemoryType, MemoryCursor]],
+    ) -> Tuple[Sequence[int], Sequence[int]]:
+        """최근 기억 중 아직 요약되지 않은 공개/개인 기억 위치"""
+        threshold = current_day - days
+        public = self.event_log.positions_since_day(threshold, self._public_stop())
+        private = self._private.positions_since_day(threshold, len(self._private))
+        if compaction is not None:
+            public = _clip(public, compaction[1][0])
+            private = _clip(private, compaction[1][1])
+        return _clip(public, self._log_start), private
+
+    def _view(
+        self, public: Sequence[int], private: Sequence[int], head: Sequence[MemoryType] = ()
+    ) -> MergedMemoryView:
+        """공개/개인 기억 위치로 병합 구간 생성 (로그 참여 이전의 공개 사건은 제외)"""
+        public = _clip(public, self._log_start)
+        return MergedMemoryView(
+            public=_Entries(self.event_log.memories, public),
+            private=_Entries(self._private.memories, private, keys=self._anchors),
+            length=len(public) + len(private),
+            head=head,
+        )
+
+
+def _clip(positions: Sequence[int], floor: int) -> Sequence[int]:
+    """floor 이전의 위치 제외"""
+    if not floor:
+        return positions
+    if isinstance(positions, range):
+        return range(max(positions.start, floor), max(positions.stop, floor))
+    return [i for i in positions if i >= floor]
+
+
+class _Entries:
+    """위치 목록에 해당하는 (정렬 키, 기억) 쌍을 복사 없이 순회
+
+    keys가 없으면 위치 자체를 정렬 키로 사용합니다.
+    """
+
+    __slots__ = ("_memories", "_positions", "_keys")
+
+    def __init__(
+        self,
+        memories: List[MemoryType],
+        positions: Sequence[int],
+        keys: Optional[List[int]] = None,
+    ):
+        self._memories = memories
+        self._positions = positions
+        self._keys = keys
+
+    def __iter__(self):
+        memories, keys = self._memories, self._keys
+        if keys is None:
+            return ((i, memories[i]) for i in self._positions)
+        return ((keys[i], memories[i]) for i in self._positions)
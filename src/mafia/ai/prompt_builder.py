@@ -1,12 +1,14 @@
 """
 LLM 모델에게 입력할 프롬프트를 문자열로 반환하는 함수들
 """
+from functools import lru_cache
 from typing import Any
 
 from pydantic import BaseModel
 from mafia.utils.enum import ContextType, GamePhase, Role
 
 
+@lru_cache(maxsize=None)
 def _rule_prompt():
     return """당신은 마피아 게임의 플레이어입니다.
 
@@ -27,6 +29,7 @@ def _rule_prompt():
 - 게임의 흐름을 고려하여 전략적으로 행동하세요."""
 
 
+@lru_cache(maxsize=None)
 def _role_prompt(name: str, role: Role):
 
     if role == Role.MAFIA:
@@ -91,16 +94,64 @@ def _context_prompt(context: ContextType, game_knowledge: dict[str, Any]):
 - 신뢰할 수 있는 플레이어: {', '.join(game_knowledge.get('trusted_players', []))}"""
 
 
+def memory_line(memory: dict[str, Any]) -> str:
+    phase = memory.get("phase")
+    header = f"[{memory.get('day')}일차 {getattr(phase, 'value', phase)}]"
+
+    if "type" in memory:  # 자신의 행동 기록 (ActionMemoryType)
+        target = f"{memory.get('target')} - " if memory.get("target") else ""
+        return f"{header} 나의 행동({memory.get('type')}): {target}{memory.get('content')}"
+
+    speaker = memory.get("speaker")
+    return f"{header} {getattr(speaker, 'name', speaker)}: {memory.get('content')}"
+
+
+def memory_prompt(memories, title: str = "이전 기억") -> str:
+    return f"{title}:\n" + "\n".join(memory_line(memory) for memory in memories)
+
+
+@lru_cache(maxsize=None)
 def developer_prompt(name: str, role: Role):
     return _rule_prompt() + "\n\n" + _role_prompt(name, role)
 
 
 ###################################
-# 1번 페이즈
-def day_conversation_prompt(context: ContextType, game_knowledge: dict[str, Any]):
-    assert context.get("phase") == GamePhase.DAY_CONVERSATION, "낮 대화 페이즈가 아닙니다"
+# 응답 스키마
+# 스키마 클래스는 모듈 로드 시 한 번만 생성하여 매 호출마다 새 모델 클래스와
+# JSON 스키마를 다시 만들지 않도록 합니다.
+class ConversationResponse(BaseModel):
+    conversation: str
+
+
+class ConversationVoteResponse(BaseModel):
+    """마지막 발언과 함께 미리 정한 투표"""
+
+    conversation: str
+    vote_target: str
+    vote_reason: str
+
+
+class ReasoningResponse(BaseModel):
+    pass  # TODO:
+
+
+class VoteResponse(BaseModel):
+    target: str
+    reason: str
+
+
+class ActionResponse(BaseModel):
+    target: str
+    reason: str
+
 
-    conversation_prompt = """현재는 '낮 대화' 페이즈입니다.
+class SummaryResponse(BaseModel):
+    summary: str
+
+
+###################################
+# 1번 페이즈
+_CONVERSATION_PROMPT = """현재는 '낮 대화' 페이즈입니다.
 
 고려사항:
 1. 자유롭게 발언하세요
@@ -112,36 +163,55 @@ def day_conversation_prompt(context: ContextType, game_knowledge: dict[str, Any]
 - conversation: 당신이 발언하고 싶은 내용
 """
 
-    class ConversationResponse(BaseModel):
-        conversation: str
+
+def day_conversation_prompt(context: ContextType, game_knowledge: dict[str, Any]):
+    assert context.get("phase") == GamePhase.DAY_CONVERSATION, "낮 대화 페이즈가 아닙니다"
 
     return (
-        _context_prompt(context, game_knowledge) + "\n\n" + conversation_prompt,
+        _context_prompt(context, game_knowledge) + "\n\n" + _CONVERSATION_PROMPT,
         ConversationResponse,
     )
 
+
+_FINAL_TURN_PROMPT = """이번이 오늘 당신의 마지막 발언입니다.
+발언과 함께, 이어지는 '낮 투표' 페이즈에서 투표할 대상을 미리 정하세요. (투표 대상은 공개되지 않습니다)
+
+추가 응답 규칙:
+- vote_target: 투표할 플레이어 이름
+- vote_reason: 상세한 투표 이유"""
+
+
+def day_final_turn_prompt(context: ContextType, game_knowledge: dict[str, Any]):
+    """오늘의 마지막 발언과 투표 대상을 한 번에 요청하는 프롬프트"""
+    assert context.get("phase") == GamePhase.DAY_CONVERSATION, "낮 대화 페이즈가 아닙니다"
+
+    return (
+        _context_prompt(context, game_knowledge)
+        + "\n\n"
+        + _CONVERSATION_PROMPT
+        + "\n"
+        + _FINAL_TURN_PROMPT,
+        ConversationVoteResponse,
+    )
+
 ###################################
 # 2번 페이즈
-def day_reasoning_prompt(context: ContextType, game_knowledge: dict[str, Any]):
-    assert context.get("phase") == GamePhase.DAY_REASONING, "낮 추리 페이즈가 아닙니다"
-
-    reasoning_prompt = """현재는 '낮 추리' 페이즈입니다.
+_REASONING_PROMPT = """현재는 '낮 추리' 페이즈입니다.
 
 응답 규칙:
 # TODO: known_roles, suspicious_players, trusted_players
 """
-    class ReasoningResponse(BaseModel):
-        pass  # TODO:
+
+
+def day_reasoning_prompt(context: ContextType, game_knowledge: dict[str, Any]):
+    assert context.get("phase") == GamePhase.DAY_REASONING, "낮 추리 페이즈가 아닙니다"
 
     # raise NotImplementedError
-    return _context_prompt(context, game_knowledge) + "\n" + reasoning_prompt, ReasoningResponse
+    return _context_prompt(context, game_knowledge) + "\n" + _REASONING_PROMPT, ReasoningResponse
 
 ###################################
 # 3번 페이즈
-def day_vote_prompt(context: ContextType, game_knowledge: dict[str, Any]):
-    assert context.get("phase") == GamePhase.DAY_VOTE, "낮 투표 페이즈가 아닙니다"
-
-    vote_prompt = """현재는 '낮 투표' 페이즈입니다.
+_VOTE_PROMPT = """현재는 '낮 투표' 페이즈입니다.
 
 고려사항:
 1. 반드시 지정된 형식으로만 응답하세요
@@ -153,52 +223,73 @@ def day_vote_prompt(context: ContextType, game_knowledge: dict[str, Any]):
 - target: 플레이어 이름
 - reason: 상세한 투표 이유"""
 
-    class VoteResponse(BaseModel):
-        target: str
-        reason: str
 
-    return _context_prompt(context, game_knowledge) + "\n\n" + vote_prompt, VoteResponse
+def day_vote_prompt(context: ContextType, game_knowledge: dict[str, Any]):
+    assert context.get("phase") == GamePhase.DAY_VOTE, "낮 투표 페이즈가 아닙니다"
+
+    return _context_prompt(context, game_knowledge) + "\n\n" + _VOTE_PROMPT, VoteResponse
 
 ###################################
 # 4번 페이즈
-def night_action_prompt(role: Role, context: ContextType, game_knowledge: dict[str, Any]):
-    assert context.get("phase") == GamePhase.NIGHT_ACTION, "밤 행동 페이즈가 아닙니다"
+_ACTION_PROMPT_TEMPLATE = """현재는 '밤 행동' 페이즈입니다.
 
-    if role == Role.MAFIA:
-        role_specific = """- 제거할 대상을 선택하세요
-- 의사와 경찰을 우선적으로 노리는 것이 유리합니다
-- 패턴이 예측되지 않도록 주의하세요"""
+고려사항:
+- 반드시 지정된 형식으로만 응답하세요
+{role_specific}
 
-    elif role == Role.DOCTOR:
-        role_specific = """- 보호할 대상을 선택하세요
+응답 규칙:
+- target: 플레이어 이름
+- reason: 대상을 선택한 구체적인 이유"""
+
+_ACTION_PROMPTS = {
+    role: _ACTION_PROMPT_TEMPLATE.format(role_specific=role_specific)
+    for role, role_specific in {
+        Role.MAFIA: """- 제거할 대상을 선택하세요
+- 의사와 경찰을 우선적으로 노리는 것이 유리합니다
+- 패턴이 예측되지 않도록 주의하세요""",
+        Role.DOCTOR: """- 보호할 대상을 선택하세요
 - 마피아의 다음 타겟을 예측해보세요
 - 중요한 역할을 가진 것으로 예상되는 플레이어를 보호하세요
-- 자신을 보호할 수도 있습니다"""
-
-    elif role == Role.POLICE:
-        role_specific = """- 조사할 대상을 선택하세요
+- 자신을 보호할 수도 있습니다""",
+        Role.POLICE: """- 조사할 대상을 선택하세요
 - 의심스러운 행동을 보인 플레이어를 우선 조사하세요
 - 조사 결과를 잘 기억했다가 낮에 활용하세요
-- 마피아를 찾아내면 낮에 다른 플레이어들을 설득하세요"""
+- 마피아를 찾아내면 낮에 다른 플레이어들을 설득하세요""",
+    }.items()
+}
+
+
+def night_action_prompt(role: Role, context: ContextType, game_knowledge: dict[str, Any]):
+    assert context.get("phase") == GamePhase.NIGHT_ACTION, "밤 행동 페이즈가 아닙니다"
 
-    else:
+    if role not in _ACTION_PROMPTS:
         raise ValueError(f"올바르지 않은 역할입니다: {role}")
 
-    action_prompt = f"""현재는 '밤 행동' 페이즈입니다.
+    return _context_prompt(context, game_knowledge) + "\n\n" + _ACTION_PROMPTS[role], ActionResponse
+
+
+###################################
+# 기억 요약
+_SUMMARY_PROMPT = """지금까지의 기억이 길어져 오래된 기억을 요약하려고 합니다.
 
 고려사항:
-- 반드시 지정된 형식으로만 응답하세요
-{role_specific}
+- 기존 요약과 아래 기억을 합쳐 하나의 요약으로 정리하세요
+- 각 플레이어의 주요 발언, 투표, 의심 관계를 플레이어별로 정리하세요
+- 사망자, 밤 행동 결과 등 게임에 중요한 사실은 빠뜨리지 마세요
+- 당신만 알고 있는 정보는 그대로 유지하세요
 
 응답 규칙:
-- target: 플레이어 이름
-- reason: 대상을 선택한 구체적인 이유"""
+- summary: 플레이어별로 정리한 요약"""
 
-    class ActionResponse(BaseModel):
-        target: str
-        reason: str
 
-    return _context_prompt(context, game_knowledge) + "\n\n" + action_prompt, ActionResponse
+def summary_prompt(previous_summary: str, memories) -> tuple[str, type[SummaryResponse]]:
+    return (
+        f"기존 요약:\n{previous_summary or '없음'}\n\n"
+        + memory_prompt(memories, "요약할 기억")
+        + "\n\n"
+        + _SUMMARY_PROMPT,
+        SummaryResponse,
+    )
 
 
 def generate_prompt_examples():
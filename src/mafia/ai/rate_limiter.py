@@ -0,0 +1,326 @@
+"""
+속도 제한을 지키는 LLM 요청 스케줄러
+
+투표와 밤 행동을 동시에 요청하거나 여러 게임을 함께 돌리면 429(요청 한도 초과)와
+일시적인 서버 오류가 생깁니다. RateLimitedBackend는 백엔드를 감싸서
+- 분당 요청 수(RPM)와 분당 토큰 수(TPM)를 토큰 버킷으로 지키고,
+- 재시도할 수 있는 오류는 지터를 넣은 지수 백오프로 다시 시도하며,
+- 응답의 x-ratelimit-* 헤더를 읽어 서버가 알려준 남은 한도에 맞춰 속도를 조절합니다.
+호출에 마감 시각(backends.call_deadline)이 있으면 마감을 넘기는 재시도는 하지 않습니다.
+
+버킷은 프로세스 안의 모든 에이전트가 공유합니다. (여러 프로세스가 같은 API 키를 쓰는 경우에는
+응답 헤더로 서로의 사용량이 반영됩니다.) 설정은 ai_settings.rate_limit에 둡니다.
+"""
+import functools
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Type
+
+import openai
+from pydantic import BaseModel
+
+from mafia.ai.backends import BackendResponse, LLMBackend, OpenAIBackend, call_deadline
+from mafia.ai.context_assembler import count_message_tokens
+from mafia.utils.config import game_config
+
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "requests_per_minute": 500,
+    "tokens_per_minute": 200000,
+    "max_retries": 5,
+    "backoff_base": 0.5,  # 첫 재시도의 최대 대기 시간 (초)
+    "backoff_max": 30.0,  # 재시도 대기 시간의 상한 (초)
+}
+
+# 재시도할 수 있는 HTTP 상태 코드 (요청 시간 초과, 충돌, 한도 초과, 서버 오류)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """x-ratelimit-reset-* 형식의 시간 ("1s", "6m0s", "20ms")을 초로 변환"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+class TokenBucket:
+    """분당 한도를 지키는 토큰 버킷
+
+    버킷은 capacity까지 차 있다가 요청마다 필요한 양을 꺼내 쓰고, 초당 per_minute / 60씩 다시 찹니다.
+    남은 양이 부족하면 찰 때까지 기다립니다.
+
+    Args:
+        per_minute: 분당 허용량
+        capacity: 한 번에 몰아 쓸 수 있는 최대량 (기본값: per_minute)
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """amount만큼 꺼냄 (부족하면 기다림)
+
+        Returns:
+            float: 기다린 시간 (초)
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                wait = (amount - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def refund(self, amount: float):
+        """예상보다 적게 쓴 양을 돌려받음"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def sync(self, remaining: Optional[float] = None, limit: Optional[float] = None):
+        """서버가 알려준 한도에 맞춤
+
+        Args:
+            remaining: 서버 기준 남은 양 (버킷보다 적으면 버킷을 줄임)
+            limit: 서버 기준 분당 한도 (설정과 다르면 속도와 용량을 바꿈)
+        """
+        with self._lock:
+            self._refill()
+            if limit:
+                self.rate = limit / 60.0
+                self.capacity = limit
+                self.tokens = min(self.tokens, self.capacity)
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+def is_retryable(error: Exception) -> bool:
+    """다시 시도하면 성공할 수 있는 오류인지 확인"""
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """오류 응답의 retry-after(-ms) 헤더 (초)"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    if headers.get("retry-after-ms"):
+        return parse_duration(headers["retry-after-ms"] + "ms")
+    return parse_duration(headers.get("retry-after"))
+
+
+class RateLimitedBackend(LLMBackend):
+    """RPM/TPM 한도를 지키고 일시적인 오류를 재시도하는 백엔드
+
+    Args:
+        backend: 실제 요청을 보낼 백엔드
+        requests: 분당 요청 수 버킷
+        tokens: 분당 토큰 수 버킷
+        max_retries: 최대 재시도 횟수 (넘거나 재시도가 호출 마감을 넘기면 마지막 오류를 그대로 발생)
+        backoff_base: 첫 재시도의 최대 대기 시간 (초, 재시도마다 두 배)
+        backoff_max: 재시도 대기 시간의 상한 (초)
+    """
+
+    name = "rate_limited"
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        requests: TokenBucket,
+        tokens: TokenBucket,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend
+        self.requests = requests
+        self.tokens = tokens
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._clock = clock
+
+    def parse(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        return self._send(
+            self.backend.parse,
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    def stream(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        on_delta: Callable[[str], None],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        """parse()와 같지만 조각을 하나라도 보낸 뒤의 오류는 재시도하지 않음
+
+        재시도한 응답은 처음부터 다시 오므로, 이미 보낸 조각 뒤에 이어 붙일 수 없습니다.
+        """
+        delivered = []
+
+        def forward(delta: str):
+            delivered.append(delta)
+            on_delta(delta)
+
+        return self._send(
+            functools.partial(self.backend.stream, on_delta=forward),
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            can_retry=lambda: not delivered,
+        )
+
+    def _send(
+        self,
+        call: Callable[..., BackendResponse],
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        can_retry: Callable[[], bool] = lambda: True,
+    ) -> BackendResponse:
+        """한도 안에서 call(parse 또는 stream)을 보내고 재시도할 수 있는 오류는 다시 시도
+
+        can_retry()가 False이면 재시도할 수 있는 오류도 그대로 발생시킵니다.
+        """
+        estimate = count_message_tokens(messages, model) + (max_tokens or 0)
+        deadline = call_deadline.get()
+        attempt = 0
+        while True:
+            self.requests.acquire(1)
+            self.tokens.acquire(estimate)
+            try:
+                response = call(
+                    model=model,
+                    messages=messages,
+                    response_format=response_format,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                self.tokens.refund(estimate)  # 실패한 요청은 토큰을 쓰지 않음
+                if attempt >= self.max_retries or not is_retryable(e) or not can_retry():
+                    raise
+                delay = self._backoff(attempt, retry_after(e))
+                if deadline is not None and self._clock() + delay >= deadline:
+                    raise  # 게임이 응답을 기다리지 않으므로 공유 한도를 더 쓰지 않음
+                self._sleep(delay)
+                attempt += 1
+                continue
+
+            usage = response.usage
+            if usage is not None:
+                used = (usage.prompt_tokens or 0) + (usage.completion_tokens or 0)
+                self.tokens.refund(max(0, estimate - used))
+            self._sync(response.headers)
+            response.retries += attempt
+            return response
+
+    def _backoff(self, attempt: int, hint: Optional[float]) -> float:
+        """재시도 대기 시간 (full jitter 지수 백오프, 서버가 알려준 시간이 있으면 그 이상)"""
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if hint is not None:
+            delay = max(delay, min(hint, self.backoff_max))
+        return delay
+
+    def _sync(self, headers: Mapping[str, str]):
+        """응답의 x-ratelimit-* 헤더로 버킷 조정"""
+        if not headers:
+            return
+        for bucket, kind in [(self.requests, "requests"), (self.tokens, "tokens")]:
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            bucket.sync(
+                remaining=float(remaining) if remaining else None,
+                limit=float(limit) if limit else None,
+            )
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def rate_limited(backend: LLMBackend) -> LLMBackend:
+    """ai_settings.rate_limit 설정에 따라 백엔드를 RateLimitedBackend로 감쌈
+
+    버킷은 프로세스 안에서 공유하므로 같은 프로세스의 모든 에이전트가 한도를 나눠 씁니다.
+    """
+    ai_config = game_config.get_config("ai_settings") or {}
+    settings = {**DEFAULT_SETTINGS, **ai_config.get("rate_limit", {})}
+    if not settings["enabled"]:
+        return backend
+
+    if isinstance(backend, OpenAIBackend):
+        # 재시도는 스케줄러가 담당하므로 클라이언트 자체의 재시도는 끔
+        backend.client = backend.client.with_options(max_retries=0)
+
+    with _buckets_lock:
+        if not _buckets:
+            _buckets["requests"] = TokenBucket(settings["requests_per_minute"])
+            _buckets["tokens"] = TokenBucket(settings["tokens_per_minute"])
+    return RateLimitedBackend(
+        backend,
+        requests=_buckets["requests"],
+        tokens=_buckets["tokens"],
+        max_retries=settings["max_retries"],
+        backoff_base=settings["backoff_base"],
+        backoff_max=settings["backoff_max"],
+    )
@@ -0,0 +1,473 @@
+"""
+꼬리 지연 시간 제어: 중복 요청(hedging)과 회로 차단기(circuit breaker)
+
+낮 대화는 발언이 차례로 이어지므로 느린 응답 하나가 테이블 전체를 멈춥니다.
+- HedgedBackend: 요청이 최근 지연 시간의 백분위 값(예: p95)을 넘기면 같은 요청을 한 번 더
+  보내고, 먼저 도착한 응답을 사용합니다.
+- FailoverBackend: 최근 호출의 오류율이나 느린 호출 비율이 임계값을 넘으면 회로를 열어
+  보조 백엔드(또는 보조 모델)로 요청을 돌리고, 대기 시간이 지나면 주 백엔드를 다시 시험합니다.
+
+지연 시간 기록은 (백엔드, 모델)별로, 차단기 상태는 백엔드별로 프로세스 안의 모든 에이전트가 공유합니다.
+설정은 ai_settings.hedging, ai_settings.circuit_breaker에 둡니다.
+"""
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from mafia.ai.backends import BackendResponse, LLMBackend, OpenAIBackend, build_backend
+from mafia.ai.rate_limiter import rate_limited
+from mafia.utils.config import game_config
+from mafia.utils.logger import game_logger, percentile
+
+HEDGING_DEFAULTS = {
+    "enabled": False,
+    "percentile": 95,  # 이 백분위의 지연 시간을 넘으면 중복 요청
+    "min_samples": 20,  # 백분위를 계산하기 위한 최소 기록 수
+    "initial_delay": 10.0,  # 기록이 부족할 때 사용할 중복 요청 대기 시간 (초)
+    "max_hedges": 1,  # 요청 하나당 추가로 보낼 최대 중복 요청 수
+    "window": 200,  # 지연 시간을 기억할 최근 호출 수
+}
+
+CIRCUIT_BREAKER_DEFAULTS = {
+    "enabled": False,
+    # 회로가 열렸을 때 사용할 백엔드와 모델 (둘 중 하나는 있어야 차단기를 사용)
+    "secondary_backend": None,  # 없으면 주 백엔드
+    "secondary_model": None,  # 없으면 같은 모델
+    "window": 20,  # 판단에 사용할 최근 호출 수
+    "min_calls": 10,  # 회로를 열기 위한 최소 호출 수
+    "error_rate": 0.5,  # 오류율 임계값
+    "slow_call_seconds": 20.0,  # 이 시간보다 오래 걸린 호출은 느린 호출
+    "slow_call_rate": 0.5,  # 느린 호출 비율 임계값
+    "cooldown": 30.0,  # 회로를 연 뒤 주 백엔드를 다시 시험하기까지의 시간 (초)
+}
+
+
+class LatencyTracker:
+    """최근 호출의 지연 시간 기록
+
+    Args:
+        window: 기억할 최근 호출 수
+        min_samples: 백분위를 계산하기 위한 최소 기록 수
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q 백분위 지연 시간 (기록이 min_samples개 미만이면 None)"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            return percentile(list(self._latencies), q)
+
+
+class _StreamOwner:
+    """중복 요청 중 스트림을 차지한 요청 번호 (처음으로 조각이나 성공한 응답을 낸 요청)"""
+
+    def __init__(self):
+        self.attempt: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def claim(self, attempt: int) -> bool:
+        """attempt가 스트림을 차지했거나 새로 차지하면 True"""
+        with self._lock:
+            if self.attempt is None:
+                self.attempt = attempt
+            return self.attempt == attempt
+
+
+class HedgedBackend(LLMBackend):
+    """느린 요청에 중복 요청을 보내고 먼저 도착한 응답을 사용하는 백엔드
+
+    중복 요청 대기 시간은 요청한 모델의 최근 지연 시간의 percentile 백분위 값이고,
+    기록이 부족하면 initial_delay를 사용합니다. 모든 요청이 실패하면 마지막 오류를 발생시킵니다.
+    스트리밍 요청은 첫 조각이 도착하기 전까지만 중복 요청을 보냅니다.
+
+    Args:
+        backend: 요청을 보낼 백엔드
+        tracker: 지연 시간 기록 (에이전트 간에 공유), 또는 모델 이름으로 기록을 찾는 함수
+        percentile: 중복 요청 기준 백분위
+        initial_delay: 기록이 부족할 때의 중복 요청 대기 시간 (초, None이면 중복 요청 안 함)
+        max_hedges: 추가로 보낼 최대 중복 요청 수
+    """
+
+    name = "hedged"
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        tracker: Union[LatencyTracker, Callable[[str], LatencyTracker]],
+        percentile: float = 95,
+        initial_delay: Optional[float] = 10.0,
+        max_hedges: int = 1,
+    ):
+        self.backend = backend
+        self.tracker = tracker
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.max_hedges = max_hedges
+        self.hedges = 0  # 보낸 중복 요청 수
+        self._lock = threading.Lock()
+
+    def tracker_for(self, model: str) -> LatencyTracker:
+        """model의 지연 시간 기록"""
+        return self.tracker if isinstance(self.tracker, LatencyTracker) else self.tracker(model)
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """model에 보낸 요청이 중복 요청을 보내기까지 기다릴 시간 (초)"""
+        delay = self.tracker_for(model).percentile(self.percentile)
+        return delay if delay is not None else self.initial_delay
+
+    def parse(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        request = dict(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return self._hedge(lambda attempt: self.backend.parse(**request), model)
+
+    def stream(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        on_delta: Callable[[str], None],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        """parse()와 같지만 첫 조각이 도착하기 전까지만 중복 요청을 보냄
+
+        먼저 조각을 보낸 요청이 스트림을 차지하고, 나머지 요청의 조각과 응답은 버립니다.
+        """
+        request = dict(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        owner = _StreamOwner()
+
+        def send(attempt: int) -> BackendResponse:
+            def forward(delta: str):
+                if owner.claim(attempt):
+                    on_delta(delta)
+
+            return self.backend.stream(on_delta=forward, **request)
+
+        return self._hedge(send, model, owner)
+
+    def _hedge(
+        self,
+        send: Callable[[int], BackendResponse],
+        model: str,
+        owner: Optional[_StreamOwner] = None,
+    ) -> BackendResponse:
+        """send(요청 번호)를 보내고, 늦으면 중복 요청을 보내 먼저 성공한 응답을 반환
+
+        owner가 있으면 스트림을 차지한 요청의 결과만 사용하고, 그 뒤로는 중복 요청을 보내지 않습니다.
+        """
+        results: "queue.Queue[Tuple[int, Optional[BackendResponse], Optional[BaseException], float]]" = (
+            queue.Queue()
+        )
+
+        def run(attempt: int):
+            start = time.monotonic()
+            try:
+                results.put((attempt, send(attempt), None, time.monotonic() - start))
+            except BaseException as e:  # pylint: disable=broad-except
+                results.put((attempt, None, e, time.monotonic() - start))
+
+        def start_request(attempt: int):
+            # 요청 스레드도 호출 마감(call_deadline)을 알 수 있도록 컨텍스트를 복사해서 실행
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run, args=(run, attempt), name="llm-hedge", daemon=True
+            ).start()
+
+        tracker = self.tracker_for(model)
+        delay = self.hedge_delay(model)
+        sent, failed = 1, 0
+        start_request(0)
+        while True:
+            streaming = owner is not None and owner.attempt is not None
+            can_hedge = delay is not None and sent <= self.max_hedges and not streaming
+            try:
+                attempt, response, error, latency = results.get(
+                    timeout=delay if can_hedge else None
+                )
+            except queue.Empty:
+                # 응답이 늦으면 같은 요청을 한 번 더 보냄 (먼저 온 응답 사용)
+                start_request(sent)
+                sent += 1
+                with self._lock:
+                    self.hedges += 1
+                continue
+
+            if error is not None:
+                failed += 1
+                # 조각을 이미 보낸 요청이 실패하면 다른 요청으로 이어 받을 수 없음
+                if failed == sent or (owner is not None and owner.attempt == attempt):
+                    raise error
+                continue
+            if owner is not None and not owner.claim(attempt):
+                continue  # 다른 요청이 이미 스트림을 차지함
+            tracker.add(latency)
+            return response
+
+
+class CircuitBreaker:
+    """최근 호출의 오류율과 느린 호출 비율로 여닫는 회로 차단기
+
+    - closed: 주 백엔드 사용. 최근 호출 중 오류나 느린 호출의 비율이 임계값을 넘으면 open
+    - open: 보조 백엔드 사용. cooldown이 지나면 half_open
+    - half_open: 주 백엔드에 시험 요청 하나를 보내 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 20.0,
+        slow_call_rate: float = 0.5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.cooldown = cooldown
+        self.state = "closed"
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (오류, 느림)
+        self._opened_at = 0.0
+        self._probing = False
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """주 백엔드로 요청을 보내도 되는지 확인"""
+        with self._lock:
+            if self.state == "open" and self._clock() - self._opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return self.state == "closed"
+
+    def record(self, success: bool, latency: float):
+        """주 백엔드 호출 결과 기록"""
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self.state == "half_open":
+                if success and not slow:
+                    self._transition("closed")
+                    self._outcomes.clear()
+                else:
+                    self._transition("open")
+                return
+
+            self._outcomes.append((not success, slow))
+            calls = len(self._outcomes)
+            if self.state == "closed" and calls >= self.min_calls:
+                errors = sum(1 for error, _ in self._outcomes if error)
+                slows = sum(1 for _, is_slow in self._outcomes if is_slow)
+                if errors / calls >= self.error_rate or slows / calls >= self.slow_call_rate:
+                    self._transition("open")
+
+    def _transition(self, state: str):
+        if state == "open":
+            self._opened_at = self._clock()
+        self._probing = False
+        if state != self.state:
+            game_logger.warning(f"회로 차단기 상태 변경: {self.state} -> {state}")
+        self.state = state
+
+
+class FailoverBackend(LLMBackend):
+    """회로 차단기가 열리면 보조 백엔드(또는 보조 모델)로 요청을 돌리는 백엔드
+
+    회로가 닫혀 있을 때 주 백엔드가 실패하면 그 요청은 보조 백엔드로 다시 보냅니다.
+    (스트리밍 요청은 조각을 보내기 전에 실패한 경우에만)
+
+    Args:
+        primary: 주 백엔드
+        secondary: 보조 백엔드
+        breaker: 회로 차단기 (에이전트 간에 공유)
+        secondary_model: 보조 백엔드에 사용할 모델 (없으면 같은 모델)
+    """
+
+    name = "failover"
+
+    def __init__(
+        self,
+        primary: LLMBackend,
+        secondary: LLMBackend,
+        breaker: CircuitBreaker,
+        secondary_model: Optional[str] = None,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.breaker = breaker
+        self.secondary_model = secondary_model
+
+    def parse(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        request = dict(
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return self._route(lambda backend, model: backend.parse(model=model, **request), model)
+
+    def stream(
+        self,
+        *,
+        model: str,
+        messages: List[Dict],
+        response_format: Type[BaseModel],
+        on_delta: Callable[[str], None],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> BackendResponse:
+        """parse()와 같은 경로로 스트리밍 (주 백엔드가 조각을 보낸 뒤 실패하면 오류를 그대로 발생)"""
+        request = dict(
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        delivered = []
+
+        def forward(delta: str):
+            delivered.append(delta)
+            on_delta(delta)
+
+        return self._route(
+            lambda backend, model: backend.stream(model=model, on_delta=forward, **request),
+            model,
+            can_fail_over=lambda: not delivered,
+        )
+
+    def _route(
+        self,
+        send: Callable[[LLMBackend, str], BackendResponse],
+        model: str,
+        can_fail_over: Callable[[], bool] = lambda: True,
+    ) -> BackendResponse:
+        """차단기 상태에 따라 send(백엔드, 모델)를 주 백엔드나 보조 백엔드로 보냄
+
+        주 백엔드가 실패했을 때 can_fail_over()가 False이면 보조 백엔드로 보내지 않고 오류를 그대로 발생시킵니다.
+        """
+        if self.breaker.allow():
+            start = time.monotonic()
+            try:
+                response = send(self.primary, model)
+            except Exception:  # pylint: disable=broad-except
+                self.breaker.record(False, time.monotonic() - start)
+                if not can_fail_over():
+                    raise  # 이미 보낸 조각 뒤에 보조 백엔드의 응답을 이어 붙일 수 없음
+                game_logger.warning("주 백엔드 호출 실패로 보조 백엔드를 사용합니다.")
+            else:
+                self.breaker.record(True, time.monotonic() - start)
+                return response
+
+        return send(self.secondary, self.secondary_model or model)
+
+
+_trackers: Dict[Tuple[str, str], LatencyTracker] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def resilient(backend: LLMBackend, name: str) -> LLMBackend:
+    """ai_settings.hedging / circuit_breaker 설정에 따라 백엔드를 감쌈
+
+    Args:
+        backend: 감쌀 백엔드
+        name: 백엔드 이름 (차단기를 공유하는 단위, 지연 시간 기록은 모델별로 나눔)
+    """
+    ai_config = game_config.get_config("ai_settings") or {}
+    hedging = {**HEDGING_DEFAULTS, **ai_config.get("hedging", {})}
+    breaker_config = {**CIRCUIT_BREAKER_DEFAULTS, **ai_config.get("circuit_breaker", {})}
+
+    if hedging["enabled"]:
+
+        def tracker(model: str) -> LatencyTracker:
+            # 모델마다 지연 시간 분포가 다르므로 (백엔드, 모델)별로 기록
+            with _registry_lock:
+                key = (name, model)
+                if key not in _trackers:
+                    _trackers[key] = LatencyTracker(hedging["window"], hedging["min_samples"])
+                return _trackers[key]
+
+        backend = HedgedBackend(
+            backend,
+            tracker,
+            percentile=hedging["percentile"],
+            initial_delay=hedging["initial_delay"],
+            max_hedges=hedging["max_hedges"],
+        )
+
+    if breaker_config["enabled"] and not (
+        breaker_config["secondary_backend"] or breaker_config["secondary_model"]
+    ):
+        # 보조 백엔드도 보조 모델도 없으면 같은 곳으로 다시 보낼 뿐이므로 차단기를 쓰지 않음
+        game_logger.warning(
+            "회로 차단기에 secondary_backend나 secondary_model이 없어 차단기를 사용하지 않습니다."
+        )
+    elif breaker_config["enabled"]:
+        with _registry_lock:
+            breaker = _breakers.setdefault(
+                name,
+                CircuitBreaker(
+                    window=breaker_config["window"],
+                    min_calls=breaker_config["min_calls"],
+                    error_rate=breaker_config["error_rate"],
+                    slow_call_seconds=breaker_config["slow_call_seconds"],
+                    slow_call_rate=breaker_config["slow_call_rate"],
+                    cooldown=breaker_config["cooldown"],
+                ),
+            )
+        secondary = backend
+        if breaker_config["secondary_backend"]:
+            secondary = build_backend(breaker_config["secondary_backend"])
+            if isinstance(secondary, OpenAIBackend):
+                secondary = rate_limited(secondary)
+        backend = FailoverBackend(
+            backend, secondary, breaker, secondary_model=breaker_config["secondary_model"]
+        )
+
+    return backend
@@ -0,0 +1,234 @@
+"""
+LLM 응답 캐시
+
+같은 요청(모델, 메시지, 응답 스키마, 생성 설정)에는 저장해 둔 응답을 돌려주어
+유료 호출과 지연 시간을 줄입니다. 파라미터 실험처럼 같은 프롬프트(1일차 첫 발언,
+같은 투표 상황 등)가 반복되는 경우에 효과가 있습니다.
+
+- 메모리 계층: 프로세스 안의 LRU (OrderedDict)
+- 디스크 계층: SQLite 파일 (여러 프로세스와 실행 사이에서 공유, 마지막 사용 시각 기준 LRU)
+
+두 계층 모두 항목 수 제한과 TTL을 지키며, 캐시 사용 여부는 페이즈별로 설정합니다.
+설정은 ai_settings.response_cache에 둡니다.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from mafia.utils.config import game_config
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "memory_entries": 1024,
+    "path": None,  # SQLite 파일 경로 (없으면 메모리 계층만 사용)
+    "disk_entries": 100000,
+    "ttl": 7 * 24 * 3600,  # 초 (0이면 만료 없음)
+    "phases": {},
+}
+
+
+def cache_key(
+    model: str,
+    messages: List[Dict],
+    response_format: Type[BaseModel],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """요청을 정규화한 해시
+
+    메시지는 role과 앞뒤 공백을 제거한 content만 사용하고,
+    응답 스키마는 클래스 객체 대신 JSON 스키마로 비교합니다.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": [[m["role"], m["content"].strip()] for m in messages],
+            "schema": response_format.model_json_schema(),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """메모리 LRU + SQLite 2단계 응답 캐시
+
+    저장하는 값은 응답 원문(content)뿐입니다. 적중한 호출은 토큰을 쓰지 않으므로 사용량은 저장하지 않습니다.
+
+    Args:
+        memory_entries: 메모리 계층의 최대 항목 수
+        path: SQLite 파일 경로 (None이면 디스크 계층 없음)
+        disk_entries: 디스크 계층의 최대 항목 수
+        ttl: 항목 유효 시간 (초, 0이면 만료 없음)
+        phases: 페이즈별 사용 여부 (예: {"day_vote": True, "day_conversation": False})
+        enabled: phases에 없는 페이즈의 사용 여부
+    """
+
+    def __init__(
+        self,
+        memory_entries: int = 1024,
+        path: Optional[str] = None,
+        disk_entries: int = 100000,
+        ttl: float = 0,
+        phases: Optional[Dict[str, bool]] = None,
+        enabled: bool = True,
+    ):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+        self.phases = dict(phases or {})
+        self.enabled = enabled
+        self.stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+            self._db.commit()
+
+    def enabled_for(self, phase_key: str) -> bool:
+        """페이즈의 캐시 사용 여부"""
+        return self.phases.get(phase_key, self.enabled)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """저장된 응답 조회 (없거나 만료되었으면 None)"""
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                created_at, value = item
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        self._db.execute(
+                            "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        value = json.loads(row[0])
+                        self._remember(key, row[1], value)
+                        self.stats["hits"] += 1
+                        self.stats["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Dict):
+        """응답 저장"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is None:
+                return
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            if self.ttl:
+                self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            overflow = (
+                self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.disk_entries
+            )
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats["evictions"] += overflow
+            self._db.commit()
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, created_at: float, value: Dict):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl) and now - created_at > self.ttl
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """ai_settings.response_cache 설정으로 만든 프로세스 공용 캐시
+
+    enabled가 꺼져 있고 페이즈별로 켠 것도 없으면 None을 반환합니다.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            ai_config = game_config.get_config("ai_settings") or {}
+            settings = {**DEFAULT_SETTINGS, **ai_config.get("response_cache", {})}
+            if not settings["enabled"] and not any(settings["phases"].values()):
+                return None
+            _cache = ResponseCache(
+                memory_entries=settings["memory_entries"],
+                path=settings["path"],
+                disk_entries=settings["disk_entries"],
+                ttl=settings["ttl"],
+                phases=settings["phases"],
+                enabled=settings["enabled"],
+            )
+        return _cache
+
+
+def reset_response_cache():
+    """공용 캐시를 닫고 다음 조회 때 설정을 다시 읽도록 초기화"""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = None
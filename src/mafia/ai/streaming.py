@@ -0,0 +1,105 @@
+"""
+스트리밍 응답에서 JSON 문자열 필드 하나를 받는 대로 꺼내는 디코더
+
+구조화된 응답은 {"conversation": "..."} 형태의 JSON 원문이 조각(delta)으로 도착합니다.
+JSONFieldStream은 조각을 이어 받으며 최상위 객체의 지정한 필드 값만 디코딩하여
+(이스케이프 문자 포함) 콜백으로 넘깁니다. 응답 전체의 스키마 검증은 스트림이 끝난 뒤
+응답 스키마로 따로 합니다.
+"""
+from typing import Callable, Optional
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JSONFieldStream:
+    """JSON 원문 조각에서 최상위 문자열 필드 하나의 값을 디코딩하여 전달
+
+    Args:
+        field: 꺼낼 필드 이름 (예: "conversation")
+        on_text: 디코딩한 텍스트 조각을 받을 콜백
+    """
+
+    def __init__(self, field: str, on_text: Optional[Callable[[str], None]] = None):
+        self.field = field
+        self.on_text = on_text
+        self.text = ""  # 지금까지 디코딩한 필드 값
+        self._depth = 0
+        self._in_string = False
+        self._is_key = False
+        self._expecting_key = False
+        self._capturing = False
+        self._escape = False
+        self._unicode: Optional[str] = None  # \uXXXX의 16진수 부분
+        self._high_surrogate: Optional[str] = None
+        self._key = ""
+        self._last_key: Optional[str] = None
+        self._chunk = ""
+
+    def feed(self, delta: str) -> str:
+        """응답 원문 조각을 처리하고 새로 디코딩한 필드 텍스트를 반환"""
+        self._chunk = ""
+        for c in delta:
+            if self._in_string:
+                self._feed_string(c)
+            elif c == '"':
+                self._in_string = True
+                self._is_key = self._depth == 1 and self._expecting_key
+                self._key = ""
+                self._capturing = (
+                    not self._is_key and self._depth == 1 and self._last_key == self.field
+                )
+            elif c in "{[":
+                self._depth += 1
+                self._expecting_key = c == "{" and self._depth == 1
+            elif c in "}]":
+                self._depth -= 1
+            elif c == "," and self._depth == 1:
+                self._expecting_key = True
+            elif c == ":" and self._depth == 1:
+                self._expecting_key = False
+
+        chunk = self._chunk
+        if chunk:
+            self.text += chunk
+            if self.on_text is not None:
+                self.on_text(chunk)
+        return chunk
+
+    def _feed_string(self, c: str):
+        if self._unicode is not None:
+            self._unicode += c
+            if len(self._unicode) == 4:
+                code, self._unicode = self._unicode, None
+                self._char(chr(int(code, 16)))
+            return
+        if self._escape:
+            self._escape = False
+            if c == "u":
+                self._unicode = ""
+            else:
+                self._char(_ESCAPES.get(c, c))
+            return
+        if c == "\\":
+            self._escape = True
+        elif c == '"':
+            self._in_string = False
+            if self._is_key:
+                self._last_key = self._key
+            self._capturing = False
+        else:
+            self._char(c)
+
+    def _char(self, c: str):
+        if self._is_key:
+            self._key += c
+            return
+        if not self._capturing:
+            return
+        # 😀 같은 서로게이트 쌍은 합쳐서 한 글자로 전달
+        if "\ud800" <= c <= "\udbff":
+            self._high_surrogate = c
+            return
+        if self._high_surrogate is not None:
+            pair, self._high_surrogate = self._high_surrogate + c, None
+            c = pair.encode("utf-16", "surrogatepass").decode("utf-16")
+        self._chunk += c
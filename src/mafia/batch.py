@@ -0,0 +1,136 @@
+"""
+여러 게임을 프로세스 풀에서 병렬로 실행하는 헤드리스 배치 시뮬레이터
+
+역할 구성이나 모델별 승률을 추정하기 위해 N개의 게임을 ProcessPoolExecutor로 실행하고,
+게임이 끝나는 대로 결과(승리 팀, 진행 일수, 사망자, LLM 호출 수)를 JSON lines로 내보낸 뒤
+전체 요약을 출력합니다.
+
+실행: mafia-batch --games 1000 --workers 8 --backend stub
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from mafia.ai.backends import create_backend
+from mafia.game.game_manager import GameManager
+
+
+def run_game(seed: int, backend: Optional[str] = None, backend_options: Optional[Dict] = None) -> Dict:
+    """게임 하나를 실행하고 결과 반환 (작업 프로세스에서 실행)
+
+    Args:
+        seed: 게임 시드 (역할 배정, 무작위 대상 선택, 스텁 응답에 사용)
+        backend: LLM 백엔드 이름 (없으면 ai_settings.backend)
+        backend_options: 백엔드 생성 인자
+    """
+    options = dict(backend_options or {})
+    if backend == "stub":
+        options.setdefault("seed", seed)
+
+    start = time.perf_counter()
+    try:
+        game = GameManager(backend=create_backend(backend, **options), seed=seed)
+        game.initialize_game()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_result = game.spin()
+    except Exception as e:  # pylint: disable=broad-except
+        return {"seed": seed, "error": repr(e), "elapsed": time.perf_counter() - start}
+
+    return {"seed": seed, **game.report(game_result), "elapsed": time.perf_counter() - start}
+
+
+def run_batch(
+    games: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    backend: Optional[str] = None,
+    backend_options: Optional[Dict] = None,
+) -> Iterator[Dict]:
+    """게임 N개를 프로세스 풀에서 실행하고 끝나는 순서대로 결과 반환
+
+    게임 i의 시드는 seed + i입니다.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_game, seed + i, backend, backend_options) for i in range(games)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results: Iterable[Dict]) -> Dict:
+    """게임 결과 목록을 하나의 요약으로 집계"""
+    results: List[Dict] = list(results)
+    finished = [r for r in results if "error" not in r]
+    summary = {
+        "games": len(results),
+        "errors": len(results) - len(finished),
+        "wins": {},
+        "win_rate": {},
+        "avg_days": 0.0,
+        "avg_deaths": 0.0,
+        "llm_calls": sum(r["llm_calls"] for r in finished),
+        "prompt_tokens": sum(r["prompt_tokens"] for r in finished),
+        "completion_tokens": sum(r["completion_tokens"] for r in finished),
+    }
+    if not finished:
+        return summary
+
+    for result in finished:
+        summary["wins"][result["winner"]] = summary["wins"].get(result["winner"], 0) + 1
+    summary["win_rate"] = {team: wins / len(finished) for team, wins in summary["wins"].items()}
+    summary["avg_days"] = sum(r["days"] for r in finished) / len(finished)
+    summary["avg_deaths"] = sum(len(r["deaths"]) for r in finished) / len(finished)
+    summary["avg_llm_calls"] = summary["llm_calls"] / len(finished)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="마피아 게임 배치 시뮬레이션")
+    parser.add_argument("--games", type=int, default=100, help="실행할 게임 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="작업 프로세스 수")
+    parser.add_argument("--seed", type=int, default=0, help="첫 게임의 시드")
+    parser.add_argument("--backend", default=None, help="LLM 백엔드 (openai, local, stub)")
+    parser.add_argument(
+        "--latency", type=float, default=None, help="스텁 백엔드의 가짜 지연 시간 (초)"
+    )
+    parser.add_argument("--output", default=None, help="게임별 결과를 기록할 JSON lines 파일")
+    args = parser.parse_args(argv)
+
+    if args.backend != "stub":
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
+    backend_options = {"latency": args.latency} if args.latency is not None else None
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    results = []
+    start = time.perf_counter()
+    try:
+        for result in run_batch(args.games, args.workers, args.seed, args.backend, backend_options):
+            results.append(result)
+            if output:
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+            print(
+                f"[{len(results)}/{args.games}] {json.dumps(result, ensure_ascii=False)}",
+                file=sys.stderr,
+            )
+    finally:
+        if output:
+            output.close()
+
+    summary = summarize(results)
+    summary["elapsed"] = time.perf_counter() - start
+    summary["games_per_second"] = len(results) / summary["elapsed"]
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+게임 체크포인트 파일 입출력
+
+GameManager는 페이즈가 끝날 때마다 전체 상태를 체크포인트로 저장하고,
+중간에 실패한 게임을 마지막으로 끝난 페이즈 다음부터 다시 진행할 수 있습니다.
+(이미 끝난 페이즈의 LLM 호출은 반복하지 않습니다.)
+
+체크포인트는 gzip으로 압축한 JSON이며, 기억의 발언자처럼 객체를 가리키는 값은
+이름으로 저장했다가 복원할 때 새로 만든 객체로 다시 연결합니다.
+"""
+import gzip
+import json
+import os
+import random
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+from mafia.utils.enum import GamePhase, MemoryType
+
+CHECKPOINT_VERSION = 1
+
+
+def encode_memory(memory: Mapping) -> Dict:
+    """기억을 JSON으로 저장할 수 있는 값으로 변환 (페이즈는 이름, 발언자는 이름)"""
+    data = dict(memory)
+    phase = data.get("phase")
+    if isinstance(phase, GamePhase):
+        data["phase"] = phase.name
+    if "speaker" in data:
+        data["speaker"] = getattr(data["speaker"], "name", data["speaker"])
+    return data
+
+
+def decode_memory(data: Dict, speakers: Mapping[str, Any]) -> MemoryType:
+    """encode_memory()의 역변환
+
+    Args:
+        speakers: 이름 -> 발언자 객체 (없는 이름은 문자열 그대로 둠, 예: "요약")
+    """
+    memory = dict(data)
+    if memory.get("phase") is not None:
+        memory["phase"] = GamePhase[memory["phase"]]
+    if "speaker" in memory:
+        memory["speaker"] = speakers.get(memory["speaker"], memory["speaker"])
+    return memory
+
+
+def encode_rng(rng: random.Random) -> list:
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def decode_rng(state: list) -> random.Random:
+    rng = random.Random()
+    version, internal, gauss_next = state
+    rng.setstate((version, tuple(internal), gauss_next))
+    return rng
+
+
+def dumps(state: Dict) -> bytes:
+    """상태를 체크포인트 형식(gzip JSON)의 바이트로 변환"""
+    payload = json.dumps(
+        {"version": CHECKPOINT_VERSION, **state}, ensure_ascii=False, separators=(",", ":")
+    )
+    return gzip.compress(payload.encode("utf-8"))
+
+
+def loads(data: bytes) -> Dict:
+    """dumps()의 역변환"""
+    state = json.loads(gzip.decompress(data).decode("utf-8"))
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"지원하지 않는 체크포인트 버전입니다: {state.get('version')}")
+    return state
+
+
+def write_checkpoint(path, state: Dict):
+    """체크포인트 저장
+
+    임시 파일에 쓴 뒤 교체하므로, 저장 중에 중단되어도 이전 체크포인트가 남습니다.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(dumps(state))
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path) -> Dict:
+    """체크포인트 읽기"""
+    return loads(Path(path).read_bytes())
@@ -1,7 +1,24 @@
+import contextlib
+import io
 import random
-from typing import List, Dict, Literal, Optional
-
-from mafia.ai.memory_manager import MemoryType
+import time
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    as_completed,
+)
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Dict, Literal, Optional, Sequence
+
+from mafia.ai import prompt_builder
+from mafia.ai.backends import LLMBackend, create_backend
+from mafia.ai.cassette import RecordingBackend, ReplayBackend
+from mafia.ai.memory_manager import EventLog, MemoryType
+from mafia.game import checkpoint
+from mafia.players.announcer import Announcer
 from mafia.players.base_player import BasePlayer
 from mafia.players.citizen import Citizen
 from mafia.players.doctor import Doctor
@@ -10,6 +27,97 @@ from mafia.players.mafia import Mafia
 from mafia.utils.config import game_config
 from mafia.utils.enum import ActionType, ContextType, GamePhase, GameStateType, Role, names
 from mafia.utils.logger import GameLogger
+from mafia.utils.terminal import ConversationPrinter
+
+PLAYER_CLASSES = {
+    Role.CITIZEN: Citizen,
+    Role.DOCTOR: Doctor,
+    Role.POLICE: Police,
+    Role.MAFIA: Mafia,
+}
+
+# 페이즈별 시간 제한 설정 키 (game_settings)
+PHASE_TIME_LIMITS = {
+    GamePhase.DAY_CONVERSATION: "day_time_limit",
+    GamePhase.DAY_REASONING: "day_time_limit",
+    GamePhase.DAY_VOTE: "vote_time_limit",
+    GamePhase.NIGHT_ACTION: "night_time_limit",
+}
+
+# 하루의 페이즈 진행 순서
+# 낮 추리(DAY_REASONING)는 응답 스키마가 정해지지 않아 run_day_reasoning_phase가 구현되지 않았으므로
+# 진행 순서에서 제외함. 구현되면 DAY_CONVERSATION과 DAY_VOTE 사이에 다시 추가
+PHASE_ORDER = [
+    GamePhase.DAY_CONVERSATION,
+    GamePhase.DAY_VOTE,
+    GamePhase.NIGHT_ACTION,
+]
+
+
+@dataclass
+class Branch:
+    """게임 분기 설정 (GameManager.fork에 사용)
+
+    Attributes:
+        name: 분기 이름 (결과에 그대로 표시)
+        forced_actions: 플레이어 이름 -> 다음 투표/스킬의 대상 이름
+            (예: {"Charlie": "Bob"} - 의사 Charlie가 이번 밤에 Bob을 치료)
+        seed: 분기 이후의 무작위 선택에 사용할 시드 (없으면 스냅샷의 난수 상태를 그대로 사용)
+    """
+
+    name: str
+    forced_actions: Dict[str, str] = field(default_factory=dict)
+    seed: Optional[int] = None
+
+
+def run_branch(
+    snapshot: bytes,
+    branch: Branch,
+    backend: Optional[str] = None,
+    backend_options: Optional[Dict] = None,
+) -> Dict:
+    """스냅샷에서 분기 하나를 끝까지 진행하고 결과 반환 (작업 프로세스에서 실행)
+
+    llm_calls 등 사용량은 분기 이후에 발생한 양만 셉니다.
+    """
+    game = GameManager(backend=create_backend(backend, **(backend_options or {})))
+    game._restore(checkpoint.loads(snapshot))
+    game.forced_actions.update(branch.forced_actions)
+    if branch.seed is not None:
+        game.rng.seed(branch.seed)
+        for player in game.alive_players + game.dead_players:
+            player.rng.seed(game.rng.getrandbits(64))
+
+    usage_before = game.llm_usage
+    with contextlib.redirect_stdout(io.StringIO()):
+        game_result = game.spin()
+
+    report = game.report(game_result)
+    usage = game.llm_usage
+    for key, report_key in [
+        ("calls", "llm_calls"),
+        ("prompt_tokens", "prompt_tokens"),
+        ("completion_tokens", "completion_tokens"),
+    ]:
+        report[report_key] = usage.get(key, 0) - usage_before.get(key, 0)
+    return {"branch": branch.name, **report}
+
+
+def _run_branches(
+    snapshot: bytes,
+    branches: List[Branch],
+    workers: Optional[int],
+    backend: Optional[str],
+    backend_options: Optional[Dict],
+) -> Iterator[Dict]:
+    """스냅샷에서 분기들을 작업 프로세스에서 진행하고 끝나는 순서대로 결과 반환 (GameManager.fork)"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_branch, snapshot, branch, backend, backend_options)
+            for branch in branches
+        ]
+        for future in as_completed(futures):
+            yield future.result()
 
 
 class GameManager:
@@ -36,19 +144,46 @@ class GameManager:
        - 대화 참여자 관리
        - 대화 순서 조정
     """
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[LLMBackend] = None,
+        seed: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        stream_conversation: Optional[bool] = None,
+    ):
         # 게임 상태 관련 속성들
         self.current_phase: GamePhase = GamePhase.DAY_CONVERSATION
         self.day_count: int = 1
         self.alive_players: List[BasePlayer] = []
         self.dead_players: List[BasePlayer] = []
+        self.death_log: List[Dict] = []  # 사망 기록 (이름, 역할, 원인, 일차)
         self.vote_results: Dict[BasePlayer, BasePlayer] = {}  # voter_name: voted_name
         self.last_killed_player: Optional[BasePlayer] = None
         self.last_healed_player: Optional[BasePlayer] = None
         self.last_investigated_player: Optional[BasePlayer] = None
         self.current_speaker = None
         self.logger = GameLogger()
-        self.announcer = BasePlayer("사회자", -1, None)  # pylint: disable=E0110
+        self.event_log = EventLog()  # 모든 플레이어가 공유하는 공개 사건 기록
+        self.ai_config = game_config.get_config("ai_settings")
+        # 페이즈별 시간 제한 (초) - 마감 시각이 지난 응답은 기다리지 않고 기본 행동 사용
+        self.time_limits: Dict[str, float] = dict(game_config.get_config("game_settings") or {})
+        self.phase_deadline: Optional[float] = None  # 현재 페이즈의 마감 시각 (time.monotonic 기준)
+        self.announcer = Announcer()
+        self.backend = backend  # 플레이어들이 사용할 LLM 백엔드 (없으면 ai_settings.backend)
+        self.seed = seed
+        self.rng = random.Random(seed)  # 게임의 모든 무작위 선택에 사용 (재현 가능)
+        self.checkpoint_path = checkpoint_path  # 페이즈가 끝날 때마다 상태를 저장할 파일
+        self._completed_phase: Optional[GamePhase] = None  # 복원된 상태에서 마지막으로 끝난 페이즈
+        # 플레이어 이름 -> LLM 대신 사용할 다음 행동(투표/스킬)의 대상 이름 (반사실 분기 실험용)
+        self.forced_actions: Dict[str, str] = {}
+        # 마지막 발언에서 투표 대상도 미리 정하여 투표 페이즈의 LLM 호출을 줄임
+        self.fused_vote = bool((game_config.get_config("game_settings") or {}).get("fused_vote"))
+        # 낮 대화의 발언을 받는 대로 터미널에 출력 (기본값: game_settings.stream_conversation)
+        self.stream_conversation = (
+            stream_conversation
+            if stream_conversation is not None
+            else bool((game_config.get_config("game_settings") or {}).get("stream_conversation"))
+        )
 
     def initialize_game(self):
         """게임 초기화 및 역할 분배"""
@@ -59,22 +194,14 @@ class GameManager:
         players: List[BasePlayer] = []
         roles = game_config.get_config("roles")
         roles = list(roles.items())
-        random.shuffle(roles)
+        self.rng.shuffle(roles)
 
         idx = 0
         for role, count in roles:
+            if role.upper() not in Role.__members__:
+                raise ValueError(f"잘못된 역할입니다: {role}")
             for i in range(count):
-                if role == "citizen":
-                    player = Citizen(names[idx], idx, Role.CITIZEN)
-                elif role == "doctor":
-                    player = Doctor(names[idx], idx, Role.DOCTOR)
-                elif role == "police":
-                    player = Police(names[idx], idx, Role.POLICE)
-                elif role == "mafia":
-                    player = Mafia(names[idx], idx, Role.MAFIA)
-                else:
-                    raise ValueError(f"잘못된 역할입니다: {role}")
-                players.append(player)
+                players.append(self._create_player(names[idx], idx, Role[role.upper()]))
                 idx += 1
 
         assert idx == len(players), f"플레이어 수가 일치하지 않습니다. {idx} != {len(players)}"
@@ -85,40 +212,197 @@ class GameManager:
         # 게임 상태 초기화
         self.alive_players = players
         self.dead_players = []
+        self.death_log = []
+
+    def _create_player(
+        self, name: str, player_id: int, role: Role, rng: Optional[random.Random] = None
+    ) -> BasePlayer:
+        """역할에 맞는 플레이어 생성 (공유 이벤트 로그, 백엔드, 게임 로거 연결)"""
+        player = PLAYER_CLASSES[role](
+            name,
+            player_id,
+            role,
+            self.event_log,
+            self.backend,
+            rng if rng is not None else self._player_rng(),
+        )
+        player.ai_agent.game_logger = self.logger
+        return player
+
+    def _player_rng(self) -> random.Random:
+        """플레이어별 난수 생성기
+
+        동시에 행동하는 플레이어들이 하나의 난수 생성기를 공유하면 호출 순서에 따라 결과가
+        달라지므로, 게임 시드에서 파생한 생성기를 플레이어마다 따로 둡니다.
+        """
+        return random.Random(self.rng.getrandbits(64))
+
+    def spin(self, resume: bool = False) -> Dict[str, any]:
+        """게임 메인 루프 실행
 
-    def spin(self):
-        """게임 메인 루프 실행"""
-        while True:
-            # 1번 페이즈 - 낮 대화
-            self._update_phase(GamePhase.DAY_CONVERSATION)
-            self.run_day_conversation_phase()
+        checkpoint_path가 설정되어 있으면 페이즈가 끝날 때마다 상태를 저장합니다.
 
-            # 2번 페이즈 - 낮 추리
-            self._update_phase(GamePhase.DAY_REASONING)
-            self.run_day_reasoning_phase()
+        체크포인트나 스냅샷에서 복원된 게임은 마지막으로 끝난 페이즈 다음부터 진행합니다.
 
-            # 3번 페이즈 - 낮 투표
-            self._update_phase(GamePhase.DAY_VOTE)
-            self.run_day_vote_phase()
+        Args:
+            resume: checkpoint_path의 체크포인트가 있으면 먼저 복원
 
-            # 시민팀 승리 조건 확인
-            game_result = self._is_game_over()
-            if game_result["is_over"]:
-                break
+        Returns:
+            Dict[str, any]: 게임 결과 (is_over, winner)
+        """
+        if resume and self.checkpoint_path and Path(self.checkpoint_path).exists():
+            self.load_checkpoint(self.checkpoint_path)
+            self.logger.info(
+                f"체크포인트에서 재개합니다: {self.day_count}일차 {self.current_phase} 페이즈 이후"
+            )
+
+        phases = PHASE_ORDER
+        game_result = {"is_over": False, "winner": None}
+        if self._completed_phase is not None:
+            # 복원된 상태는 마지막으로 끝난 페이즈 다음부터 진행
+            if self._completed_phase in (GamePhase.DAY_VOTE, GamePhase.NIGHT_ACTION):
+                game_result = self._is_game_over()
+            phases = PHASE_ORDER[PHASE_ORDER.index(self._completed_phase) + 1 :]
+            self._completed_phase = None
 
-            # 4번 페이즈 - 밤 행동
-            self._update_phase(GamePhase.NIGHT_ACTION)
-            self.run_night_phase()
+        while not game_result["is_over"]:
+            game_result = self._run_phases(phases)
+            phases = PHASE_ORDER
 
-            # 마피아팀 승리 조건 확인
-            game_result = self._is_game_over()
-            if game_result["is_over"]:
-                break
+        self.logger.log_game_summary()
 
         print("******************************************")
         print(f"게임 종료! 승리 팀: {game_result['winner']}")
         print("******************************************")
 
+        return game_result
+
+    def _run_phases(self, phases: List[GamePhase]) -> Dict[str, any]:
+        """주어진 페이즈들을 차례로 진행하고, 승리 조건이 만족되면 그 결과를 반환"""
+        runners = {
+            GamePhase.DAY_CONVERSATION: self.run_day_conversation_phase,  # 1번 페이즈 - 낮 대화
+            GamePhase.DAY_REASONING: self.run_day_reasoning_phase,  # 2번 페이즈 - 낮 추리
+            GamePhase.DAY_VOTE: self.run_day_vote_phase,  # 3번 페이즈 - 낮 투표
+            GamePhase.NIGHT_ACTION: self.run_night_phase,  # 4번 페이즈 - 밤 행동
+        }
+        for phase in phases:
+            self._update_phase(phase)
+            self.phase_deadline = self._phase_deadline(phase)
+            runners[phase]()
+            self.logger.log_game_state(self.game_state)
+            if self.checkpoint_path:
+                self.save_checkpoint(self.checkpoint_path)
+
+            # 투표 후에는 시민팀, 밤 행동 후에는 마피아팀 승리 조건 확인
+            if phase in (GamePhase.DAY_VOTE, GamePhase.NIGHT_ACTION):
+                game_result = self._is_game_over()
+                if game_result["is_over"]:
+                    return game_result
+
+        return {"is_over": False, "winner": None}
+
+    def _phase_deadline(self, phase: GamePhase) -> Optional[float]:
+        """game_settings의 시간 제한으로 계산한 페이즈 마감 시각 (제한이 없으면 None)
+
+        cassette를 기록하거나 재생할 때는 시간 제한을 두지 않습니다. 마감 때문에 기본 행동으로
+        대신한 호출도 늦게 도착한 응답이 기록되어, 재생하면 그 응답이 바로 쓰이기 때문입니다.
+        """
+        if isinstance(self.backend, (RecordingBackend, ReplayBackend)):
+            return None
+        limit = self.time_limits.get(PHASE_TIME_LIMITS[phase])
+        return time.monotonic() + limit if limit else None
+
+    def save_checkpoint(self, path: str):
+        """현재 상태를 체크포인트 파일로 저장 (페이즈 경계에서 호출)"""
+        checkpoint.write_checkpoint(path, self._state())
+
+    def load_checkpoint(self, path: str):
+        """체크포인트 파일의 상태로 복원"""
+        self._restore(checkpoint.read_checkpoint(path))
+
+    def snapshot(self) -> bytes:
+        """현재 상태의 불변 스냅샷 (체크포인트와 같은 형식의 바이트)"""
+        return checkpoint.dumps(self._state())
+
+    def _state(self) -> Dict:
+        """체크포인트로 저장할 전체 상태"""
+        players = sorted(self.alive_players + self.dead_players, key=lambda p: p.player_id)
+        name_of = lambda player: player.name if player is not None else None
+        state = {
+            "seed": self.seed,
+            "rng": checkpoint.encode_rng(self.rng),
+            "day_count": self.day_count,
+            "current_phase": self.current_phase.name,
+            "players": [
+                {
+                    "name": player.name,
+                    "player_id": player.player_id,
+                    "role": player.role.name,
+                    "is_alive": player.is_alive,
+                    "is_healed": player.is_healed,
+                    "rng": checkpoint.encode_rng(player.rng),
+                    "memory": player.memory_manager.to_state(checkpoint.encode_memory),
+                    "agent": player.ai_agent.to_state(),
+                    "provisional_vote": player.provisional_vote,
+                }
+                for player in players
+            ],
+            "alive_players": [p.name for p in self.alive_players],
+            "dead_players": [p.name for p in self.dead_players],
+            "death_log": self.death_log,
+            "vote_results": {name_of(voter): voted for voter, voted in self.vote_results.items()},
+            "last_killed_player": name_of(self.last_killed_player),
+            "last_healed_player": name_of(self.last_healed_player),
+            "last_investigated_player": name_of(self.last_investigated_player),
+            "event_log": [checkpoint.encode_memory(memory) for memory in self.event_log.memories],
+            "forced_actions": self.forced_actions,
+        }
+        return state
+
+    def _restore(self, state: Dict):
+        """_state()로 저장한 상태로 복원
+
+        플레이어와 공유 이벤트 로그를 새로 만들고, 기억의 발언자를 새 객체로 다시 연결합니다.
+        LLM 백엔드는 저장하지 않으므로 이 GameManager의 백엔드를 사용합니다.
+        """
+        self.seed = state["seed"]
+        self.rng = checkpoint.decode_rng(state["rng"])
+        self.day_count = state["day_count"]
+        self.current_phase = GamePhase[state["current_phase"]]
+        self._completed_phase = self.current_phase
+
+        self.event_log = EventLog()
+        players = {
+            data["name"]: self._create_player(
+                data["name"],
+                data["player_id"],
+                Role[data["role"]],
+                checkpoint.decode_rng(data["rng"]),
+            )
+            for data in state["players"]
+        }
+        speakers = {**players, self.announcer.name: self.announcer}
+        decode = lambda data: checkpoint.decode_memory(data, speakers)
+
+        for data in state["event_log"]:
+            self.event_log.add_memory(decode(data))
+        for data in state["players"]:
+            player = players[data["name"]]
+            player.is_alive = data["is_alive"]
+            player.is_healed = data["is_healed"]
+            player.memory_manager.load_state(data["memory"], decode)
+            player.ai_agent.load_state(data["agent"])
+            player.provisional_vote = data.get("provisional_vote")
+
+        self.alive_players = [players[name] for name in state["alive_players"]]
+        self.dead_players = [players[name] for name in state["dead_players"]]
+        self.death_log = state["death_log"]
+        self.vote_results = {players[voter]: voted for voter, voted in state["vote_results"].items()}
+        self.last_killed_player = players.get(state["last_killed_player"])
+        self.last_healed_player = players.get(state["last_healed_player"])
+        self.last_investigated_player = players.get(state["last_investigated_player"])
+        self.forced_actions = dict(state.get("forced_actions", {}))
+
     def _is_game_over(self) -> Dict[str, any]:
         """게임 종료 조건 확인"""
         mafia_count = sum(1 for p in self.alive_players if p.role == Role.MAFIA)
@@ -137,6 +421,8 @@ class GameManager:
         if phase == GamePhase.DAY_CONVERSATION:
             self.day_count += 1
             self.vote_results.clear()
+        elif phase == GamePhase.NIGHT_ACTION:
+            # 지난 밤의 결과는 낮 대화 페이즈에서 발표된 뒤에 초기화
             self.last_killed_player = None
             self.last_healed_player = None
             self.last_investigated_player = None
@@ -150,8 +436,12 @@ class GameManager:
         assert player in self.alive_players, f"존재하지 않는 플레이어입니다: {player.name}"
 
         player.is_alive = False
+        player.memory_manager.detach()  # 사망자는 이후의 공개 사건을 듣지 못함
         self.alive_players.remove(player)
         self.dead_players.append(player)
+        self.death_log.append(
+            {"name": player.name, "role": player.role.name, "cause": cause, "day": self.day_count}
+        )
 
         return f"{player.name}이(가) {cause}로 인해 사망했습니다"
 
@@ -174,13 +464,27 @@ class GameManager:
 
         # 2. 플레이어 간 대화
         conversation_round = 2  # 낮동안 각자는 두번씩 발언
-        for player in self.alive_players * conversation_round:
+        speakers = self.alive_players * conversation_round
+        for turn, player in enumerate(speakers):
             self.current_speaker = player
-            context = self.get_context(player)
-            conversation = player.generate_conversation(context)
+            # 남은 낮 시간을 남은 발언 수로 나누어 발언마다 마감 시각 지정
+            deadline = None
+            if self.phase_deadline is not None:
+                now = time.monotonic()
+                deadline = now + max(0.0, self.phase_deadline - now) / (len(speakers) - turn)
+            context = self.get_context(player, deadline=deadline)
+            if self.fused_vote and turn >= len(speakers) - len(self.alive_players):
+                context["final_turn"] = True
+            if self.stream_conversation:
+                printer = ConversationPrinter(player.name)
+                conversation = player.generate_conversation(context, on_text=printer.write)
+                printer.close(conversation["content"])
+            else:
+                conversation = player.generate_conversation(context)
 
-            for listener in self.alive_players:
-                listener.receive_public_message(conversation)
+            # 모든 생존자가 듣는 발언이므로 공유 이벤트 로그에 한 번만 기록
+            # (스트리밍할 때도 응답 전체의 검증이 끝난 발언만 공개)
+            self.event_log.add_memory(conversation)
 
     def run_day_reasoning_phase(self):
         """낮 추리 페이즈 진행
@@ -192,10 +496,9 @@ class GameManager:
 
     def run_day_vote_phase(self):
         """투표 진행 및 결과 처리"""
-        # 각 플레이어의 투표 수집
-        for voter in self.alive_players:
-            context = self.get_context(voter)
-            vote_action = voter.take_action(context)
+        # 각 플레이어의 투표 수집 (비밀 투표이므로 동시에 요청)
+        vote_actions = self._collect_actions(self.alive_players)
+        for voter, vote_action in vote_actions.items():
             assert vote_action.get("type") == "vote", f"투표 행동이 아닙니다: {vote_action}"
 
             if vote_action["target"] in [p.name for p in self.alive_players]:
@@ -224,6 +527,40 @@ class GameManager:
         else:
             self.announce("최다 득표자가 동률로 인해 처형되지 않았습니다.")
 
+    def _collect_actions(self, players: List[BasePlayer]) -> Dict[BasePlayer, ActionType]:
+        """여러 플레이어의 행동을 동시에 수집
+
+        각 플레이어의 결정은 서로의 결과를 볼 수 없으므로 LLM 요청을 한 번에 보내고,
+        결과는 입력된 플레이어 순서대로 반환합니다.
+        동시 요청 수는 ai_settings.max_concurrency로 제한합니다.
+        forced_actions에 대상이 지정된 플레이어는 LLM 대신 그 대상으로 행동합니다.
+
+        Args:
+            players: 행동할 플레이어 목록
+
+        Returns:
+            Dict[BasePlayer, ActionType]: 플레이어별 행동
+        """
+        if not players:
+            return {}
+
+        # 모든 요청이 같은 게임 상태를 보도록 컨텍스트를 먼저 구성
+        contexts = [(player, self.get_context(player)) for player in players]
+        max_workers = min(len(contexts), self.ai_config.get("max_concurrency", 8))
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = []
+            for player, context in contexts:
+                if player.name in self.forced_actions:
+                    # 지정된 행동은 LLM을 호출하지 않음
+                    target_name = self.forced_actions.pop(player.name)
+                    future = Future()
+                    future.set_result(player.force_action(context, target_name))
+                else:
+                    future = executor.submit(player.take_action, context)
+                futures.append((player, future))
+            return {player: future.result() for player, future in futures}
+
     def run_night_phase(self):
         """밤 페이즈 진행
         1. 마피아 행동
@@ -233,24 +570,77 @@ class GameManager:
 
         # 역할별 행동 순서 정의
         role_order = [Role.MAFIA, Role.DOCTOR, Role.POLICE]
-
-        # 역할 순서대로 행동 실행
-        actions: Dict[BasePlayer, ActionType] = {}
-        for role in role_order:
-            for player in self.alive_players:
-                if player.role == role:
-                    context = self.get_context(player)
-                    action = player.take_action(context)
-                    assert action.get("type") == "skill", f"스킬 행동이 아닙니다: {action}"
-                    actions[player] = action
-
-        # 행동 결과 처리
-        for player, action in actions.items():
-            private_memory = self._resolve_night_action(player, action)
-            player.memory_manager.add_memory(private_memory)
-            self.logger.info(
-                f"사회자 -> {player.name}({player.role}): {private_memory['content']}"
+        actors = [
+            player for role in role_order for player in self.alive_players if player.role == role
+        ]
+
+        # 마감 시각까지 끝나지 않은 기억 압축은 기다리지 않으므로 executor를 직접 종료
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self.alive_players)))
+        try:
+            # 밤 행동을 기다리는 동안 기억 압축을 백그라운드에서 수행
+            compactions = self._start_memory_compaction(executor)
+
+            # 밤 행동은 서로의 결과를 볼 수 없으므로 동시에 결정
+            actions: Dict[BasePlayer, ActionType] = self._collect_actions(actors)
+            for action in actions.values():
+                assert action.get("type") == "skill", f"스킬 행동이 아닙니다: {action}"
+
+            # 행동 결과 처리 (역할 순서대로)
+            for player, action in actions.items():
+                private_memory = self._resolve_night_action(player, action)
+                player.memory_manager.add_memory(private_memory)
+                self.logger.info(
+                    f"사회자 -> {player.name}({player.role}): {private_memory['content']}"
+                )
+
+            self._finish_memory_compaction(compactions)
+        finally:
+            executor.shutdown(wait=False)
+
+    def _start_memory_compaction(self, executor: ThreadPoolExecutor) -> Dict[BasePlayer, Future]:
+        """생존자들의 기억 압축 시작
+
+        ai_settings.memory_compaction 설정에 따라, 최근 기억이 max_entries개를 넘은 플레이어의
+        오래된 기억을 요약으로 대체합니다.
+        """
+        compaction_config = self.ai_config.get("memory_compaction", {})
+        if not compaction_config.get("enabled", True):
+            return {}
+
+        return {
+            player: executor.submit(
+                player.memory_manager.compact,
+                summarizer=player.ai_agent.summarize_memories,
+                current_day=self.day_count,
+                max_entries=compaction_config.get("max_entries", 60),
+                keep_entries=compaction_config.get("keep_entries", 20),
+                days=player.ai_agent.memory_days,
             )
+            for player in self.alive_players
+        }
+
+    def _finish_memory_compaction(self, compactions: Dict[BasePlayer, Future]):
+        """기억 압축 완료 대기
+
+        압축된 플레이어는 다음 호출에서 요약을 포함한 메시지 기록을 새로 구성합니다.
+        요약에 실패하거나 밤 마감 시각까지 끝나지 않아도 원문 기억이 그대로 남으므로
+        게임은 계속 진행합니다. (늦게 끝난 요약은 다음에 메시지 기록을 다시 구성할 때 반영됩니다.)
+        """
+        for player, future in compactions.items():
+            timeout = None
+            if self.phase_deadline is not None:
+                timeout = max(0.0, self.phase_deadline - time.monotonic())
+            try:
+                compacted = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                self.logger.warning(f"{player.name}의 기억 압축이 시간 안에 끝나지 않았습니다.")
+                continue
+            except Exception as e:  # pylint: disable=broad-except
+                self.logger.warning(f"{player.name}의 기억 압축 실패: {e}")
+                continue
+            if compacted:
+                player.ai_agent.reset_history()
+                self.logger.info(f"{player.name}의 기억을 요약했습니다.")
 
     def _resolve_night_action(self, actor: BasePlayer, action: ActionType) -> MemoryType:
         """밤 행동 결과 처리
@@ -273,15 +663,15 @@ class GameManager:
 
         content = ""
 
-        if actor.role == "마피아":
+        if actor.role == Role.MAFIA:
             self.last_killed_player = target
             content = f"{target.name}을(를) 공격했습니다."
-        elif actor.role == "의사":
+        elif actor.role == Role.DOCTOR:
             self.last_healed_player = target
             content = f"{target.name}을(를) 치료했습니다."
-        elif actor.role == "경찰":
+        elif actor.role == Role.POLICE:
             self.last_investigated_player = target
-            if target.role == "마피아":
+            if target.role == Role.MAFIA:
                 content = f"{target.name}은(는) 마피아입니다."
             else:
                 content = f"{target.name}은(는) 마피아가 아닙니다."
@@ -314,6 +704,62 @@ class GameManager:
         )
         return game_state
 
+    def fork(
+        self,
+        branches: Sequence[Branch],
+        workers: Optional[int] = None,
+        backend: Optional[str] = None,
+        backend_options: Optional[Dict] = None,
+        checkpoint_path: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """저장된 상태에서 여러 분기를 각각의 작업 프로세스에서 끝까지 진행
+
+        분기들은 호출 시점에 만든 하나의 스냅샷(체크포인트 형식의 바이트)에서 시작하며,
+        작업 프로세스마다 이 스냅샷을 복원하여 자신의 게임 상태를 만듭니다. 분기 시점까지의
+        기록과 메시지 기록을 그대로 이어받으므로 분기 이후의 LLM 호출 비용만 듭니다.
+        스냅샷은 반환된 반복자를 읽기 전에 만들어지므로, 이후에 게임을 계속 진행해도 분기에는
+        영향이 없고 잘못된 checkpoint_path는 바로 오류가 납니다.
+
+        Args:
+            branches: 분기 설정 목록
+            workers: 작업 프로세스 수
+            backend: 작업 프로세스에서 만들 LLM 백엔드 이름 (없으면 ai_settings.backend)
+            backend_options: 백엔드 생성 인자
+            checkpoint_path: 분기할 체크포인트 파일 (없으면 현재 상태에서 분기)
+
+        Returns:
+            Iterator[Dict]: 끝나는 순서대로 분기별 결과 (branch, winner, days, deaths, 분기 이후 사용량)
+        """
+        snapshot = (
+            Path(checkpoint_path).read_bytes() if checkpoint_path is not None else self.snapshot()
+        )
+        return _run_branches(snapshot, list(branches), workers, backend, backend_options)
+
+    def report(self, game_result: Dict[str, any]) -> Dict:
+        """게임 결과 요약 (승리 팀, 진행 일수, 사망자, LLM 사용량)"""
+        usage = self.llm_usage
+        return {
+            "winner": game_result["winner"],
+            "days": self.day_count,
+            "deaths": self.death_log,
+            "llm_calls": usage.get("calls", 0),
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+        }
+
+    @property
+    def llm_usage(self) -> Dict[str, int]:
+        """전체 플레이어의 LLM 호출 수와 토큰 사용량 합계"""
+        usage: Dict[str, int] = {}
+        for player in self.alive_players + self.dead_players:
+            for key, value in player.ai_agent.usage.items():
+                usage[key] = usage.get(key, 0) + value
+        return usage
+
+    def transcript(self) -> List[str]:
+        """공개 사건 기록 (재현 여부 비교용)"""
+        return [prompt_builder.memory_line(memory) for memory in self.event_log.memories]
+
     def announce(self, content: str):
         """사회자 발언 공지"""
         info = MemoryType(
@@ -322,17 +768,21 @@ class GameManager:
             speaker=self.announcer,
             content=content,
         )
-        for listener in self.alive_players:
-            listener.receive_public_message(info)
-        # for listener in self.dead_players:
-        #     listener.receive_public_message(info)
+        # 생존자 전원이 듣는 공지이므로 공유 이벤트 로그에 한 번만 기록
+        # (사망자는 detach 이후의 사건을 보지 않음)
+        self.event_log.add_memory(info)
         self.logger.info(f"[공지] 사회자: {content}")
 
-    def get_context(self, player: BasePlayer) -> ContextType:
-        """현재 게임 상태 및 정보를 반환"""
+    def get_context(self, player: BasePlayer, deadline: Optional[float] = None) -> ContextType:
+        """현재 게임 상태 및 정보를 반환
+
+        Args:
+            deadline: 응답 마감 시각 (없으면 현재 페이즈의 마감 시각)
+        """
         return ContextType(
             day_count=self.day_count,
             phase=self.current_phase,
             alive_players=self.alive_players,
             memories=player.memory_manager.get_recent_memories(self.day_count),
+            deadline=deadline if deadline is not None else self.phase_deadline,
         )
@@ -1,12 +1,45 @@
+import argparse
+
 from dotenv import load_dotenv
+from mafia.ai import llm_client
+from mafia.ai.backends import create_backend
+from mafia.ai.cassette import Cassette, RecordingBackend, ReplayBackend
 from mafia.game.game_manager import GameManager
 
-def main():
+def main(argv=None):
     load_dotenv()
 
-    game = GameManager()
+    parser = argparse.ArgumentParser(description="LLM 마피아 게임")
+    parser.add_argument("--seed", type=int, default=None, help="게임 시드 (역할 배정 등 무작위 선택 고정)")
+    parser.add_argument("--backend", default=None, help="LLM 백엔드 (openai, local, stub)")
+    parser.add_argument("--checkpoint", metavar="PATH", help="페이즈마다 게임 상태를 저장할 파일")
+    parser.add_argument("--resume", action="store_true", help="--checkpoint 파일에서 이어서 진행")
+    parser.add_argument("--stream", action="store_true", help="낮 대화의 발언을 받는 대로 출력")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", metavar="PATH", help="LLM 응답을 기록할 cassette 파일")
+    group.add_argument("--replay", metavar="PATH", help="LLM 응답을 재생할 cassette 파일")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        backend = ReplayBackend(Cassette.load(args.replay))
+    else:
+        backend = create_backend(args.backend)
+        if args.record:
+            backend = RecordingBackend(backend)
+
+    game = GameManager(
+        backend=backend,
+        seed=args.seed,
+        checkpoint_path=args.checkpoint,
+        stream_conversation=args.stream or None,
+    )
     game.initialize_game()
-    game.spin()
+    try:
+        game.spin(resume=args.resume)
+    finally:
+        if args.record:
+            backend.cassette.save(args.record)
+        llm_client.close_clients()
 
 if __name__ == "__main__":
     main()
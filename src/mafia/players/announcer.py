@@ -0,0 +1,14 @@
+class Announcer:
+    """사회자
+
+    게임 진행 상황을 알리는 발언자입니다.
+    플레이어가 아니므로 역할, 메모리, AI 에이전트를 갖지 않습니다.
+    """
+
+    def __init__(self, name: str = "사회자"):
+        self.name = name
+        self.player_id = -1
+        self.role = None
+
+    def __repr__(self) -> str:
+        return f"Announcer(name={self.name})"
@@ -2,9 +2,10 @@ from abc import ABC, abstractmethod
 from typing import Dict, Optional, List, TypeVar, Callable
 import random
 
+from mafia.ai.backends import LLMBackend
 from mafia.ai.llm_agent import LLMAgent
-from mafia.ai.memory_manager import MemoryManager
-from mafia.utils.enum import ActionType, MemoryType, Role, ContextType
+from mafia.ai.memory_manager import EventLog, MemoryManager
+from mafia.utils.enum import ActionType, GamePhase, MemoryType, Role, ContextType
 from mafia.utils.logger import game_logger
 
 T = TypeVar('T')
@@ -23,17 +24,33 @@ class BasePlayer(ABC):
     3. 행동 검증 및 실행
     4. 대화 및 투표 참여
     """
-    def __init__(self, name: str, player_id: int, role: Role):
+    def __init__(
+        self,
+        name: str,
+        player_id: int,
+        role: Role,
+        event_log: Optional[EventLog] = None,
+        backend: Optional[LLMBackend] = None,
+        rng: Optional[random.Random] = None,
+    ):
         self.name = name
         self.player_id = player_id
         self.role = role
         self.is_alive = True
         self.is_healed = False
-        self.memory_manager = MemoryManager(name=name)
+        # 공개 사건은 게임 전체의 이벤트 로그를 공유하고, 개인 기억만 따로 보관
+        self.memory_manager = MemoryManager(name=name, event_log=event_log)
         self.ai_agent = LLMAgent(
-            player_id=player_id, memory_manager=self.memory_manager, role=role, name=name
+            player_id=player_id,
+            memory_manager=self.memory_manager,
+            role=role,
+            name=name,
+            backend=backend,
         )
         self.logger = game_logger
+        self.rng = rng if rng is not None else random.Random()
+        # 마지막 발언에서 미리 정한 투표 (day, target, reason, alive_players)
+        self.provisional_vote: Optional[Dict] = None
 
     def _validate_and_get_target(
         self,
@@ -71,7 +88,109 @@ class BasePlayer(ABC):
             f"[{self.role}] 유효하지 않은 대상 선택: {target_name}. "
             f"가능한 대상: {[name_selector(c) for c in candidates]}"
         )
-        return random.choice(candidates) if candidates else None
+        return self.rng.choice(candidates) if candidates else None
+
+    def generate_conversation(
+        self, context: ContextType, on_text: Optional[Callable[[str], None]] = None
+    ) -> MemoryType:
+        """낮 대화 페이즈의 발언 생성
+
+        Args:
+            on_text: 발언을 받는 대로 전달받을 콜백 (스트리밍 출력용)
+        Returns:
+            MemoryType: 모든 생존자에게 공개될 발언
+        """
+        assert context.get("phase") == GamePhase.DAY_CONVERSATION, "낮 대화 페이즈가 아닙니다"
+
+        response = self.ai_agent.generate_response(context, on_text=on_text)
+        if getattr(response, "vote_target", None):
+            # 투표 페이즈에서 상황이 바뀌지 않았으면 다시 묻지 않고 사용
+            self.provisional_vote = {
+                "day": context.get("day_count"),
+                "target": response.vote_target,
+                "reason": response.vote_reason,
+                "cursor": self.memory_manager.cursor(),  # 이 위치 이후의 기억으로 변화 확인
+            }
+        return MemoryType(
+            day=context.get("day_count"),
+            phase=context.get("phase"),
+            speaker=self,
+            content=response.conversation,
+        )
+
+    def vote(self, context: ContextType) -> ActionType:
+        """낮 투표 페이즈의 투표 대상 결정"""
+        assert context.get("phase") == GamePhase.DAY_VOTE, "낮 투표 페이즈가 아닙니다"
+
+        provisional, self.provisional_vote = self.provisional_vote, None
+        if provisional is not None and self._provisional_vote_valid(provisional, context):
+            action = ActionType(
+                type="vote", target=provisional["target"], content=provisional["reason"]
+            )
+            self.ai_agent.record_action(context, action)
+            self.logger.info(f"[{self.name}] 마지막 발언에서 정한 투표 사용: {action['target']}")
+            return action
+
+        target, reason = self._choose_target(context, exclude_self=True)
+        return ActionType(type="vote", target=target.name, content=reason)
+
+    def _provisional_vote_valid(self, provisional: Dict, context: ContextType) -> bool:
+        """미리 정한 투표를 그대로 써도 되는지 확인
+
+        같은 날이고, 대상이 자신이 아닌 생존자이고, 발언 이후 다른 플레이어나 사회자가
+        자신이나 대상의 이름을 언급하지 않았어야 합니다.
+        (낮 대화와 투표 사이에는 사망자가 생기지 않으므로 상황 변화는 이후의 발언으로만 판단)
+        """
+        alive = [p.name for p in context.get("alive_players", [])]
+        if (
+            provisional["day"] != context.get("day_count")
+            or provisional["target"] not in alive
+            or provisional["target"] == self.name
+        ):
+            return False
+
+        for memory in self.memory_manager.get_memories_since(provisional["cursor"]):
+            speaker = memory.get("speaker")
+            if "type" in memory or getattr(speaker, "name", speaker) == self.name:
+                continue  # 자신의 행동과 발언
+            content = memory.get("content") or ""
+            if self.name in content or provisional["target"] in content:
+                return False
+        return True
+
+    def _choose_target(self, context: ContextType, exclude_self: bool) -> tuple:
+        """AI 에이전트가 고른 대상을 검증하여 (대상 플레이어, 이유) 반환"""
+        response = self.ai_agent.generate_response(context)
+        target = self._validate_and_get_target(
+            target_name=response.target,
+            candidates=context.get("alive_players", []),
+            name_selector=lambda p: p.name,
+            exclude_self=exclude_self,
+        )
+        return target, response.reason
+
+    def force_action(self, context: ContextType, target_name: str) -> ActionType:
+        """LLM을 호출하지 않고 지정된 대상으로 행동 (반사실 분기 실험용)
+
+        투표 페이즈에는 투표, 밤 행동 페이즈에는 스킬을 사용하며,
+        행동은 LLM이 결정한 것과 같은 형식으로 본인의 기억에 기록됩니다.
+        """
+        phase = context.get("phase")
+        target = self._validate_and_get_target(
+            target_name=target_name,
+            candidates=context.get("alive_players", []),
+            name_selector=lambda p: p.name,
+            exclude_self=not (phase == GamePhase.NIGHT_ACTION and self.role == Role.DOCTOR),
+        )
+        if phase == GamePhase.DAY_VOTE:
+            action = ActionType(type="vote", target=target.name, content="지정된 행동")
+        elif phase == GamePhase.NIGHT_ACTION and self.role != Role.CITIZEN:
+            action = ActionType(type="skill", target=target, content="지정된 행동")
+        else:
+            raise ValueError(f"{self.role}은(는) {phase} 페이즈에 행동할 수 없습니다")
+
+        self.ai_agent.record_action(context, action)
+        return action
 
     @abstractmethod
     def take_action(self, context: ContextType) -> ActionType:
@@ -132,5 +251,9 @@ class BasePlayer(ABC):
     #     return random.choice(candidates).name
 
     def receive_public_message(self, info: MemoryType):
-        """공개 정보 수신 및 저장"""
+        """공개 정보 수신 및 저장
+
+        게임 진행 중의 공개 사건은 GameManager가 공유 이벤트 로그에 한 번만 기록하므로,
+        이 메서드는 이 플레이어에게만 전달되는 메시지에 사용합니다.
+        """
         self.memory_manager.add_memory(info)
@@ -1,22 +1,15 @@
 from typing import Dict
 
 from mafia.players.base_player import BasePlayer
-from mafia.utils.enum import ActionType, ContextType
+from mafia.utils.enum import ActionType, ContextType, GamePhase
 
 
 class Citizen(BasePlayer):
 
     def take_action(self, context: ContextType) -> ActionType:
         """시민의 전체 의사결정 프로세스"""
-        # 시민은 특별한 행동이 없으므로, 대화만 수행
-        context = self.memory_manager.get_recent_memories(game_state.day)
-        message = self.ai_agent.generate_response(context)
+        # 시민은 특별한 행동이 없으므로, 투표만 수행
+        if context.get("phase") == GamePhase.DAY_VOTE:
+            return self.vote(context)
 
-        result = {
-            "success": True,
-            "message": message
-        }
-
-        self.memory.add_memory({"action": "discuss", "message": message, "turn": game_state.day})
-
-        return result
+        raise ValueError(f"시민이 수행할 수 없는 페이즈입니다: {context.get('phase')}")
@@ -1,5 +1,5 @@
 import json
-from typing import Dict
+from typing import Dict, Optional
 from pathlib import Path
 
 class GameConfig:
@@ -31,8 +31,106 @@ class GameConfig:
                 "day_time_limit": 300,  # 낮 시간 제한 (초)
                 "night_time_limit": 60,  # 밤 시간 제한 (초)
                 "vote_time_limit": 60,  # 투표 시간 제한 (초)
+                "stream_conversation": False,  # 낮 대화의 발언을 받는 대로 터미널에 출력
+                "fused_vote": False,  # 마지막 발언에서 투표 대상도 정하고, 상황이 그대로면 투표에 사용
+            },
+            "log_settings": {
+                "telemetry_path": None,  # LLM 호출 이벤트를 기록할 JSON lines 파일
+                "log_dir": None,  # 게임 로그와 에이전트별 대화 기록을 저장할 디렉터리
+                "queue_size": 10000,  # 기록을 기다리는 로그 레코드의 최대 수
+                "overflow": "drop",  # 큐가 가득 찼을 때: drop(버림) 또는 block(대기)
+                "batch_size": 256,  # 한 번에 모아 쓸 최대 레코드 수
+            },
+            "ai_settings": {
+                "backend": "openai",  # LLM 백엔드: openai, local, stub
+                "backends": {
+                    "local": {"base_url": "http://localhost:8000/v1"},
+                    "stub": {"latency": 0.0, "jitter": 0.0, "seed": 0},
+                },
+                "model": "gpt-4o-mini",
+                "temperature": 0.7,
+                "max_tokens": 150,
+                # 페이즈별 model / temperature / max_tokens (없는 값은 위의 기본값 사용)
+                # 예: "night_action": {"model": "gpt-4.1-nano", "temperature": 0.2, "max_tokens": 100}
+                "phase_settings": {},
+                # 역할별 설정 (phases 안의 페이즈별 값이 가장 우선)
+                # 예: "mafia": {"model": "gpt-4o", "phases": {"night_action": {"temperature": 0.3}}}
+                "role_settings": {},
+                "max_concurrency": 8,  # 동시에 보낼 수 있는 최대 LLM 요청 수
+                "connection_pool": {
+                    "max_connections": 20,
+                    "max_keepalive_connections": 10,
+                    "keepalive_expiry": 30.0,  # 유휴 연결 유지 시간 (초)
+                },
+                # 페이즈별 입력/출력 토큰 예산 (없는 페이즈는 default 사용)
+                "token_budgets": {
+                    "default": {"input": 6000, "output": 150},
+                    "day_conversation": {"input": 6000, "output": 300},
+                    "summary": {"input": 8000, "output": 600},
+                },
+                "memory_compaction": {
+                    "enabled": True,
+                    "max_entries": 60,  # 최근 기억이 이 개수를 넘으면 요약
+                    "keep_entries": 20,  # 요약하지 않고 남길 최근 기억 수
+                },
+                # 네트워크 백엔드의 요청 속도 제한과 재시도
+                "rate_limit": {
+                    "enabled": True,
+                    "requests_per_minute": 500,
+                    "tokens_per_minute": 200000,
+                    "max_retries": 5,
+                    "backoff_base": 0.5,  # 첫 재시도의 최대 대기 시간 (초, 재시도마다 두 배)
+                    "backoff_max": 30.0,  # 재시도 대기 시간의 상한 (초)
+                },
+                # LLM 응답 캐시 (메모리 LRU + SQLite)
+                "response_cache": {
+                    "enabled": False,  # phases에 없는 페이즈의 사용 여부
+                    "memory_entries": 1024,
+                    "path": "cache/llm_responses.sqlite",
+                    "disk_entries": 100000,
+                    "ttl": 604800,  # 초 (0이면 만료 없음)
+                    "phases": {
+                        "day_conversation": False,
+                        "day_vote": False,
+                        "night_action": False,
+                        "summary": False,
+                    },
+                },
+                # 느린 요청에 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+                "hedging": {
+                    "enabled": False,
+                    "percentile": 95,  # 최근 지연 시간의 이 백분위를 넘으면 중복 요청
+                    "min_samples": 20,
+                    "initial_delay": 10.0,  # 기록이 부족할 때의 중복 요청 대기 시간 (초)
+                    "max_hedges": 1,
+                    "window": 200,
+                },
+                # 최근 TTFB와 출력 토큰당 시간으로 목표 지연 시간에 맞춰 출력 상한/모델 선택
+                "latency_slo": {
+                    "enabled": False,
+                    "target": 8.0,  # 호출 하나의 목표 지연 시간 (초, 턴 마감이 더 이르면 그 시각)
+                    "phases": ["day_conversation"],
+                    "min_tokens": 60,  # 출력 상한의 최소값 (스키마별 최근 응답이 더 길면 그 길이)
+                    "size_window": 50,  # 스키마별로 기억할 최근 응답 길이 수
+                    "model_tiers": [],  # 느린 모델에서 빠른 모델 순서
+                    "alpha": 0.2,
+                    "min_samples": 3,
+                    "use_deadline": True,
+                },
+                # 오류나 느린 호출이 많으면 보조 백엔드/모델로 전환
+                "circuit_breaker": {
+                    "enabled": False,
+                    # 둘 다 없으면 같은 곳으로 다시 보낼 뿐이므로 차단기를 사용하지 않음
+                    "secondary_backend": None,  # 없으면 주 백엔드에 secondary_model 사용
+                    "secondary_model": None,
+                    "window": 20,
+                    "min_calls": 10,
+                    "error_rate": 0.5,
+                    "slow_call_seconds": 20.0,
+                    "slow_call_rate": 0.5,
+                    "cooldown": 30.0,  # 회로를 연 뒤 주 백엔드를 다시 시험하기까지의 시간 (초)
+                },
             },
-            "ai_settings": {"model": "gpt-4o-mini", "temperature": 0.7, "max_tokens": 150},
         }
         self.load_config()
 
@@ -51,4 +149,28 @@ class GameConfig:
         """설정값 조회"""
         return self.config.get(key)
 
+    def model_settings(self, phase_key: str, role: Optional[str] = None) -> Dict:
+        """페이즈와 역할에 맞는 LLM 호출 설정 조회
+
+        ai_settings의 model, temperature에 phase_settings[phase_key],
+        role_settings[role], role_settings[role].phases[phase_key] 순서로 덮어씁니다.
+        max_tokens는 페이즈나 역할에 지정된 경우에만 포함합니다. (없으면 토큰 예산을 따름)
+
+        Args:
+            phase_key: 페이즈 키 (예: "day_vote", "summary")
+            role: 역할 이름 (예: "mafia", 대소문자 구분 없음)
+        """
+        ai_config = self.config.get("ai_settings") or {}
+        settings = {"model": ai_config.get("model"), "temperature": ai_config.get("temperature")}
+        role_config = (ai_config.get("role_settings") or {}).get((role or "").lower(), {})
+        for override in [
+            (ai_config.get("phase_settings") or {}).get(phase_key, {}),
+            {k: v for k, v in role_config.items() if k != "phases"},
+            role_config.get("phases", {}).get(phase_key, {}),
+        ]:
+            settings.update(
+                {k: v for k, v in override.items() if k in ("model", "temperature", "max_tokens")}
+            )
+        return settings
+
 game_config = GameConfig()
@@ -1,4 +1,4 @@
-from typing import Literal, TypedDict, List, Dict, TYPE_CHECKING
+from typing import Literal, TypedDict, List, Dict, Optional, TYPE_CHECKING
 from enum import Enum
 
 if TYPE_CHECKING:
@@ -41,6 +41,15 @@ class MemoryType(TypedDict):
         return f"MemoryType(day={self.day}, phase={self.phase}, speaker={self.speaker}, content={self.content})"
 
 
+class ActionMemoryType(TypedDict):
+    """자신의 행동 기록 타입"""
+    day: int                                    # 게임 턴
+    phase: GamePhase                            # 게임 단계
+    type: Literal["discuss", "vote", "skill"]   # 행동 종류
+    target: Optional[str]                       # 대상 플레이어 이름
+    content: str                                # 대화 내용 or 선택의 이유
+
+
 class GameStateType(TypedDict):
     """게임 상태 타입"""
     day: int
@@ -55,3 +64,5 @@ class ContextType(TypedDict):
     phase: GamePhase
     alive_players: List["BasePlayer"]
     memories: List[MemoryType]
+    deadline: Optional[float]  # 응답 마감 시각 (time.monotonic 기준, 없으면 제한 없음)
+    final_turn: bool  # 오늘의 마지막 발언 (투표 대상도 미리 정함)
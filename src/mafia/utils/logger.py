@@ -1,9 +1,232 @@
 """
-TODO: 로깅은 각 LLM마다 입출력에 대해 저장, 전체 로그도 저장
+게임 로깅
+
+- 게임 진행 상황은 "mafia_game" 로거로 기록합니다.
+- LLM 호출마다 구조화된 이벤트(플레이어, 역할, 페이즈, 토큰 수, 지연 시간 등)를 남기고,
+  log_settings.telemetry_path가 설정되어 있으면 전용 LogWriter가 JSON lines로 저장합니다.
+- 게임이 끝나면 페이즈별 지연 시간과 토큰 수의 p50/p95 요약을 남깁니다.
+- log_settings.log_dir이 설정되어 있으면 "mafia"와 "mafia_game" 로거의 기록을 큐에 넣고
+  백그라운드 스레드(LogWriter)가 모아서 파일로 씁니다. 게임 진행 스레드는 프롬프트 전체를
+  문자열로 만들거나 파일에 쓰는 비용을 부담하지 않습니다.
 """
 
+import atexit
+import json
 import logging
-from typing import Any
+import logging.handlers
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence
+
+from mafia.utils.config import game_config
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """q 분위수 (최근접 순위 방식, 값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[int(rank) - 1]
+
+
+LOGGER_NAMES = ["mafia", "mafia_game"]
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """레코드를 포맷하지 않은 채로 LogWriter의 큐에 넣는 핸들러
+
+    기본 QueueHandler는 호출한 스레드에서 메시지를 포맷하므로, 포맷은 기록 스레드로 미룹니다.
+    (인자로 넘긴 객체는 기록될 때까지 바뀌지 않아야 합니다.)
+    """
+
+    def __init__(self, writer: "LogWriter"):
+        super().__init__(writer.queue)
+        self.writer = writer
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        self.writer.enqueue(record)
+
+
+class LogWriter:
+    """큐에 쌓인 로그 레코드를 백그라운드 스레드에서 모아 파일에 쓰는 기록기
+
+    모든 레코드는 game.log에 쓰고, agent 속성이 있는 레코드(LLMAgent의 로그)는
+    에이전트별 대화 기록 파일(<agent>.log)에도 씁니다.
+    sink 속성이 있는 레코드(텔레메트리 이벤트)는 포맷 없이 메시지만 그 파일에 씁니다.
+
+    Args:
+        log_dir: 로그 파일을 저장할 디렉터리 (sink가 있는 레코드만 받으면 None)
+        queue_size: 큐에 쌓아 둘 수 있는 최대 레코드 수
+        overflow: 큐가 가득 찼을 때의 정책
+            - "drop": 새 레코드를 버리고 dropped 수를 늘림 (게임 진행을 막지 않음)
+            - "block": 큐에 자리가 날 때까지 기다림 (기록을 잃지 않음)
+        batch_size: 한 번에 모아 쓸 최대 레코드 수
+        flush_interval: 새 레코드를 기다리는 최대 시간 (초)
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        log_dir: Optional[str],
+        queue_size: int = 10000,
+        overflow: str = "drop",
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+    ):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"지원하지 않는 로그 큐 정책입니다: {overflow}")
+
+        self.log_dir = Path(log_dir) if log_dir else None
+        if self.log_dir is not None:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0  # 큐가 가득 차서 버린 레코드 수
+        self.formatter = logging.Formatter(LOG_FORMAT)
+        self.handler = _DeferredQueueHandler(self)
+        self._files: Dict[Path, IO[str]] = {}
+        self._thread = threading.Thread(target=self._run, name="mafia-log-writer", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """지금까지 큐에 넣은 레코드가 모두 파일에 쓰일 때까지 대기"""
+        if self._thread.is_alive():
+            self.queue.join()
+
+    def stop(self):
+        """남은 레코드를 모두 쓰고 기록 스레드 종료"""
+        if not self._thread.is_alive():
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(record is self._STOP for record in batch)
+            self._write([record for record in batch if record is not self._STOP])
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                self._close()
+                return
+
+    def _write(self, records: List[logging.LogRecord]):
+        """레코드를 파일별로 모아 한 번에 기록"""
+        lines: Dict[Path, List[str]] = {}
+        for record in records:
+            sink = getattr(record, "sink", None)
+            try:
+                line = record.getMessage() if sink else self.formatter.format(record)
+            except Exception:  # pylint: disable=broad-except
+                line = f"로그 포맷 실패: {record.msg!r}"
+            if sink:
+                lines.setdefault(Path(sink), []).append(line)
+                continue
+            lines.setdefault(self._path("game"), []).append(line)
+            agent = getattr(record, "agent", None)
+            if agent:
+                lines.setdefault(self._path(agent), []).append(line)
+
+        for path, file_lines in lines.items():
+            f = self._files.get(path)
+            if f is None:
+                f = self._files[path] = open(path, "a", encoding="utf-8")
+            f.write("\n".join(file_lines) + "\n")
+            f.flush()
+
+    def _path(self, name: str) -> Path:
+        return self.log_dir / (re.sub(r"[^\w.-]", "_", name) + ".log")
+
+    def _close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+_writer: Optional[LogWriter] = None
+_telemetry_writer: Optional[LogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def start_log_writer(log_dir: str, **kwargs) -> LogWriter:
+    """"mafia", "mafia_game" 로거를 LogWriter에 연결 (이미 연결되어 있으면 그대로 반환)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = LogWriter(log_dir, **kwargs)
+            for name in LOGGER_NAMES:
+                logger = logging.getLogger(name)
+                logger.setLevel(logging.INFO)
+                logger.addHandler(_writer.handler)
+            atexit.register(stop_log_writer)
+        return _writer
+
+
+def stop_log_writer():
+    """남은 로그를 모두 쓰고 로거에서 LogWriter 분리"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            return
+        for name in LOGGER_NAMES:
+            logging.getLogger(name).removeHandler(_writer.handler)
+        _writer.stop()
+        _writer = None
+
+
+def start_telemetry_writer() -> LogWriter:
+    """텔레메트리 이벤트를 기록할 전용 LogWriter (이미 시작되어 있으면 그대로 반환)
+
+    이벤트를 잃지 않도록 큐가 가득 차면 자리가 날 때까지 기다립니다.
+    """
+    global _telemetry_writer
+    with _writer_lock:
+        if _telemetry_writer is None:
+            _telemetry_writer = LogWriter(None, overflow="block")
+            atexit.register(_telemetry_writer.stop)
+        return _telemetry_writer
+
+
+class _TelemetryLine:
+    """기록 스레드에서 JSON으로 직렬화되는 텔레메트리 이벤트"""
+
+    __slots__ = ("event",)
+
+    def __init__(self, event: Dict):
+        self.event = event
+
+    def __str__(self):
+        return json.dumps(self.event, ensure_ascii=False)
 
 
 class GameLogger:
@@ -18,23 +241,166 @@ class GameLogger:
     2. 플레이어 행동 로깅
     3. AI 응답 로깅
     4. 에러 및 경고 로깅
+
+    Args:
+        telemetry_path: LLM 호출 이벤트를 기록할 JSON lines 파일
+            (없으면 log_settings.telemetry_path, 그것도 없으면 메모리에만 보관)
     """
 
-    def __init__(self):
+    # 페이즈 요약에 포함할 수치 필드
+    SUMMARY_FIELDS = ["latency", "ttfb", "prompt_tokens", "completion_tokens", "cached_tokens"]
+
+    def __init__(self, telemetry_path: Optional[str] = None):
         self.logger = logging.getLogger("mafia_game")
+        self.telemetry_path = telemetry_path
+        self.llm_calls: List[Dict] = []  # 이번 게임의 LLM 호출 이벤트
+        self._lock = threading.Lock()
+        self._telemetry: Optional[LogWriter] = None
         self._setup_logger()
 
     def _setup_logger(self):
         """로거 설정"""
-        pass
+        log_config = game_config.get_config("log_settings") or {}
+        if self.telemetry_path is None:
+            self.telemetry_path = log_config.get("telemetry_path")
+        if self.telemetry_path:
+            Path(self.telemetry_path).parent.mkdir(parents=True, exist_ok=True)
+            self._telemetry = start_telemetry_writer()
+        if log_config.get("log_dir"):
+            start_log_writer(
+                log_config["log_dir"],
+                queue_size=log_config.get("queue_size", 10000),
+                overflow=log_config.get("overflow", "drop"),
+                batch_size=log_config.get("batch_size", 256),
+            )
 
     def log_game_state(self, state: Any):
         """게임 상태 로깅"""
-        pass
+        self._write(
+            {
+                "event": "game_state",
+                "day": state.get("day_count"),
+                "phase": getattr(state.get("phase"), "name", state.get("phase")),
+                "alive_players": [p.name for p in state.get("alive_players", [])],
+                "dead_players": [p.name for p in state.get("dead_players", [])],
+            }
+        )
 
     def log_player_action(self, player: str, action: str):
         """플레이어 행동 로깅"""
-        pass
+        self.logger.info(f"[{player}] {action}")
+
+    def log_llm_call(
+        self,
+        *,
+        player: str,
+        role: str,
+        phase: str,
+        day: Optional[int],
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        ttfb: Optional[float] = None,
+        latency: float = 0.0,
+        retries: int = 0,
+        cache_hit: bool = False,
+        **extra,
+    ):
+        """LLM 호출 한 건의 이벤트 기록
+
+        Args:
+            ttfb: 첫 응답 바이트까지 걸린 시간 (초)
+            latency: 호출 전체에 걸린 시간 (초)
+            retries: 재시도 횟수
+            cache_hit: 응답 캐시 적중 여부
+            extra: 추가로 기록할 필드
+        """
+        event = {
+            "event": "llm_call",
+            "player": player,
+            "role": role,
+            "phase": phase,
+            "day": day,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "ttfb": ttfb,
+            "latency": latency,
+            "retries": retries,
+            "cache_hit": cache_hit,
+            **extra,
+        }
+        with self._lock:
+            self.llm_calls.append(event)
+        self._write(event)
+
+    def llm_call_summary(self) -> Dict[str, Dict[str, Any]]:
+        """페이즈별 LLM 호출 요약 (호출 수, 캐시 적중 수, 재시도 수, 수치 필드의 p50/p95)"""
+        with self._lock:
+            calls = list(self.llm_calls)
+
+        phases: Dict[str, List[Dict]] = {}
+        for event in calls:
+            phases.setdefault(event["phase"], []).append(event)
+
+        summary = {}
+        for phase, events in phases.items():
+            summary[phase] = {
+                "calls": len(events),
+                "cache_hits": sum(1 for e in events if e["cache_hit"]),
+                "retries": sum(e["retries"] for e in events),
+            }
+            for name in self.SUMMARY_FIELDS:
+                values = [e[name] for e in events if e.get(name) is not None]
+                summary[phase][f"{name}_p50"] = percentile(values, 50)
+                summary[phase][f"{name}_p95"] = percentile(values, 95)
+        return summary
+
+    def log_game_summary(self) -> Dict[str, Dict[str, Any]]:
+        """게임 종료 시 페이즈별 LLM 호출 요약을 기록하고, 남은 이벤트를 모두 파일에 씀"""
+        summary = self.llm_call_summary()
+        for phase, stats in summary.items():
+            self.logger.info(
+                f"[LLM 요약] {phase}: {stats['calls']}회 (캐시 {stats['cache_hits']}회), "
+                f"지연 p50 {_seconds(stats['latency_p50'])} / p95 {_seconds(stats['latency_p95'])}, "
+                f"입력 토큰 p50 {stats['prompt_tokens_p50']} / p95 {stats['prompt_tokens_p95']}, "
+                f"출력 토큰 p50 {stats['completion_tokens_p50']} / p95 {stats['completion_tokens_p95']}"
+            )
+        self._write({"event": "summary", "phases": summary})
+        self.flush()
+        return summary
+
+    def info(self, message: str):
+        """일반 정보 로깅"""
+        self.logger.info(message)
+
+    def warning(self, message: str):
+        """경고 로깅"""
+        self.logger.warning(message)
+
+    def error(self, message: str):
+        """에러 로깅"""
+        self.logger.error(message)
+
+    def flush(self):
+        """기록 대기 중인 텔레메트리 이벤트가 모두 파일에 쓰일 때까지 대기"""
+        if self._telemetry is not None:
+            self._telemetry.flush()
+
+    def _write(self, event: Dict):
+        """이벤트를 텔레메트리 기록기의 큐에 넣음 (직렬화와 파일 쓰기는 기록 스레드에서)"""
+        if self._telemetry is None:
+            return
+        line = _TelemetryLine({"time": time.time(), **event})
+        record = logging.LogRecord("mafia.telemetry", logging.INFO, __file__, 0, line, None, None)
+        record.sink = self.telemetry_path
+        self._telemetry.enqueue(record)
+
+
+def _seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}s"
 
 
 game_logger = GameLogger()
@@ -0,0 +1,53 @@
+"""
+터미널 출력
+
+낮 대화를 스트리밍할 때 발언을 받는 대로 터미널에 출력합니다.
+"""
+import sys
+import threading
+from typing import Optional, TextIO
+
+
+class ConversationPrinter:
+    """발언 한 건을 받는 대로 "이름: 내용" 형태로 출력
+
+    마감 시각을 넘겨 기본 발언으로 대체된 뒤에도 늦게 도착하는 조각이 있으므로,
+    close() 이후의 조각은 무시합니다.
+
+    Args:
+        speaker: 발언자 이름
+        out: 출력 스트림 (기본값: sys.stdout)
+    """
+
+    def __init__(self, speaker: str, out: Optional[TextIO] = None):
+        self.speaker = speaker
+        self.out = out if out is not None else sys.stdout
+        self.text = ""  # 지금까지 출력한 발언
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def write(self, delta: str):
+        """받은 발언 조각 출력"""
+        with self._lock:
+            if self._closed:
+                return
+            if not self.text:
+                self.out.write(f"{self.speaker}: ")
+            self.text += delta
+            self.out.write(delta)
+            self.out.flush()
+
+    def close(self, content: str):
+        """발언 출력 마무리
+
+        Args:
+            content: 최종 발언 (출력한 내용과 다르면, 예를 들어 기본 발언으로 대체되었으면 다시 출력)
+        """
+        with self._lock:
+            self._closed = True
+            if not self.text:
+                self.out.write(f"{self.speaker}: {content}")
+            elif content != self.text:
+                self.out.write(f" ...(중단)\n{self.speaker}: {content}")
+            self.out.write("\n")
+            self.out.flush()
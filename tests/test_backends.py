@@ -0,0 +1,142 @@
+import json
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+from mafia.ai import prompt_builder
+from mafia.ai.backends import OpenAIBackend, StubBackend, create_backend, response_format_param
+from openai import OpenAI
+from openai.lib._parsing import type_to_response_format_param
+from mafia.utils.enum import GamePhase, Role
+
+
+def _vote_messages(name="Alice"):
+    context = {
+        "day_count": 1,
+        "phase": GamePhase.DAY_VOTE,
+        "alive_players": [SimpleNamespace(name=n) for n in ["Alice", "Bob", "Charlie"]],
+    }
+    user_prompt, Schema = prompt_builder.day_vote_prompt(context, {})
+    messages = [
+        {"role": "developer", "content": prompt_builder.developer_prompt(name, Role.CITIZEN)},
+        {"role": "user", "content": user_prompt},
+    ]
+    return messages, Schema
+
+
+def test_stub_backend_is_deterministic():
+    """같은 시드와 메시지에는 같은 응답"""
+    messages, Schema = _vote_messages()
+    first = StubBackend(seed=1).parse(model="gpt-4o-mini", messages=messages, response_format=Schema)
+    second = StubBackend(seed=1).parse(model="gpt-4o-mini", messages=messages, response_format=Schema)
+    assert first.parsed == second.parsed
+    assert first.content == second.content
+
+
+def test_stub_backend_picks_valid_target():
+    """대상은 자신을 제외한 생존자 중에서 선택"""
+    messages, Schema = _vote_messages("Alice")
+    for seed in range(20):
+        response = StubBackend(seed=seed).parse(
+            model="gpt-4o-mini", messages=messages, response_format=Schema
+        )
+        assert isinstance(response.parsed, Schema)
+        assert response.parsed.target in ["Bob", "Charlie"]
+        assert response.usage.prompt_tokens > 0
+
+
+def test_create_backend():
+    """이름으로 백엔드 생성"""
+    backend = create_backend("stub", latency=0.01)
+    assert isinstance(backend, StubBackend)
+    assert backend.latency == 0.01
+
+    with pytest.raises(ValueError):
+        create_backend("unknown")
+
+
+def _openai_backend(handler):
+    backend = OpenAIBackend(api_key="test")
+    backend.client = OpenAI(
+        api_key="test",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    return backend
+
+
+def _completion(content, finish_reason="stop"):
+    body = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+    # 본문을 스트림으로 넘겨야 응답을 다 읽은 뒤에 elapsed가 기록됨
+    return httpx.Response(
+        200,
+        content=iter([json.dumps(body).encode()]),
+        headers={"content-type": "application/json"},
+    )
+
+
+def test_openai_backend_sends_precomputed_schema():
+    """응답 스키마는 한 번만 변환해서 매 호출에 같은 요청 인자로 보내고, 응답은 그 스키마로 검증"""
+    messages, Schema = _vote_messages()
+    content = Schema(target="Bob", reason="수상함").model_dump_json()
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.content)["response_format"])
+        return _completion(content)
+
+    backend = _openai_backend(handler)
+    response_format_param.cache_clear()
+    for _ in range(3):
+        response = backend.parse(model="gpt-4o-mini", messages=messages, response_format=Schema)
+        assert response.parsed == Schema(target="Bob", reason="수상함")
+
+    assert response_format_param.cache_info().misses == 1
+    assert sent == [type_to_response_format_param(Schema)] * 3
+
+    truncated = _openai_backend(lambda request: _completion("{", "length"))
+    with pytest.raises(openai.LengthFinishReasonError):
+        truncated.parse(model="gpt-4o-mini", messages=messages, response_format=Schema)
+
+
+def test_openai_backend_streams_with_precomputed_schema():
+    messages, Schema = _vote_messages()
+    content = Schema(target="Bob", reason="수상함").model_dump_json()
+    chunks = [content[:10], content[10:]]
+
+    def handler(request):
+        assert json.loads(request.content)["response_format"] == response_format_param(Schema)
+        events = [
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}],
+            }
+            for chunk in chunks
+        ]
+        events[-1]["choices"][0]["finish_reason"] = "stop"
+        body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    deltas = []
+    response = _openai_backend(handler).stream(
+        model="gpt-4o-mini", messages=messages, response_format=Schema, on_delta=deltas.append
+    )
+    assert deltas == chunks
+    assert response.parsed == Schema(target="Bob", reason="수상함")
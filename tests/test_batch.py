@@ -0,0 +1,24 @@
+from mafia.batch import run_batch, run_game, summarize
+
+
+def test_run_game_with_stub_backend():
+    """게임 하나의 결과 형식"""
+    result = run_game(seed=3, backend="stub")
+    assert "error" not in result
+    assert result["winner"] in ("시민", "마피아")
+    assert result["days"] >= 1
+    assert result["llm_calls"] > 0
+    assert all({"name", "role", "cause", "day"} <= death.keys() for death in result["deaths"])
+
+
+def test_run_batch_summary():
+    """여러 게임을 프로세스 풀에서 실행하고 요약"""
+    results = list(run_batch(games=6, workers=2, seed=10, backend="stub"))
+    assert sorted(r["seed"] for r in results) == list(range(10, 16))
+
+    summary = summarize(results)
+    assert summary["games"] == 6
+    assert summary["errors"] == 0
+    assert sum(summary["wins"].values()) == 6
+    assert abs(sum(summary["win_rate"].values()) - 1) < 1e-9
+    assert summary["llm_calls"] == sum(r["llm_calls"] for r in results)
@@ -0,0 +1,55 @@
+import pytest
+from mafia.ai.backends import StubBackend
+from mafia.ai.cassette import Cassette, CassetteMiss, RecordingBackend, ReplayBackend
+from mafia.game.game_manager import GameManager
+
+
+def _play(backend, seed):
+    game = GameManager(backend=backend, seed=seed)
+    game.initialize_game()
+    result = game.spin()
+    return game, result
+
+
+def test_same_seed_reproduces_game():
+    """같은 시드와 같은 백엔드 응답이면 같은 진행"""
+    first, _ = _play(StubBackend(seed=7), seed=7)
+    second, _ = _play(StubBackend(seed=7), seed=7)
+    assert first.transcript() == second.transcript()
+
+
+def test_replay_reproduces_recorded_game(tmp_path):
+    """기록한 게임을 네트워크 호출 없이 같은 진행으로 재생"""
+    recorder = RecordingBackend(StubBackend(seed=3))
+    recorded, recorded_result = _play(recorder, seed=11)
+    assert len(recorder.cassette) == recorded.llm_usage["calls"]
+
+    path = tmp_path / "game.jsonl.gz"
+    recorder.cassette.save(path)
+
+    replayed, replayed_result = _play(ReplayBackend(Cassette.load(path)), seed=11)
+    assert replayed.transcript() == recorded.transcript()
+    assert replayed_result == recorded_result
+
+
+def test_replay_ignores_time_limits(tmp_path):
+    """시간 제한이 있어도 기록한 응답과 재생한 응답이 같은 진행"""
+    limits = {"day_time_limit": 0.001, "vote_time_limit": 0.001, "night_time_limit": 0.001}
+    recorder = RecordingBackend(StubBackend(latency=0.005, seed=3))
+    recorded = GameManager(backend=recorder, seed=5)
+    recorded.time_limits = dict(limits)
+    recorded.initialize_game()
+    recorded_result = recorded.spin()
+
+    replayed = GameManager(backend=ReplayBackend(recorder.cassette), seed=5)
+    replayed.time_limits = dict(limits)
+    replayed.initialize_game()
+
+    assert replayed.spin() == recorded_result
+    assert replayed.transcript() == recorded.transcript()
+
+
+def test_replay_miss_raises():
+    """기록에 없는 요청은 오류"""
+    with pytest.raises(CassetteMiss):
+        _play(ReplayBackend(Cassette()), seed=0)
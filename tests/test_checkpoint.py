@@ -0,0 +1,75 @@
+import pytest
+from mafia.ai import prompt_builder
+from mafia.ai.backends import StubBackend
+from mafia.game.game_manager import GameManager
+from mafia.utils.enum import GamePhase
+
+
+class FailingBackend(StubBackend):
+    """fail_at번째 호출에서 실패하는 백엔드"""
+
+    def __init__(self, fail_at: int):
+        super().__init__()
+        self.fail_at = fail_at
+        self.requests = 0
+
+    def parse(self, **kwargs):
+        # 투표와 밤 행동은 동시에 요청되므로 호출 번호는 잠금 안에서 정함
+        with self._lock:
+            self.requests += 1
+            fail = self.requests == self.fail_at
+        if fail:
+            raise ValueError("LLM이 응답을 거부했습니다")
+        return super().parse(**kwargs)
+
+
+def test_resume_continues_crashed_game(tmp_path):
+    """중간에 실패한 게임을 마지막 페이즈 경계부터 이어서 진행"""
+    expected = GameManager(backend=StubBackend(), seed=5)
+    expected.initialize_game()
+    expected_result = expected.spin()
+    total_calls = expected.llm_usage["calls"]
+
+    path = tmp_path / "game.ckpt.gz"
+    crashed = GameManager(
+        backend=FailingBackend(fail_at=total_calls - 2), seed=5, checkpoint_path=path
+    )
+    crashed.initialize_game()
+    with pytest.raises(ValueError):
+        crashed.spin()
+    assert path.exists()
+
+    backend = StubBackend()
+    resumed = GameManager(backend=backend, seed=5, checkpoint_path=path)
+    result = resumed.spin(resume=True)
+
+    assert result == expected_result
+    assert resumed.transcript() == expected.transcript()
+    assert resumed.llm_usage == expected.llm_usage
+    assert backend.calls < total_calls / 2  # 끝난 페이즈의 호출은 반복하지 않음
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """체크포인트를 다시 읽으면 같은 상태"""
+    game = GameManager(backend=StubBackend(), seed=1)
+    game.initialize_game()
+    game._run_phases([GamePhase.DAY_CONVERSATION, GamePhase.DAY_VOTE])
+    path = tmp_path / "game.ckpt.gz"
+    game.save_checkpoint(path)
+
+    restored = GameManager(backend=StubBackend())
+    restored.load_checkpoint(path)
+
+    assert restored.transcript() == game.transcript()
+    assert [p.name for p in restored.alive_players] == [p.name for p in game.alive_players]
+    assert restored.current_phase == GamePhase.DAY_VOTE
+    assert restored.rng.random() == game.rng.random()
+    for before, after in zip(game.alive_players, restored.alive_players):
+        assert after.role == before.role
+        assert _lines(after) == _lines(before)
+        assert after.ai_agent.messages == before.ai_agent.messages
+
+
+
+def _lines(player):
+    return [prompt_builder.memory_line(m) for m in player.memory_manager.get_all_memories()]
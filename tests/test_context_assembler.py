@@ -0,0 +1,43 @@
+from mafia.ai import prompt_builder
+from mafia.ai.context_assembler import ContextAssembler, count_tokens
+from mafia.utils.enum import GamePhase
+
+
+def _memory(speaker, content, day=1):
+    return {"day": day, "phase": GamePhase.DAY_CONVERSATION, "speaker": speaker, "content": content}
+
+
+def test_fit_memories_within_budget_keeps_all():
+    """예산 안이면 모든 기억 유지"""
+    assembler = ContextAssembler(model="gpt-4o-mini")
+    memories = [_memory("Bob", "안녕하세요"), _memory("사회자", "첫날 낮이 밝았습니다.")]
+    fitted, tokens = assembler.fit_memories(memories, 1000, prompt_builder.memory_line)
+    assert fitted == memories
+    assert tokens <= 1000
+
+
+def test_fit_memories_drops_low_priority_oldest_first():
+    """우선순위가 낮은 기억부터, 오래된 기억부터 제외"""
+    assembler = ContextAssembler(model="gpt-4o-mini")
+    memories = [
+        _memory("사회자", "Alice이(가) 마피아로 인해 사망했습니다"),
+        _memory("Bob", "저는 Charlie가 의심스럽습니다"),
+        _memory("Charlie", "저는 시민입니다"),
+        _memory("David", "Bob의 말에 동의합니다"),
+    ]
+    costs = [count_tokens(prompt_builder.memory_line(m)) + 1 for m in memories]
+    budget = costs[0] + costs[3] + 1
+
+    fitted, tokens = assembler.fit_memories(memories, budget, prompt_builder.memory_line)
+    assert [m["speaker"] for m in fitted] == ["사회자", "David"]
+    assert tokens <= budget
+
+
+def test_fit_memories_shortens_long_memory():
+    """너무 긴 기억은 내용을 잘라 줄임"""
+    assembler = ContextAssembler(model="gpt-4o-mini", max_memory_tokens=30)
+    memory = _memory("Bob", "마피아는 " * 100)
+    (fitted,), _ = assembler.fit_memories([memory], 1000, prompt_builder.memory_line)
+    assert fitted["content"].endswith("…")
+    assert count_tokens(prompt_builder.memory_line(fitted)) <= 30
+    assert memory["content"] == "마피아는 " * 100
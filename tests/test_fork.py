@@ -0,0 +1,65 @@
+import pytest
+from mafia.ai.backends import StubBackend
+from mafia.game import checkpoint
+from mafia.game.game_manager import Branch, GameManager, run_branch
+from mafia.utils.enum import GamePhase, Role
+
+
+def _game_until_night(seed=2):
+    game = GameManager(backend=StubBackend(), seed=seed)
+    game.initialize_game()
+    game._run_phases([GamePhase.DAY_CONVERSATION, GamePhase.DAY_VOTE])
+    return game
+
+
+def test_fork_runs_branches_from_shared_snapshot():
+    """분기는 같은 스냅샷에서 시작하고 분기 이후의 호출만 사용"""
+    game = _game_until_night()
+    prefix_calls = game.llm_usage["calls"]
+    snapshot = game.snapshot()
+
+    expected = run_branch(snapshot, Branch("base"), backend="stub")
+    branches = [Branch("base"), Branch("other", seed=1)]
+    results = {r["branch"]: r for r in game.fork(branches, workers=2, backend="stub")}
+
+    assert results["base"] == expected
+    assert 0 < results["base"]["llm_calls"]
+    assert results["other"]["llm_calls"] > 0
+    # 원래 게임은 분기의 영향을 받지 않음
+    assert game.llm_usage["calls"] == prefix_calls
+    assert checkpoint.loads(snapshot) == checkpoint.loads(game.snapshot())
+
+
+def test_fork_snapshots_at_call_time(tmp_path):
+    """분기는 fork()를 호출한 시점의 상태에서 시작하고, 잘못된 체크포인트는 바로 오류"""
+    game = _game_until_night()
+    expected = run_branch(game.snapshot(), Branch("base"), backend="stub")
+
+    results = game.fork([Branch("base")], workers=1, backend="stub")
+    game._run_phases([GamePhase.NIGHT_ACTION])  # 결과를 읽기 전에 게임을 계속 진행
+
+    assert list(results) == [expected]
+    with pytest.raises(FileNotFoundError):
+        game.fork([Branch("base")], checkpoint_path=tmp_path / "missing.ckpt.gz")
+
+
+def test_forced_action_replaces_llm_call():
+    """지정된 행동은 LLM을 호출하지 않고 그대로 적용"""
+    game = _game_until_night()
+    mafia = next(p for p in game.alive_players if p.role == Role.MAFIA)
+    victim = next(p for p in game.alive_players if p.role != Role.MAFIA)
+    doctor = next((p for p in game.alive_players if p.role == Role.DOCTOR), None)
+
+    game.forced_actions = {mafia.name: victim.name}
+    if doctor is not None:
+        game.forced_actions[doctor.name] = victim.name
+    actors = [p for p in game.alive_players if p.role != Role.CITIZEN]
+    calls = game.llm_usage["calls"]
+    game._run_phases([GamePhase.NIGHT_ACTION])
+
+    assert game.forced_actions == {}
+    assert game.last_killed_player is victim
+    if doctor is not None:
+        assert game.last_healed_player is victim
+    assert mafia.memory_manager.get_all_memories()[-2]["target"] == victim.name
+    assert game.llm_usage["calls"] == calls + len(actors) - len([mafia, doctor] if doctor else [mafia])
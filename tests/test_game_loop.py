@@ -0,0 +1,178 @@
+import pytest
+from mafia.ai.backends import StubBackend
+from mafia.ai.memory_manager import MemoryType
+from mafia.game.game_manager import GameManager
+from mafia.utils.enum import ActionType, GamePhase, Role
+
+
+class QuietBackend(StubBackend):
+    """발언에서 다른 플레이어의 이름을 언급하지 않는 스텁 백엔드"""
+
+    def parse(self, **kwargs):
+        response = super().parse(**kwargs)
+        if "conversation" in type(response.parsed).model_fields:
+            response.parsed.conversation = "아직 잘 모르겠습니다."
+            response.content = response.parsed.model_dump_json()
+        return response
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_game_runs_offline_with_stub_backend(seed):
+    """스텁 백엔드로 네트워크 없이 게임 전체 진행"""
+    backend = StubBackend(seed=seed)
+    game = GameManager(backend=backend)
+    game.initialize_game()
+    game.spin()
+
+    result = game._is_game_over()
+    assert result["is_over"]
+    assert backend.calls > 0
+    mafia_alive = any(p.role == Role.MAFIA for p in game.alive_players)
+    assert result["winner"] == ("마피아" if mafia_alive else "시민")
+
+
+
+@pytest.mark.parametrize("healed", [False, True])
+def test_mafia_target_dies_at_daybreak_unless_healed(healed, monkeypatch):
+    """밤에 마피아가 지목한 플레이어는 의사가 보호하지 않으면 다음 날 아침에 사망"""
+    game = GameManager(backend=StubBackend(seed=0))
+    game.initialize_game()
+    by_role = {player.role: player for player in game.alive_players}
+    victim = by_role[Role.CITIZEN]
+    targets = {
+        Role.MAFIA: victim,
+        Role.DOCTOR: victim if healed else by_role[Role.DOCTOR],
+        Role.POLICE: by_role[Role.MAFIA],
+    }
+    for player in game.alive_players:
+        monkeypatch.setattr(
+            player,
+            "take_action",
+            lambda context, role=player.role: ActionType(
+                type="skill", target=targets[role], content="테스트"
+            ),
+        )
+
+    game._update_phase(GamePhase.NIGHT_ACTION)
+    game.run_night_phase()
+    game._update_phase(GamePhase.DAY_CONVERSATION)
+    game.run_day_conversation_phase()
+
+    assert victim.is_alive == healed
+    assert (victim in game.dead_players) != healed
+
+
+def test_fused_vote_skips_vote_calls():
+    """마지막 발언에서 정한 투표를 쓰면 투표 페이즈에 LLM을 호출하지 않음"""
+    backend = QuietBackend(seed=0)
+    game = GameManager(backend=backend)
+    game.fused_vote = True
+    game.initialize_game()
+    game.run_day_conversation_phase()
+    calls = backend.calls
+    assert calls == 2 * len(game.alive_players)
+    assert all(p.provisional_vote for p in game.alive_players)
+
+    game._update_phase(GamePhase.DAY_VOTE)
+    game.run_day_vote_phase()
+
+    assert backend.calls == calls
+    for player in game.alive_players + game.dead_players:
+        assert player.provisional_vote is None
+        vote = [m for m in player.memory_manager.get_all_memories() if "type" in m][-1]
+        assert (vote["type"], vote["phase"]) == ("vote", GamePhase.DAY_VOTE)
+
+
+def test_fused_vote_is_ignored_after_later_mention():
+    """발언 이후 누군가 자신이나 투표 대상을 언급하면 투표를 다시 요청"""
+    backend = QuietBackend(seed=0)
+    game = GameManager(backend=backend)
+    game.fused_vote = True
+    game.initialize_game()
+    game.run_day_conversation_phase()
+    calls = backend.calls
+
+    speaker, named = game.alive_players[0], game.alive_players[1]
+    game.event_log.add_memory(
+        MemoryType(
+            day=game.day_count,
+            phase=GamePhase.DAY_CONVERSATION,
+            speaker=speaker,
+            content=f"{named.name}의 말은 앞뒤가 맞지 않습니다.",
+        )
+    )
+    reasked = [
+        p
+        for p in game.alive_players
+        if p is not speaker and named.name in (p.name, p.provisional_vote["target"])
+    ]
+    game._update_phase(GamePhase.DAY_VOTE)
+    game.run_day_vote_phase()
+
+    assert reasked
+    assert backend.calls == calls + len(reasked)
+
+
+class PeakBackend(StubBackend):
+    """동시에 처리 중인 호출 수의 최댓값을 기록하는 스텁 백엔드"""
+
+    def __init__(self, **kwargs):
+        super().__init__(latency=0.1, **kwargs)
+        self.in_flight = 0
+        self.peak = 0
+
+    def parse(self, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return super().parse(**kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _run_phase(phase, max_concurrency, monkeypatch):
+    backend = PeakBackend(seed=0)
+    game = GameManager(backend=backend, seed=0)
+    game.initialize_game()
+    monkeypatch.setitem(game.ai_config, "max_concurrency", max_concurrency)
+    game._update_phase(phase)
+    return game, backend
+
+
+def test_votes_are_collected_concurrently(monkeypatch):
+    """투표는 max_concurrency개씩 동시에 요청하고, 결과는 차례로 요청했을 때와 같음"""
+    sequential, _ = _run_phase(GamePhase.DAY_VOTE, 1, monkeypatch)
+    sequential.run_day_vote_phase()
+
+    game, backend = _run_phase(GamePhase.DAY_VOTE, 3, monkeypatch)
+    voters = list(game.alive_players)
+    game.run_day_vote_phase()
+
+    assert backend.calls == len(voters) > 3
+    assert backend.peak == 3
+    assert {p.name: t for p, t in game.vote_results.items()} == {
+        p.name: t for p, t in sequential.vote_results.items()
+    }
+    assert [p.name for p in game.dead_players] == [p.name for p in sequential.dead_players]
+
+
+def test_night_actions_are_decided_concurrently(monkeypatch):
+    """밤 행동은 한 번에 요청하고, 결과는 역할 순서대로 처리"""
+    sequential, _ = _run_phase(GamePhase.NIGHT_ACTION, 1, monkeypatch)
+    sequential.run_night_phase()
+
+    game, backend = _run_phase(GamePhase.NIGHT_ACTION, 8, monkeypatch)
+    actors = [p for p in game.alive_players if p.role != Role.CITIZEN]
+    game.run_night_phase()
+
+    assert backend.calls == backend.peak == len(actors)
+    for attr in ("last_killed_player", "last_healed_player"):
+        assert getattr(getattr(game, attr), "name", None) == getattr(
+            getattr(sequential, attr), "name", None
+        )
+    for player, before in zip(game.alive_players, sequential.alive_players):
+        assert [m["content"] for m in player.memory_manager.get_all_memories()] == [
+            m["content"] for m in before.memory_manager.get_all_memories()
+        ]
@@ -0,0 +1,149 @@
+import time
+from types import SimpleNamespace
+
+import openai
+from mafia.ai.backends import BackendResponse, LLMBackend
+from mafia.ai.latency_controller import LatencyController
+from mafia.ai.llm_agent import LLMAgent
+from mafia.ai.memory_manager import EventLog, MemoryManager
+from mafia.utils.enum import GamePhase, Role
+from mafia.utils.logger import GameLogger
+
+
+def _controller(**kwargs):
+    return LatencyController(target=5.0, min_tokens=50, alpha=1.0, min_samples=1, **kwargs)
+
+
+def test_caps_output_to_meet_target():
+    controller = _controller()
+    assert controller.decide("big", 300).reason == "no_data"
+
+    # TTFB 1초, 출력 토큰당 0.02초 -> 5초 안에는 200토큰
+    controller.observe("big", ttfb=1.0, latency=3.0, completion_tokens=100)
+    decision = controller.decide("big", 300)
+    assert (decision.model, decision.max_tokens, decision.reason) == ("big", 200, "capped")
+    assert controller.decide("big", 150).reason == "within_target"
+
+
+def test_falls_back_to_faster_tier_and_respects_deadline():
+    controller = _controller(model_tiers=["big", "small"])
+    controller.observe("big", ttfb=4.0, latency=14.0, completion_tokens=100)
+    controller.observe("small", ttfb=0.5, latency=1.5, completion_tokens=100)
+
+    decision = controller.decide("big", 300)
+    assert (decision.model, decision.max_tokens) == ("small", 300)
+
+    # 턴 마감까지 2초 남으면 목표도 2초
+    decision = controller.decide("big", 300, deadline=time.monotonic() + 2.0)
+    assert decision.model == "small"
+    assert 140 <= decision.max_tokens <= 150
+    assert decision.target <= 2.0
+
+
+def test_floor_follows_schema_output_size():
+    """스키마의 최근 응답이 최소 출력보다 길면 그 길이 아래로는 줄이지 않음"""
+    controller = _controller(model_tiers=["big", "small"])
+    controller.observe("big", ttfb=1.0, latency=3.0, completion_tokens=100)
+    controller.observe("small", ttfb=1.0, latency=2.0, completion_tokens=100)
+    assert controller.decide("big", 300, schema="Vote").max_tokens == 200
+
+    controller.observe("big", ttfb=1.0, latency=5.0, completion_tokens=200, schema="Vote")
+    decision = controller.decide("big", 300, schema="Vote")
+    assert decision.floor == 200
+    assert (decision.model, decision.max_tokens) == ("big", 200)
+
+    # 어느 모델도 최근 응답 길이만큼 출력할 시간이 없으면 그 길이로 요청
+    controller.observe("big", ttfb=1.0, latency=6.0, completion_tokens=250, schema="Vote")
+    controller.observe("small", ttfb=1.0, latency=4.0, completion_tokens=100)
+    decision = controller.decide("big", 300, schema="Vote")
+    assert (decision.max_tokens, decision.reason) == (250, "over_target")
+
+
+class TimedBackend(LLMBackend):
+    def __init__(self):
+        self.calls = []
+
+    def parse(self, *, model, messages, response_format, temperature=None, max_tokens=None):
+        self.calls.append((model, max_tokens))
+        parsed = response_format(conversation="저는 시민입니다.")
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=100, prompt_tokens_details=None)
+        return BackendResponse(
+            parsed=parsed, content=parsed.model_dump_json(), usage=usage, ttfb=0.0
+        )
+
+
+def test_agent_applies_decision_and_logs_it():
+    controller = _controller(model_tiers=["big", "small"])
+    controller.observe("big", ttfb=4.0, latency=14.0, completion_tokens=100)
+    controller.observe("small", ttfb=1.0, latency=3.0, completion_tokens=100)
+    backend = TimedBackend()
+    agent = LLMAgent(
+        0,
+        MemoryManager(name="Alice", event_log=EventLog()),
+        Role.CITIZEN,
+        "Alice",
+        backend=backend,
+        latency_controller=controller,
+    )
+    agent.game_logger = GameLogger()
+    players = [SimpleNamespace(name=name) for name in ["Alice", "Bob"]]
+    agent.ai_config["model"], model = "big", agent.ai_config["model"]
+    try:
+        agent.generate_response(
+            {"day_count": 1, "phase": GamePhase.DAY_CONVERSATION, "alive_players": players}
+        )
+    finally:
+        agent.ai_config["model"] = model
+
+    assert backend.calls == [("small", 200)]
+    event = agent.game_logger.llm_calls[-1]
+    assert event["model"] == "small"
+    assert event["slo"]["reason"] == "capped"
+    assert event["slo"]["max_tokens"] == 200
+
+
+class LengthLimitedBackend(TimedBackend):
+    """출력 상한이 300 토큰보다 작으면 길이 초과로 실패하는 백엔드"""
+
+    def parse(self, *, model, messages, response_format, temperature=None, max_tokens=None):
+        if max_tokens is not None and max_tokens < 300:
+            self.calls.append((model, max_tokens))
+            usage = SimpleNamespace(prompt_tokens=100, completion_tokens=max_tokens)
+            raise openai.LengthFinishReasonError(completion=SimpleNamespace(usage=usage))
+        return super().parse(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+
+def test_truncated_capped_call_is_retried_and_logged():
+    """제어기가 줄인 상한에 걸려 잘리면 상한 없이 다시 요청하고 slo 텔레메트리에 표시"""
+    controller = _controller()
+    controller.observe("big", ttfb=1.0, latency=3.0, completion_tokens=100)
+    backend = LengthLimitedBackend()
+    agent = LLMAgent(
+        0,
+        MemoryManager(name="Alice", event_log=EventLog()),
+        Role.CITIZEN,
+        "Alice",
+        backend=backend,
+        latency_controller=controller,
+    )
+    agent.game_logger = GameLogger()
+    players = [SimpleNamespace(name=name) for name in ["Alice", "Bob"]]
+    agent.ai_config["model"], model = "big", agent.ai_config["model"]
+    try:
+        response = agent.generate_response(
+            {"day_count": 1, "phase": GamePhase.DAY_CONVERSATION, "alive_players": players}
+        )
+    finally:
+        agent.ai_config["model"] = model
+
+    assert response.conversation == "저는 시민입니다."
+    assert backend.calls == [("big", 200), ("big", None)]
+    truncated, retried = agent.game_logger.llm_calls[-2:]
+    assert truncated["slo"]["reason"] == "capped" and truncated["slo"]["truncated"]
+    assert "truncated" not in retried["slo"]
@@ -0,0 +1,220 @@
+import copy
+import pickle
+import threading
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+from mafia.ai import prompt_builder
+from mafia.ai.backends import BackendResponse, LLMBackend
+from mafia.ai.context_assembler import count_message_tokens
+from mafia.ai.llm_agent import LLMAgent
+from mafia.ai.memory_manager import EventLog, MemoryManager
+from mafia.utils.enum import GamePhase, Role
+
+
+class FakeBackend(LLMBackend):
+    """네트워크 없이 고정된 응답을 돌려주는 백엔드"""
+
+    def parse(self, *, model, messages, response_format, temperature=None, max_tokens=None):
+        if "conversation" in response_format.model_fields:
+            parsed = response_format(conversation="저는 시민입니다.")
+        else:
+            parsed = response_format(target="Bob", reason="의심스럽습니다.")
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=10, prompt_tokens_details=None)
+        return BackendResponse(parsed=parsed, content=parsed.model_dump_json(), usage=usage)
+
+
+class TruncatingBackend(FakeBackend):
+    """출력 상한이 있는 요청은 길이 초과로 실패하는 백엔드"""
+
+    def __init__(self):
+        self.calls = []
+
+    def parse(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("max_tokens") is not None:
+            usage = SimpleNamespace(prompt_tokens=100, completion_tokens=kwargs["max_tokens"])
+            raise openai.LengthFinishReasonError(completion=SimpleNamespace(usage=usage))
+        return super().parse(**kwargs)
+
+
+@pytest.fixture
+def agent():
+    memory_manager = MemoryManager(name="Alice", event_log=EventLog())
+    return LLMAgent(0, memory_manager, Role.POLICE, "Alice", backend=FakeBackend())
+
+
+def _context(day, phase):
+    players = [SimpleNamespace(name=name) for name in ["Alice", "Bob", "Charlie", "David"]]
+    return {"day_count": day, "phase": phase, "alive_players": players}
+
+
+def test_self_action_record_is_compact(agent):
+    """자신의 행동은 컨텍스트 없이 필요한 값만 기록"""
+    agent.generate_response(_context(1, GamePhase.DAY_VOTE))
+
+    record = agent.memory_manager.get_all_memories()[-1]
+    assert record == {
+        "day": 1,
+        "phase": GamePhase.DAY_VOTE,
+        "type": "vote",
+        "target": "Bob",
+        "content": "의심스럽습니다.",
+    }
+
+
+def test_memory_grows_linearly_over_long_game(agent):
+    """30일 동안 기억 크기가 일 수에 비례하여 증가"""
+    event_log = agent.memory_manager.event_log
+    sizes = {}
+    for day in range(1, 31):
+        for phase in [GamePhase.DAY_CONVERSATION, GamePhase.DAY_VOTE, GamePhase.NIGHT_ACTION]:
+            event_log.add_memory(
+                {"day": day, "phase": phase, "speaker": "사회자", "content": f"{day}일차 공지"}
+            )
+            agent.generate_response(_context(day, phase))
+        sizes[day] = len(pickle.dumps(agent.memory_manager.get_all_memories()))
+
+    assert sizes[30] / sizes[15] == pytest.approx(2, rel=0.15)
+    assert sizes[30] / sizes[10] == pytest.approx(3, rel=0.15)
+
+
+def test_input_budget_rebuilds_history(agent, monkeypatch):
+    """입력 예산을 넘으면 기억을 줄여 메시지 기록을 다시 구성"""
+    monkeypatch.setitem(
+        agent.ai_config, "token_budgets", {"default": {"input": 2500, "output": 50}}
+    )
+    event_log = agent.memory_manager.event_log
+    for i in range(200):
+        event_log.add_memory(
+            {"day": 1, "phase": GamePhase.DAY_CONVERSATION, "speaker": "Bob", "content": f"발언 {i}"}
+        )
+        if i % 20 == 0:
+            agent.generate_response(_context(1, GamePhase.DAY_CONVERSATION))
+            assert agent.last_call_tokens["input"] <= 2500
+            assert agent.last_call_tokens["output_budget"] == 50
+
+
+def test_phase_and_role_settings_route_calls(agent, monkeypatch):
+    """페이즈/역할별 모델, temperature, 출력 토큰 수를 호출에 적용"""
+    calls = []
+    parse = agent.backend.parse
+
+    def record(**kwargs):
+        calls.append(kwargs)
+        return parse(**kwargs)
+
+    monkeypatch.setattr(agent.backend, "parse", record)
+    monkeypatch.setitem(
+        agent.ai_config, "phase_settings", {"day_vote": {"model": "small", "max_tokens": 40}}
+    )
+    monkeypatch.setitem(
+        agent.ai_config,
+        "role_settings",
+        {"police": {"temperature": 0.1, "phases": {"day_vote": {"max_tokens": 30}}}},
+    )
+
+    agent.generate_response(_context(1, GamePhase.DAY_VOTE))
+    agent.generate_response(_context(1, GamePhase.DAY_CONVERSATION))
+
+    vote, conversation = calls
+    assert (vote["model"], vote["temperature"], vote["max_tokens"]) == ("small", 0.1, 30)
+    assert conversation["model"] == agent.ai_config["model"]
+    assert conversation["temperature"] == 0.1
+
+
+def test_late_response_is_tagged_and_not_counted(agent, monkeypatch):
+    """마감 이후에 도착한 응답은 기본 행동으로 대신하고 사용량/캐시에 반영하지 않음"""
+    events, done = [], threading.Event()
+    parse = agent.backend.parse
+
+    def slow(**kwargs):
+        time.sleep(0.2)
+        return parse(**kwargs)
+
+    def log_llm_call(**event):
+        events.append(event)
+        done.set()
+
+    monkeypatch.setattr(agent.backend, "parse", slow)
+    monkeypatch.setattr(agent.game_logger, "log_llm_call", log_llm_call)
+
+    context = {**_context(1, GamePhase.DAY_VOTE), "deadline": time.monotonic() + 0.05}
+    response = agent.generate_response(context)
+
+    assert response.reason == agent.FALLBACK_REASON
+    assert done.wait(2)
+    assert events[0]["late"] is True and events[0]["day"] == 1
+    assert agent.usage["calls"] == 0
+
+
+def test_truncated_response_is_retried_without_cap(agent, monkeypatch):
+    """출력 상한에 걸려 잘린 응답은 상한 없이 한 번 더 요청"""
+    events = []
+    agent.backend = TruncatingBackend()
+    monkeypatch.setattr(agent.game_logger, "log_llm_call", lambda **event: events.append(event))
+
+    response = agent.generate_response(_context(1, GamePhase.DAY_VOTE))
+
+    assert response.target == "Bob"
+    assert [call["max_tokens"] for call in agent.backend.calls] == [150, None]
+    assert [event.get("truncated", False) for event in events] == [True, False]
+    assert agent.usage["calls"] == 2
+
+
+def test_truncated_stream_uses_fallback(agent):
+    """스트리밍 중 잘린 발언은 다시 요청하지 않고 기본 발언으로 대신"""
+    agent.backend = TruncatingBackend()
+
+    response = agent.generate_response(_context(1, GamePhase.DAY_CONVERSATION), on_text=print)
+
+    assert len(agent.backend.calls) == 1
+    assert response == agent._get_fallback_action(_context(1, GamePhase.DAY_CONVERSATION))
+
+
+class PrefixCacheBackend(FakeBackend):
+    """이전 요청과 겹치는 메시지 접두어를 캐시 적중 토큰으로 보고하는 백엔드"""
+
+    def __init__(self):
+        self.requests = []
+
+    def parse(self, *, model, messages, **kwargs):
+        previous = self.requests[-1] if self.requests else []
+        self.requests.append(copy.deepcopy(messages))
+        prefix = 0
+        while prefix < min(len(messages), len(previous)) and messages[prefix] == previous[prefix]:
+            prefix += 1
+
+        response = super().parse(model=model, messages=messages, **kwargs)
+        response.usage = SimpleNamespace(
+            prompt_tokens=count_message_tokens(messages, model),
+            completion_tokens=10,
+            prompt_tokens_details=SimpleNamespace(
+                cached_tokens=count_message_tokens(messages[:prefix], model) if prefix else 0
+            ),
+        )
+        return response
+
+
+def test_messages_keep_stable_prefix_across_calls():
+    """규칙과 역할이 맨 앞에 오고, 이전 호출의 메시지는 바뀌지 않은 채 뒤에 덧붙음"""
+    backend = PrefixCacheBackend()
+    event_log = EventLog()
+    agent = LLMAgent(0, MemoryManager("Alice", event_log), Role.POLICE, "Alice", backend=backend)
+    for phase in [GamePhase.DAY_CONVERSATION, GamePhase.DAY_VOTE, GamePhase.NIGHT_ACTION]:
+        event_log.add_memory({"day": 1, "phase": phase, "speaker": "사회자", "content": "공지"})
+        agent.generate_response(_context(1, phase))
+
+    first, second, third = backend.requests
+    assert first[0] == {
+        "role": "developer",
+        "content": prompt_builder.developer_prompt("Alice", Role.POLICE),
+    }
+    assert second[: len(first)] == first
+    assert third[: len(second)] == second
+    assert second[len(first)]["role"] == "assistant"  # 이전 응답도 기록에 그대로 남음
+
+    # 제공자가 보고한 캐시 적중 토큰 기록
+    assert 0 < agent.usage["cached_tokens"] < agent.usage["prompt_tokens"]
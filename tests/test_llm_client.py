@@ -0,0 +1,25 @@
+from mafia.ai import llm_client
+
+
+def test_clients_are_pooled_per_key_and_base_url(monkeypatch):
+    """같은 (api_key, base_url)에는 같은 클라이언트, 다르면 다른 클라이언트"""
+    monkeypatch.setattr(llm_client, "_clients", {})
+
+    client = llm_client.get_client(api_key="key-a")
+    assert llm_client.get_client(api_key="key-a") is client
+    assert llm_client.get_client(api_key="key-b") is not client
+    local = llm_client.get_client(api_key="key-a", base_url="http://localhost:8000/v1")
+    assert local is not client
+    assert llm_client.get_client(api_key="key-a", base_url="http://localhost:8000/v1") is local
+
+    monkeypatch.setenv("OPENAI_API_KEY", "key-a")
+    assert llm_client.get_client() is client
+
+
+def test_close_clients_empties_registry(monkeypatch):
+    monkeypatch.setattr(llm_client, "_clients", {})
+    client = llm_client.get_client(api_key="key-a")
+
+    llm_client.close_clients()
+    assert client._client.is_closed
+    assert llm_client.get_client(api_key="key-a") is not client
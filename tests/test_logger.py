@@ -0,0 +1,121 @@
+import json
+import logging
+import threading
+
+from mafia.ai.backends import StubBackend
+from mafia.game.game_manager import GameManager
+from mafia.utils.logger import GameLogger, LogWriter, percentile
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) is None
+
+
+def test_llm_calls_written_as_json_lines(tmp_path):
+    """LLM 호출마다 이벤트를 남기고 게임 종료 시 페이즈별 요약 기록"""
+    path = tmp_path / "telemetry.jsonl"
+    game = GameManager(backend=StubBackend(latency=0.001), seed=0)
+    game.logger = GameLogger(telemetry_path=str(path))
+    game.initialize_game()
+    game.spin()
+
+    events = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    calls = [e for e in events if e["event"] == "llm_call"]
+    assert len(calls) == game.llm_usage["calls"]
+    assert {"player", "role", "phase", "day", "model", "prompt_tokens", "completion_tokens",
+            "cached_tokens", "ttfb", "latency", "retries", "cache_hit"} <= set(calls[0])
+    assert calls[0]["latency"] >= calls[0]["ttfb"] >= 0.001
+
+    summary = events[-1]
+    assert summary["event"] == "summary"
+    assert sum(s["calls"] for s in summary["phases"].values()) == len(calls)
+    vote = summary["phases"]["day_vote"]
+    assert vote["latency_p50"] <= vote["latency_p95"]
+
+
+class _Blocking:
+    """기록 스레드에서 포맷될 때 release될 때까지 기다리는 메시지"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __str__(self):
+        self.started.set()
+        self.release.wait(5)
+        return "blocking"
+
+
+def _record(msg, agent=None):
+    record = logging.LogRecord("mafia", logging.INFO, __file__, 0, msg, None, None)
+    if agent:
+        record.agent = agent
+    return record
+
+
+def test_log_writer_writes_agent_transcripts_and_game_log(tmp_path):
+    writer = LogWriter(tmp_path, batch_size=4)
+    logger = logging.LoggerAdapter(logging.getLogger("test_log_writer"), {"agent": "Alice"})
+    logger.logger.addHandler(writer.handler)
+    logger.logger.setLevel(logging.INFO)
+    messages = [{"role": "user", "content": "hello"}]
+    try:
+        for i in range(10):
+            logger.info("%s %d", messages, i)
+        writer.handler.handle(_record("공지"))
+    finally:
+        logger.logger.removeHandler(writer.handler)
+        writer.stop()
+
+    alice = (tmp_path / "Alice.log").read_text(encoding="utf-8").splitlines()
+    game = (tmp_path / "game.log").read_text(encoding="utf-8").splitlines()
+    assert len(alice) == 10 and "'content': 'hello'}] 9" in alice[-1]
+    assert len(game) == 11 and game[-1].endswith("공지")
+
+
+def test_log_writer_drops_when_full(tmp_path):
+    writer = LogWriter(tmp_path, queue_size=2, overflow="drop")
+    blocking = _Blocking()
+    writer.enqueue(_record(blocking))
+    assert blocking.started.wait(5)  # 기록 스레드가 첫 레코드를 포맷하는 중
+
+    for i in range(5):
+        writer.enqueue(_record(f"message {i}"))
+    blocking.release.set()
+    writer.stop()
+
+    assert writer.dropped == 3
+    assert len((tmp_path / "game.log").read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_telemetry_written_by_log_writer_thread(tmp_path):
+    """텔레메트리 이벤트는 호출한 스레드가 아닌 기록 스레드에서 파일에 씀"""
+    path = tmp_path / "telemetry.jsonl"
+    logger = GameLogger(telemetry_path=str(path))
+    blocking = _Blocking()
+    blocked = _record(blocking)
+    blocked.sink = str(tmp_path / "blocked.log")
+    logger._telemetry.enqueue(blocked)
+    assert blocking.started.wait(5)  # 기록 스레드가 멈춰 있는 동안
+
+    def log_calls(player):
+        for _ in range(10):
+            logger.log_llm_call(player=player, role="citizen", phase="day_vote", day=1, model="m")
+
+    threads = [threading.Thread(target=log_calls, args=(f"p{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not any(thread.is_alive() for thread in threads)
+    assert not path.exists()
+
+    blocking.release.set()
+    logger.flush()
+    events = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(events) == 40
+    assert {e["player"] for e in events} == {"p0", "p1", "p2", "p3"}
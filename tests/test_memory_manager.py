@@ -0,0 +1,157 @@
+import threading
+import time
+
+import pytest
+from mafia.ai.memory_manager import EventLog, MemoryManager, MemoryView
+from mafia.utils.enum import GamePhase
+
+
+def _memory(day, phase=GamePhase.DAY_CONVERSATION, content=""):
+    return {"day": day, "phase": phase, "speaker": "사회자", "content": content}
+
+
+@pytest.fixture
+def memory_manager():
+    manager = MemoryManager(name="Alice")
+    for day in range(1, 7):
+        manager.add_memory(_memory(day, GamePhase.DAY_CONVERSATION, f"{day}일차 대화"))
+        manager.add_memory(_memory(day, GamePhase.NIGHT_ACTION, f"{day}일차 밤"))
+    return manager
+
+
+def test_recent_memories_match_full_scan(memory_manager):
+    """최근 기억 조회 결과가 전체 검색 결과와 동일"""
+    for current_day in range(0, 10):
+        expected = [m for m in memory_manager.get_all_memories() if m["day"] >= current_day - 3]
+        assert list(memory_manager.get_recent_memories(current_day)) == expected
+
+
+def test_recent_memories_is_view(memory_manager):
+    """최근 기억은 복사 없는 고정 구간"""
+    recent = memory_manager.get_recent_memories(6)
+    assert isinstance(recent, MemoryView)
+    assert len(recent) == 8
+    assert recent[0]["content"] == "3일차 대화"
+    assert recent[-1]["content"] == "6일차 밤"
+
+    memory_manager.add_memory(_memory(6))
+    assert len(recent) == 8
+
+
+def test_memories_by_day_and_phase(memory_manager):
+    """일차 및 페이즈별 기억 조회"""
+    assert [m["content"] for m in memory_manager.get_memories(2)] == ["2일차 대화", "2일차 밤"]
+    assert [m["content"] for m in memory_manager.get_memories(2, GamePhase.NIGHT_ACTION)] == [
+        "2일차 밤"
+    ]
+
+
+def test_out_of_order_memory(memory_manager):
+    """과거 일차의 기억이 뒤늦게 추가되어도 조회 결과 유지"""
+    memory_manager.add_memory(_memory(1, content="늦은 기억"))
+    assert "늦은 기억" not in [m["content"] for m in memory_manager.get_recent_memories(6)]
+    assert "늦은 기억" in [m["content"] for m in memory_manager.get_recent_memories(4)]
+
+
+def test_shared_event_log():
+    """공개 사건은 한 번만 저장되고, 개인 기억은 본인만 조회"""
+    event_log = EventLog()
+    alice = MemoryManager(name="Alice", event_log=event_log)
+    bob = MemoryManager(name="Bob", event_log=event_log)
+
+    event_log.add_memory(_memory(1, content="공지"))
+    alice.add_memory(_memory(1, GamePhase.NIGHT_ACTION, "Bob은(는) 마피아가 아닙니다."))
+    event_log.add_memory(_memory(2, content="대화"))
+
+    assert len(event_log) == 2
+    assert [m["content"] for m in alice.get_all_memories()] == [
+        "공지",
+        "Bob은(는) 마피아가 아닙니다.",
+        "대화",
+    ]
+    assert [m["content"] for m in bob.get_all_memories()] == ["공지", "대화"]
+    assert [m["content"] for m in alice.get_recent_memories(5, days=3)] == ["대화"]
+    assert [m["content"] for m in alice.get_memories(1, GamePhase.NIGHT_ACTION)] == [
+        "Bob은(는) 마피아가 아닙니다."
+    ]
+
+
+def test_memories_since_cursor_and_detach():
+    """커서 이후 기억 조회 및 사망 후 공개 사건 차단"""
+    event_log = EventLog()
+    alice = MemoryManager(name="Alice", event_log=event_log)
+    event_log.add_memory(_memory(1, content="공지"))
+
+    cursor = alice.cursor()
+    event_log.add_memory(_memory(1, content="대화"))
+    alice.add_memory(_memory(1, content="개인"))
+    assert [m["content"] for m in alice.get_memories_since(cursor)] == ["대화", "개인"]
+
+    alice.detach()
+    event_log.add_memory(_memory(2, content="사망 후 공지"))
+    assert "사망 후 공지" not in [m["content"] for m in alice.get_all_memories()]
+
+
+def test_compaction_replaces_old_memories_with_summary():
+    """예산을 넘은 오래된 기억은 요약 하나로 대체"""
+    event_log = EventLog()
+    alice = MemoryManager(name="Alice", event_log=event_log)
+    for i in range(10):
+        event_log.add_memory(_memory(1, content=f"대화{i}"))
+    alice.add_memory(_memory(1, GamePhase.NIGHT_ACTION, "개인"))
+
+    summarized = []
+
+    def summarizer(previous_summary, memories):
+        summarized.append([m["content"] for m in memories])
+        return f"{previous_summary}+{len(memories)}"
+
+    assert not alice.compact(summarizer, current_day=1, max_entries=20, keep_entries=5)
+    assert alice.compact(summarizer, current_day=1, max_entries=8, keep_entries=3)
+    assert summarized == [[f"대화{i}" for i in range(8)]]
+
+    recent = [m["content"] for m in alice.get_recent_memories(1)]
+    assert recent == ["+8", "대화8", "대화9", "개인"]
+    assert len(alice.get_all_memories()) == 11
+
+    # 새 기억이 쌓이면 기존 요약과 함께 다시 요약
+    for i in range(10, 16):
+        event_log.add_memory(_memory(2, content=f"대화{i}"))
+    assert alice.compact(summarizer, current_day=2, max_entries=8, keep_entries=3)
+    assert [m["content"] for m in alice.get_recent_memories(2)] == [
+        "+8+6",
+        "대화13",
+        "대화14",
+        "대화15",
+    ]
+
+
+def test_compaction_waits_for_private_memory_anchor():
+    """개인 기억 추가 도중에 압축이 실행되어도 기준 위치가 함께 기록된 뒤에 선택"""
+    event_log = EventLog()
+    alice = MemoryManager(name="Alice", event_log=event_log)
+    for i in range(10):
+        event_log.add_memory(_memory(1, content=f"대화{i}"))
+
+    # 개인 기억은 저장되었지만 기준 위치는 아직 기록되지 않은 순간을 재현
+    stored = threading.Event()
+    add_private = alice._private.add_memory
+
+    def slow_add(memory):
+        index = add_private(memory)
+        stored.set()
+        time.sleep(0.05)
+        return index
+
+    alice._private.add_memory = slow_add
+    writer = threading.Thread(target=alice.add_memory, args=(_memory(1, content="개인"),))
+    writer.start()
+    stored.wait()
+    try:
+        assert alice.compact(
+            lambda previous, memories: "요약", current_day=1, max_entries=4, keep_entries=2
+        )
+    finally:
+        writer.join()
+
+    assert [m["content"] for m in alice.get_recent_memories(1)] == ["요약", "대화9", "개인"]
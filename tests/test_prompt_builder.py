@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from mafia.ai import prompt_builder
+from mafia.utils.enum import GamePhase, Role
+
+
+def _context(phase, day_count=1):
+    return {
+        "day_count": day_count,
+        "phase": phase,
+        "alive_players": [SimpleNamespace(name=n) for n in ["Alice", "Bob", "Charlie"]],
+    }
+
+
+def test_developer_prompt_is_built_once():
+    """같은 플레이어와 역할의 개발자 프롬프트는 캐시에서 같은 문자열을 재사용"""
+    prompt_builder.developer_prompt.cache_clear()
+    first = prompt_builder.developer_prompt("Alice", Role.POLICE)
+    second = prompt_builder.developer_prompt("Alice", Role.POLICE)
+
+    assert second is first
+    assert prompt_builder.developer_prompt.cache_info().hits == 1
+    assert prompt_builder.developer_prompt("Bob", Role.POLICE) != first
+
+
+def test_phase_prompts_reuse_module_schemas():
+    """페이즈 프롬프트는 호출마다 같은 모듈 수준 응답 스키마를 반환하고 게임 상태만 바뀜"""
+    day1, schema1 = prompt_builder.day_vote_prompt(_context(GamePhase.DAY_VOTE, 1), {})
+    day2, schema2 = prompt_builder.day_vote_prompt(_context(GamePhase.DAY_VOTE, 2), {})
+    assert schema1 is schema2 is prompt_builder.VoteResponse
+    assert day1 != day2
+    assert day1.endswith(prompt_builder._VOTE_PROMPT) and day2.endswith(prompt_builder._VOTE_PROMPT)
+
+    for role in (Role.MAFIA, Role.DOCTOR, Role.POLICE):
+        prompt, Schema = prompt_builder.night_action_prompt(role, _context(GamePhase.NIGHT_ACTION), {})
+        assert Schema is prompt_builder.ActionResponse
+        assert prompt.endswith(prompt_builder._ACTION_PROMPTS[role])
@@ -0,0 +1,148 @@
+import random
+
+import pytest
+from mafia.ai.backends import StubBackend, call_deadline
+from mafia.ai.prompt_builder import VoteResponse
+from mafia.ai.rate_limiter import RateLimitedBackend, TokenBucket, parse_duration
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+class FlakyBackend(StubBackend):
+    """처음 failures번은 주어진 상태 코드로 실패하는 백엔드"""
+
+    def __init__(self, failures, status_code=429, headers=None):
+        super().__init__()
+        self.failures = failures
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def parse(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise HTTPError(self.status_code)
+        response = super().parse(**kwargs)
+        response.headers = self.headers
+        return response
+
+
+class BrokenStreamBackend(StubBackend):
+    """처음 한 번은 조각 하나를 보낸 뒤 429로 끊기는 스트리밍 백엔드"""
+
+    def __init__(self):
+        super().__init__()
+        self.broken = False
+
+    def stream(self, *, on_delta, **kwargs):
+        if not self.broken:
+            self.broken = True
+            on_delta('{"target": "Al')
+            raise HTTPError(429)
+        return super().stream(on_delta=on_delta, **kwargs)
+
+
+def _messages():
+    return [{"role": "user", "content": "생존자: 2명 (Alice, Bob)"}]
+
+
+def _backend(inner, clock, rpm=60, tpm=100000):
+    return RateLimitedBackend(
+        inner,
+        requests=TokenBucket(rpm, clock=clock, sleep=clock.sleep),
+        tokens=TokenBucket(tpm, clock=clock, sleep=clock.sleep),
+        sleep=clock.sleep,
+        rng=random.Random(0),
+        clock=clock,
+    )
+
+
+def test_parse_duration():
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("1.5") == 1.5
+    assert parse_duration(None) is None
+
+
+def test_token_bucket_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(1.0)  # 초당 1개씩 다시 참
+
+
+def test_retries_transient_errors_with_backoff():
+    clock = FakeClock()
+    backend = _backend(FlakyBackend(failures=3), clock)
+    response = backend.parse(model="m", messages=_messages(), response_format=VoteResponse)
+
+    assert response.parsed.target in ("Alice", "Bob")
+    assert response.retries == 3
+    assert 0 < clock.now <= 0.5 + 1 + 2
+
+
+def test_gives_up_on_non_retryable_or_exhausted():
+    clock = FakeClock()
+    with pytest.raises(HTTPError):
+        _backend(FlakyBackend(failures=1, status_code=400), clock).parse(
+            model="m", messages=_messages(), response_format=VoteResponse
+        )
+
+    backend = _backend(FlakyBackend(failures=10), clock)
+    with pytest.raises(HTTPError):
+        backend.parse(model="m", messages=_messages(), response_format=VoteResponse)
+    assert backend.backend.failures == 10 - (backend.max_retries + 1)
+
+
+def test_stops_retrying_past_call_deadline():
+    """재시도 대기가 호출 마감을 넘기면 공유 한도를 더 쓰지 않고 오류를 그대로 발생"""
+    clock = FakeClock()
+    backend = _backend(FlakyBackend(failures=3), clock)
+    token = call_deadline.set(clock.now + 0.1)
+    try:
+        with pytest.raises(HTTPError):
+            backend.parse(model="m", messages=_messages(), response_format=VoteResponse)
+    finally:
+        call_deadline.reset(token)
+    assert backend.backend.failures == 2
+    assert backend.backend.calls == 0
+
+
+def test_does_not_retry_stream_after_delta():
+    """조각을 보낸 뒤 끊긴 스트림은 재시도하지 않음 (같은 디코더에 응답을 다시 보내지 않음)"""
+    clock = FakeClock()
+    backend = _backend(BrokenStreamBackend(), clock)
+    deltas = []
+    with pytest.raises(HTTPError):
+        backend.stream(
+            model="m", messages=_messages(), response_format=VoteResponse, on_delta=deltas.append
+        )
+    assert deltas == ['{"target": "Al']
+    assert backend.backend.calls == 0
+
+
+def test_rate_limit_headers_slow_down_requests():
+    """서버가 남은 요청이 없다고 알려주면 다음 요청은 버킷이 찰 때까지 기다림"""
+    clock = FakeClock()
+    headers = {"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0"}
+    backend = _backend(FlakyBackend(failures=0, headers=headers), clock, rpm=600)
+
+    backend.parse(model="m", messages=_messages(), response_format=VoteResponse)
+    assert backend.requests.rate == 1.0
+    backend.parse(model="m", messages=_messages(), response_format=VoteResponse)
+    assert clock.now == pytest.approx(1.0)
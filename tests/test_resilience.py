@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+from mafia.ai import resilience
+from mafia.ai.backends import StubBackend
+from mafia.ai.prompt_builder import VoteResponse
+from mafia.ai.resilience import (
+    CircuitBreaker,
+    FailoverBackend,
+    HedgedBackend,
+    LatencyTracker,
+    resilient,
+)
+from mafia.utils.config import game_config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowFirstBackend(StubBackend):
+    """첫 호출만 오래 걸리는 백엔드"""
+
+    def __init__(self, slow=2.0):
+        super().__init__()
+        self.slow = slow
+        self._first = threading.Event()
+
+    def parse(self, **kwargs):
+        if not self._first.is_set():
+            self._first.set()
+            time.sleep(self.slow)
+        return super().parse(**kwargs)
+
+
+class FailingBackend(StubBackend):
+    def parse(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        raise ConnectionError("down")
+
+
+def _request(model="primary"):
+    return dict(
+        model=model,
+        messages=[{"role": "user", "content": "생존자: 2명 (Alice, Bob)"}],
+        response_format=VoteResponse,
+    )
+
+
+def test_hedged_request_returns_first_response():
+    inner = SlowFirstBackend(slow=2.0)
+    backend = HedgedBackend(inner, LatencyTracker(), initial_delay=0.05)
+
+    start = time.monotonic()
+    response = backend.parse(**_request())
+
+    assert time.monotonic() - start < 1.0
+    assert response.parsed is not None
+    assert backend.hedges == 1
+
+
+def test_hedged_request_raises_when_all_attempts_fail():
+    backend = HedgedBackend(FailingBackend(), LatencyTracker(), initial_delay=0.01)
+    with pytest.raises(ConnectionError):
+        backend.parse(**_request())
+
+
+def test_circuit_breaker_fails_over_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(window=4, min_calls=4, error_rate=0.5, cooldown=30.0, clock=clock)
+    primary, secondary = FailingBackend(), StubBackend()
+    backend = FailoverBackend(primary, secondary, breaker, secondary_model="fallback")
+
+    for _ in range(4):
+        assert backend.parse(**_request()).parsed is not None
+    assert breaker.state == "open"
+    assert primary.calls == 4
+
+    # 회로가 열려 있는 동안에는 주 백엔드를 호출하지 않음
+    backend.parse(**_request())
+    assert primary.calls == 4
+    assert secondary.calls == 5
+
+    # 대기 시간이 지나면 시험 요청 하나로 다시 닫힘
+    clock.now += 30.0
+    backend.primary = StubBackend()
+    backend.parse(**_request())
+    assert breaker.state == "closed"
+    assert backend.primary.calls == 1
+
+
+def test_resilient_tracks_latency_per_model(monkeypatch):
+    """지연 시간 기록은 같은 백엔드라도 모델마다 따로 공유"""
+    monkeypatch.setattr(resilience, "_trackers", {})
+    monkeypatch.setitem(game_config.get_config("ai_settings"), "hedging", {"enabled": True})
+
+    first = resilient(StubBackend(), name="openai")
+    second = resilient(StubBackend(), name="openai")
+    assert isinstance(first, HedgedBackend)
+    assert first.tracker_for("small") is second.tracker_for("small")
+    assert first.tracker_for("small") is not first.tracker_for("large")
+
+    first.parse(**_request("small"))
+    assert len(second.tracker_for("small")._latencies) == 1
+    assert len(second.tracker_for("large")._latencies) == 0
+
+
+def test_resilient_skips_breaker_without_secondary(monkeypatch):
+    """보조 백엔드도 보조 모델도 없으면 같은 곳으로 다시 보내지 않도록 차단기를 쓰지 않음"""
+    monkeypatch.setattr(resilience, "_breakers", {})
+    ai_config = game_config.get_config("ai_settings")
+    monkeypatch.setitem(ai_config, "hedging", {"enabled": False})
+    monkeypatch.setitem(ai_config, "circuit_breaker", {"enabled": True})
+    inner = StubBackend()
+    assert resilient(inner, name="openai") is inner
+
+    monkeypatch.setitem(
+        ai_config, "circuit_breaker", {"enabled": True, "secondary_model": "fallback"}
+    )
+    backend = resilient(inner, name="openai")
+    assert isinstance(backend, FailoverBackend)
+    assert backend.secondary_model == "fallback"
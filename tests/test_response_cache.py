@@ -0,0 +1,73 @@
+import time
+from types import SimpleNamespace
+
+from mafia.ai.backends import StubBackend
+from mafia.ai.llm_agent import LLMAgent
+from mafia.ai.memory_manager import EventLog, MemoryManager
+from mafia.ai.response_cache import ResponseCache
+from mafia.utils.enum import GamePhase, Role
+
+
+def _agent(cache, backend):
+    memory_manager = MemoryManager(name="Alice", event_log=EventLog())
+    return LLMAgent(0, memory_manager, Role.POLICE, "Alice", backend=backend, response_cache=cache)
+
+
+def _context(phase):
+    players = [SimpleNamespace(name=name) for name in ["Alice", "Bob", "Charlie", "David"]]
+    return {"day_count": 1, "phase": phase, "alive_players": players}
+
+
+def test_memory_tier_is_lru():
+    """메모리 계층은 가장 오래 사용하지 않은 항목부터 제외"""
+    cache = ResponseCache(memory_entries=2)
+    cache.put("a", {"content": "1"})
+    cache.put("b", {"content": "2"})
+    cache.get("a")
+    cache.put("c", {"content": "3"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"content": "1"}
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 1
+
+
+def test_disk_tier_survives_restart_and_expires(tmp_path):
+    """디스크 계층은 새 캐시에서도 조회되고 TTL이 지나면 만료"""
+    path = tmp_path / "cache.sqlite"
+    ResponseCache(path=str(path), ttl=60).put("a", {"content": "1"})
+
+    cache = ResponseCache(path=str(path), ttl=60)
+    assert cache.get("a") == {"content": "1"}
+    assert cache.stats["disk_hits"] == 1
+
+    cache.ttl = 1e-9
+    cache._memory.clear()
+    time.sleep(0.01)
+    assert cache.get("a") is None
+
+
+def test_disk_tier_size_limit(tmp_path):
+    cache = ResponseCache(memory_entries=1, path=str(tmp_path / "cache.sqlite"), disk_entries=2)
+    for key in "abc":
+        cache.put(key, {"content": key})
+
+    assert cache._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 2
+    assert cache.get("a") is None
+
+
+def test_agent_uses_cache_per_phase():
+    """캐시를 켠 페이즈만 같은 요청에 백엔드를 다시 호출하지 않음"""
+    cache = ResponseCache(phases={"day_vote": True}, enabled=False)
+    backend = StubBackend()
+
+    for _ in range(2):
+        agent = _agent(cache, backend)
+        agent.generate_response(_context(GamePhase.DAY_VOTE))
+    assert backend.calls == 1
+    assert agent.usage["cache_hits"] == 1
+    assert agent.memory_manager.get_all_memories()[-1]["type"] == "vote"
+
+    for _ in range(2):
+        _agent(cache, backend).generate_response(_context(GamePhase.DAY_CONVERSATION))
+    assert backend.calls == 3
@@ -0,0 +1,107 @@
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+from mafia.ai import resilience
+from mafia.ai.backends import BackendResponse, LLMBackend, OpenAIBackend, StubBackend, create_backend
+from mafia.ai.cassette import RecordingBackend
+from mafia.ai.llm_agent import LLMAgent
+from mafia.ai.memory_manager import EventLog, MemoryManager
+from mafia.ai.streaming import JSONFieldStream
+from mafia.game.game_manager import GameManager
+from mafia.utils.config import game_config
+from mafia.utils.enum import GamePhase, Role
+from mafia.utils.terminal import ConversationPrinter
+
+
+class ChunkedBackend(LLMBackend):
+    """응답 원문을 세 글자씩 나누어 스트리밍하는 백엔드"""
+
+    def __init__(self, content):
+        self.content = content
+
+    def parse(self, **kwargs):
+        raise AssertionError("스트리밍 요청이어야 합니다")
+
+    def stream(self, *, on_delta, **kwargs):
+        for i in range(0, len(self.content), 3):
+            on_delta(self.content[i : i + 3])
+        return BackendResponse(parsed=None, content=self.content)
+
+
+def _agent(backend):
+    memory_manager = MemoryManager(name="Alice", event_log=EventLog())
+    return LLMAgent(0, memory_manager, Role.CITIZEN, "Alice", backend=backend)
+
+
+def _context():
+    players = [SimpleNamespace(name=name) for name in ["Alice", "Bob"]]
+    return {"day_count": 1, "phase": GamePhase.DAY_CONVERSATION, "alive_players": players}
+
+
+def test_field_stream_decodes_escapes_across_chunks():
+    raw = json.dumps({"conversation": '저는 "시민"\n입니다 😀'}, ensure_ascii=True)
+    stream = JSONFieldStream("conversation")
+    chunks = [stream.feed(raw[i : i + 2]) for i in range(0, len(raw), 2)]
+    assert "".join(chunks) == stream.text == '저는 "시민"\n입니다 😀'
+
+
+def test_agent_streams_conversation_and_validates_result():
+    content = json.dumps({"conversation": "저는 시민입니다."}, ensure_ascii=False)
+    chunks = []
+    response = _agent(ChunkedBackend(content)).generate_response(_context(), on_text=chunks.append)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == response.conversation == "저는 시민입니다."
+
+
+def test_invalid_streamed_response_is_rejected():
+    with pytest.raises(ValidationError):
+        _agent(ChunkedBackend('{"talk": "안녕"}')).generate_response(_context(), on_text=print)
+
+
+def test_stream_passes_through_resilience_and_recording(monkeypatch):
+    """중복 요청/차단기/기록 백엔드로 감싸도 조각 단위로 스트리밍"""
+    content = json.dumps({"conversation": "저는 시민입니다."}, ensure_ascii=False)
+    monkeypatch.setattr(OpenAIBackend, "parse", ChunkedBackend.parse)
+    monkeypatch.setattr(OpenAIBackend, "stream", ChunkedBackend.stream)
+    monkeypatch.setattr(OpenAIBackend, "content", content, raising=False)
+    monkeypatch.setattr(resilience, "_trackers", {})
+    monkeypatch.setattr(resilience, "_breakers", {})
+    ai_config = game_config.get_config("ai_settings")
+    monkeypatch.setitem(ai_config, "hedging", {"enabled": True})
+    monkeypatch.setitem(
+        ai_config, "circuit_breaker", {"enabled": True, "secondary_model": "fallback"}
+    )
+
+    backend = RecordingBackend(create_backend("openai", api_key="test"))
+    assert isinstance(backend.backend, resilience.FailoverBackend)
+    assert isinstance(backend.backend.primary, resilience.HedgedBackend)
+
+    chunks = []
+    response = _agent(backend).generate_response(_context(), on_text=chunks.append)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == response.conversation == "저는 시민입니다."
+    assert [entry["content"] for entry in backend.cassette.entries] == [content]
+
+
+def test_printer_ignores_late_chunks():
+    out = io.StringIO()
+    printer = ConversationPrinter("Alice", out=out)
+    printer.write("저는 ")
+    printer.close("(기본 발언)")
+    printer.write("늦은 조각")
+    assert out.getvalue() == "Alice: 저는  ...(중단)\nAlice: (기본 발언)\n"
+
+
+def test_streamed_game_prints_each_turn(capsys):
+    game = GameManager(backend=StubBackend(seed=0), stream_conversation=True)
+    game.initialize_game()
+    game.run_day_conversation_phase()
+
+    lines = capsys.readouterr().out.splitlines()
+    spoken = [m for m in game.event_log.memories if m["speaker"] is not game.announcer]
+    assert lines == [f"{m['speaker'].name}: {m['content']}" for m in spoken]
@@ -0,0 +1,53 @@
+import time
+from types import SimpleNamespace
+
+from mafia.ai.backends import StubBackend
+from mafia.ai.llm_agent import LLMAgent
+from mafia.ai.memory_manager import EventLog, MemoryManager
+from mafia.game.game_manager import GameManager
+from mafia.utils.enum import GamePhase, Role
+
+
+def test_slow_backend_falls_back_within_phase_limit():
+    """마감 시각이 지나면 응답을 기다리지 않고 기본 행동으로 진행"""
+    game = GameManager(backend=StubBackend(latency=1.0), seed=0)
+    game.time_limits = {"day_time_limit": 0.2, "vote_time_limit": 0.1, "night_time_limit": 0.1}
+    game.initialize_game()
+
+    start = time.monotonic()
+    game._run_phases([GamePhase.DAY_CONVERSATION, GamePhase.DAY_VOTE])
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.6
+    conversations = [
+        m for m in game.event_log.memories
+        if m["phase"] == GamePhase.DAY_CONVERSATION and m["speaker"] is not game.announcer
+    ]
+    assert conversations
+    assert all(m["content"] == LLMAgent.FALLBACK_CONVERSATION for m in conversations)
+    assert len(game.vote_results) == len(game.alive_players) + len(game.dead_players)
+
+    # 기본 행동도 메시지 기록과 본인의 기억에 남음
+    player = game.alive_players[0]
+    assert player.ai_agent.messages[-1]["role"] == "assistant"
+    actions = [m for m in player.memory_manager.get_all_memories() if "type" in m]
+    assert actions[-1]["content"] == LLMAgent.FALLBACK_REASON
+
+
+def test_fallback_targets_most_mentioned_player():
+    event_log = EventLog()
+    agent = LLMAgent(0, MemoryManager("Alice", event_log), Role.MAFIA, "Alice", backend=StubBackend())
+    for content in ["Bob이 수상합니다", "저는 Bob을 믿지 않아요", "Charlie는 조용하네요"]:
+        event_log.add_memory(
+            {"day": 2, "phase": GamePhase.DAY_CONVERSATION, "speaker": "X", "content": content}
+        )
+    players = [SimpleNamespace(name=n) for n in ["Alice", "Bob", "Charlie", "David"]]
+    context = {"day_count": 2, "alive_players": players}
+
+    assert agent._get_fallback_action({**context, "phase": GamePhase.DAY_VOTE}).target == "Bob"
+
+    agent.game_knowledge["suspicious_players"].append("David")
+    assert agent._get_fallback_action({**context, "phase": GamePhase.NIGHT_ACTION}).target == "David"
+
+    agent.role = Role.DOCTOR
+    assert agent._get_fallback_action({**context, "phase": GamePhase.NIGHT_ACTION}).target == "Alice"